@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-import os, sys
+import os, sqlite3, sys, threading, time
+from collections import OrderedDict
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import pandas as pd
@@ -9,10 +10,16 @@ import altair as alt
 
 from wrkmatch import (
     read_connections,
-    discover_and_fetch,
-    compute_scores,
-    normalize_company_name,
+    iter_discover,
+    ScoringIndex,
+    CompanyIndex,
+    normalize_company_names,
+    load_run,
+    SnapshotStore,
 )
+from wrkmatch.fetch import CATEGORICAL_COLUMNS, jobs_frame
+from wrkmatch.journal import FINISHED
+from wrkmatch.titles import LEVELS
 
 st.set_page_config(page_title="wrkmatch", layout="wide")
 st.title("🔎 wrkmatch")
@@ -29,7 +36,17 @@ with st.sidebar:
     w_contacts = st.slider("Weight: # contacts", 0.0, 3.0, 1.5, 0.1)
     w_roles = st.slider("Weight: # open roles", 0.0, 3.0, 1.0, 0.1)
     senior_boost = st.slider("Boost for senior-role prevalence", 0.0, 2.0, 0.5, 0.1)
+    with st.expander("Boosts per seniority level"):
+        st.caption("Added to a company's score × its share of postings at that level.")
+        level_boosts = {level: st.slider(f"Boost: {level}", 0.0, 2.0, 0.0, 0.1, key=f"boost_{level}")
+                        for level in LEVELS}
     max_companies = st.slider("Max companies to scan", 10, 1000, 150, 10)
+    st.markdown("---")
+    prev_run_dir = st.text_input("Or load a previous CLI run (output directory)", "",
+                                 help="Reuse jobs from `cli.py --out-dir …` instead of scanning.")
+    snapshots_path = st.text_input("Snapshot history (SQLite file)", "",
+                                   help="Record each scan's new/removed postings here (same file as "
+                                        "`cli.py --snapshots`); the timeline then shows when roles first appeared.")
 
 if uploaded is None:
     st.info("Upload your LinkedIn connections CSV to begin.")
@@ -53,7 +70,7 @@ st.success(f"Loaded {len(connections_df):,} connections with company info.")
 with st.container():
     st.subheader("Connections — quick KPIs")
     comp_counts = (
-        connections_df.assign(norm=lambda d: d["Company"].map(normalize_company_name))
+        connections_df.assign(norm=normalize_company_names(connections_df["Company"]))
         .groupby("norm").size().rename("n").reset_index()
     )
     total_connections = int(len(connections_df))
@@ -91,20 +108,233 @@ by_company = (
 companies_all = by_company["Company"].tolist()
 companies = companies_all[:max_companies]
 
+SCAN_TTL_S = 6 * 3600  # scan results are reused this long before a company is probed again
+SCAN_CACHE_MAX = 20_000  # companies kept in the shared scan cache (least recently used evicted)
+
+
+class _ScanCache:
+    """Per-company scan results, shared by every session and user of this app process.
+
+    Holds {company: (scanned_at, jobs, status)} for final results (hit/miss) only, so
+    throttled/errored companies are probed again. Entries expire after ``SCAN_TTL_S``
+    and are dropped when read stale; past ``SCAN_CACHE_MAX`` companies the least
+    recently used go first, so a long-running app doesn't grow without bound.
+    """
+
+    def __init__(self, max_entries=SCAN_CACHE_MAX, ttl=SCAN_TTL_S):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, company, jobs, status):
+        with self._lock:
+            self._entries[company] = (time.time(), jobs, status)
+            self._entries.move_to_end(company)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _fresh(self, company, now):
+        entry = self._entries.get(company)
+        if entry is None:
+            return None
+        if now - entry[0] >= self.ttl:
+            del self._entries[company]
+            return None
+        self._entries.move_to_end(company)
+        return entry
+
+    def lookup(self, companies_list):
+        """Unexpired results for ``companies_list`` as ({company: jobs}, {company: status})."""
+        now = time.time()
+        results, status = {}, {}
+        with self._lock:
+            for comp in companies_list:
+                entry = self._fresh(comp, now)
+                if entry is not None:
+                    results[comp], status[comp] = entry[1], entry[2]
+        return results, status
+
+    def scanned_at(self, companies_list):
+        """{company: scanned_at} for the unexpired ones among ``companies_list``."""
+        now = time.time()
+        with self._lock:
+            return {c: e[0] for c in companies_list if (e := self._fresh(c, now)) is not None}
+
+
+@st.cache_resource(show_spinner=False)
+def _scan_cache():
+    """The process-wide ``_ScanCache`` (``cache_resource``: one object for all sessions)."""
+    return _ScanCache()
+
+
+def _merge_jobs(jobs_df, results, status):
+    """Replace the rows of the scanned companies in ``jobs_df`` with their new results."""
+    fresh = jobs_frame(results, status)
+    if jobs_df is None or jobs_df.empty:
+        return fresh
+    kept = jobs_df[~jobs_df["company"].isin(list(status))]
+    merged = pd.concat([kept, fresh], ignore_index=True)
+    for col in CATEGORICAL_COLUMNS:
+        merged[col] = merged[col].astype("category")
+    merged.attrs["company_status"] = {**jobs_df.attrs.get("company_status", {}), **status}
+    return merged
+
+
+class _ScanWorker:
+    """A scan running on a background thread owned by one session.
+
+    The script only reads its progress and a snapshot of the results on each rerun, so
+    widget interactions never interrupt it. ``cancel`` stops it after the company in
+    hand; companies not yet started are dropped.
+    """
+
+    def __init__(self, companies_list, known):
+        self.total = len(companies_list)
+        self.done = 0
+        self.hits = 0
+        self.error = None
+        self.started = time.monotonic()
+        self._results, self._status = dict(known[0]), dict(known[1])
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(list(companies_list),),
+                                        name="wrkmatch-scan", daemon=True)
+        self._thread.start()
+
+    def _run(self, companies_list):
+        cache = _scan_cache()
+        scan = iter_discover(companies_list)
+        try:
+            for res in scan:
+                if res.status in FINISHED:
+                    cache.put(res.company, res.jobs, res.status)
+                with self._lock:
+                    self._results[res.company] = res.jobs
+                    self._status[res.company] = res.status
+                    self.done += 1
+                    self.hits += res.status == "hit"
+                if self._cancel.is_set():
+                    break
+        except Exception as e:  # surfaced on the next rerun
+            self.error = e
+        finally:
+            scan.close()
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def snapshot(self):
+        """(results, status) found so far, including the ``known`` ones."""
+        with self._lock:
+            return dict(self._results), dict(self._status)
+
+    def eta(self):
+        """Seconds left at the current pace, or None before the first company finishes."""
+        if not self.done:
+            return None
+        return (time.monotonic() - self.started) / self.done * (self.total - self.done)
+
+
+def _record_snapshot(results, status):
+    if not snapshots_path:
+        return
+    try:
+        summary = SnapshotStore(snapshots_path).record(jobs_frame(results, status), status)
+    except (OSError, sqlite3.Error) as e:
+        st.warning(f"Could not record snapshot: {e}")
+        return
+    st.toast(f"Snapshot run {summary.run_id}: +{summary.added} new, -{summary.removed} removed roles")
+
+
+now = time.time()
+scanned = st.session_state.setdefault("scanned", {})  # {company: scanned_at} merged into jobs_df
+worker = st.session_state.get("scan_worker")
+if worker is not None and not worker.running:
+    # Finished or cancelled: fold whatever it found into the session's jobs
+    results, status = worker.snapshot()
+    st.session_state["jobs_df"] = _merge_jobs(st.session_state.get("jobs_df"), results, status)
+    st.session_state["jobs_version"] = st.session_state.get("jobs_version", 0) + 1
+    _record_snapshot(results, status)  # partial scans only close postings of companies that finished
+    scanned.update(_scan_cache().scanned_at(status))
+    del st.session_state["scan_worker"]
+    if worker.error is not None:
+        st.error(f"Scan failed after {worker.done:,} companies: {worker.error}")
+    elif worker.cancelled:
+        st.info(f"Scan cancelled after {worker.done:,} of {worker.total:,} companies; results so far are kept.")
+    worker = None
+stale = [c for c in companies if now - scanned.get(c, float("-inf")) >= SCAN_TTL_S]
+
 st.header("2) Discover open roles at your contacts' companies")
-st.caption(f"Scanning {len(companies)} of {len(companies_all)} companies (top by your connections).")
-start = st.button("Scan companies for public job boards")
+st.caption(f"Scanning {len(companies)} of {len(companies_all)} companies (top by your connections)"
+           + (f"; {len(companies) - len(stale)} already scanned." if len(stale) < len(companies) else "."))
+start = st.button("Scan companies for public job boards", disabled=worker is not None)
+
+@st.cache_resource(show_spinner=False)
+def _load_run_cached(run_dir):
+    return load_run(run_dir)
+
+if prev_run_dir and worker is None and st.session_state.get("run_dir") != prev_run_dir:
+    try:
+        st.session_state["jobs_df"] = _load_run_cached(prev_run_dir).jobs
+        st.session_state["run_dir"] = prev_run_dir
+        st.session_state["jobs_version"] = st.session_state.get("jobs_version", 0) + 1
+        scanned.clear()
+    except (FileNotFoundError, ImportError) as e:
+        st.error(f"Could not load run: {e}")
+
+if start and stale and worker is None:
+    # Only companies this session hasn't scanned recently: first from the shared cache, then probed
+    results, status = _scan_cache().lookup(stale)
+    todo = [c for c in stale if c not in status]
+    if todo:
+        worker = st.session_state["scan_worker"] = _ScanWorker(todo, (results, status))
+    else:
+        st.session_state["jobs_df"] = _merge_jobs(st.session_state.get("jobs_df"), results, status)
+        st.session_state["jobs_version"] = st.session_state.get("jobs_version", 0) + 1
+        scanned.update(_scan_cache().scanned_at(status))
 
-@st.cache_data(show_spinner=True)
-def _discover_and_fetch_cached(companies_list):
-    return discover_and_fetch(companies_list)
+PAGE_REFRESH_S = 5.0  # while scanning, rerun the page at most this often to show new roles
+
+
+@st.fragment(run_every=1.0)
+def _scan_progress():
+    """Progress, ETA and Cancel for the session's scan; reruns just itself every second."""
+    worker = st.session_state.get("scan_worker")
+    if worker is None:
+        return
+    if not worker.running:
+        st.rerun()  # the full rerun merges the results
+    eta = worker.eta()
+    text = f"{worker.done:,}/{worker.total:,} companies scanned • {worker.hits:,} with open roles"
+    if worker.cancelled:
+        text += " • cancelling…"
+    elif eta is not None:
+        text += f" • about {int(eta // 60)}m {int(eta % 60):02d}s left"
+    st.progress(worker.done / max(1, worker.total), text=text)
+    if st.button("Cancel scan", disabled=worker.cancelled):
+        worker.cancel()
+    # New roles found since the page was drawn: refresh KPIs and ranking from partial results
+    if (worker.hits != st.session_state.get("rendered_hits")
+            and time.monotonic() - st.session_state.get("rendered_at", 0.0) > PAGE_REFRESH_S):
+        st.rerun()
 
-if start:
-    with st.spinner("Probing ATS job boards (Greenhouse, Lever, Ashby, Workable, Recruitee)..."):
-        jobs_df = _discover_and_fetch_cached(companies)
-    st.session_state["jobs_df"] = jobs_df
 
 jobs_df = st.session_state.get("jobs_df", pd.DataFrame())
+if worker is not None:
+    _scan_progress()
+    st.session_state["rendered_hits"] = worker.hits
+    st.session_state["rendered_at"] = time.monotonic()
+    results, status = worker.snapshot()
+    jobs_df = _merge_jobs(jobs_df, results, status)
 
 if not jobs_df.empty:
     st.success(
@@ -118,6 +348,16 @@ if not jobs_df.empty:
         st.subheader("Jobs — KPIs & trends")
         jobs_df = jobs_df.copy()
         jobs_df["posted_at_dt"] = pd.to_datetime(jobs_df.get("posted_at"), errors="coerce")
+        timeline_col, timeline_label = "posted_at_dt", "# roles posted/updated"
+        if snapshots_path and os.path.exists(snapshots_path):
+            # First time a scan saw each role: unlike posted_at, reposting doesn't move it
+            key = (snapshots_path, st.session_state.get("jobs_version", 0), len(jobs_df))
+            if st.session_state.get("first_seen_key") != key:
+                st.session_state["first_seen"] = SnapshotStore(snapshots_path).first_seen(jobs_df)
+                st.session_state["first_seen_key"] = key
+            jobs_df["first_seen"] = st.session_state["first_seen"].dt.tz_localize(None)
+            if jobs_df["first_seen"].notna().any():
+                timeline_col, timeline_label = "first_seen", "# roles first seen"
         total_roles = int(len(jobs_df))
         companies_with_roles = int(jobs_df["company"].nunique())
         src_counts = (
@@ -144,10 +384,10 @@ if not jobs_df.empty:
         )
         st.altair_chart(chart_src, use_container_width=True)
 
-        if jobs_df["posted_at_dt"].notna().any():
+        if jobs_df[timeline_col].notna().any():
             ts = (
-                jobs_df.dropna(subset=["posted_at_dt"])
-                .assign(month=lambda d: d["posted_at_dt"].dt.to_period("M").dt.to_timestamp())
+                jobs_df.dropna(subset=[timeline_col])
+                .assign(month=lambda d: d[timeline_col].dt.to_period("M").dt.to_timestamp())
                 .groupby("month")
                 .size()
                 .reset_index(name="count")
@@ -157,7 +397,7 @@ if not jobs_df.empty:
                 .mark_line(point=True)
                 .encode(
                     x=alt.X("month:T", title="Month"),
-                    y=alt.Y("count:Q", title="# roles posted/updated"),
+                    y=alt.Y("count:Q", title=timeline_label),
                     tooltip=["month:T", "count:Q"],
                 )
             )
@@ -169,7 +409,15 @@ if not jobs_df.empty:
     # Ranking
     # -------------------------
     st.header("3) Rank your best targets")
-    score_df = compute_scores(connections_df, jobs_df, w_contacts=w_contacts, w_roles=w_roles, senior_boost=senior_boost)
+    # Aggregates are rebuilt only when the dataset changes; slider moves just re-rank
+    index_key = (getattr(uploaded, "file_id", uploaded.name), uploaded.size, st.session_state.get("jobs_version"),
+                 worker.done if worker is not None else None)
+    if st.session_state.get("scoring_index_key") != index_key:
+        st.session_state["scoring_index"] = ScoringIndex(connections_df, jobs_df)
+        st.session_state["company_index"] = CompanyIndex(connections_df, jobs_df)
+        st.session_state["scoring_index_key"] = index_key
+    scoring_index = st.session_state["scoring_index"]
+    company_index = st.session_state["company_index"]
 
     col1, col2, col3 = st.columns(3)
     with col1:
@@ -179,51 +427,45 @@ if not jobs_df.empty:
     with col3:
         top_k = st.number_input("Show top K", 1, 1000, 50)
 
-    filtered = score_df[
-        (score_df["contacts"] >= min_contacts) & (score_df["roles"] >= min_roles)
-    ].head(top_k)
+    filtered = scoring_index.rank(
+        w_contacts=w_contacts, w_roles=w_roles, senior_boost=senior_boost,
+        min_contacts=min_contacts, min_roles=min_roles, top_k=int(top_k), level_boosts=level_boosts,
+    )
 
     st.subheader("Top companies (by your warm-intro potential)")
     st.dataframe(
-        filtered[["display_company", "contacts", "roles", "senior_ratio", "score"]].rename(
+        filtered[["display_company", "contacts", "roles", "senior_ratio", "top_family", "score"]].rename(
             columns={
                 "display_company": "Company",
                 "roles": "Open roles",
                 "senior_ratio": "% senior titles",
+                "top_family": "Main job family",
             }
         )
     )
 
     st.subheader("Company details & roles")
-    for _, row in filtered.iterrows():
-        comp = row["display_company"]
+    page_size = 25
+    n_pages = max(1, -(-len(filtered) // page_size))
+    page = st.number_input(f"Page (of {n_pages})", 1, n_pages, 1) if n_pages > 1 else 1
+    for _, row in filtered.iloc[(page - 1) * page_size:page * page_size].iterrows():
+        comp, norm = row["display_company"], row["norm"]
         with st.expander(
             f"{comp} — {int(row['contacts'])} contacts • {int(row['roles'])} roles • score {row['score']:.2f}"
         ):
-            sample_contacts = (
-                connections_df[connections_df["Company"].str.lower() == comp.lower()]
-                .get("Full Name", pd.Series(["(names unavailable in CSV)"]))
-                .dropna()
-                .astype(str)
-                .unique()
-                .tolist()
-            )
+            sample_contacts = company_index.contact_names(norm) or ["(names unavailable in CSV)"]
             st.write(
                 "**Your contacts**:",
                 ", ".join(sample_contacts[:25]) + ("…" if len(sample_contacts) > 25 else ""),
             )
 
-            comp_jobs = jobs_df[jobs_df["company"] == comp]
-            if comp_jobs.empty:
+            if not len(company_index.job_rows(norm)):
                 st.write("No public jobs found via ATS probes.")
             else:
-                kw = st.text_input(f"Filter roles at {comp} (keyword)", key=f"kw_{comp}")
-                loc = st.text_input(f"Filter by location at {comp}", key=f"loc_{comp}")
-                view = comp_jobs
-                if kw:
-                    view = view[view["title"].str.contains(kw, case=False, na=False)]
-                if loc:
-                    view = view[view["location"].str.contains(loc, case=False, na=False)]
+                kw = st.text_input(f"Filter roles at {comp} (keyword)", key=f"kw_{norm}")
+                loc = st.text_input(f"Filter by location at {comp}", key=f"loc_{norm}")
+                view = company_index.jobs(norm, keyword=kw, location=loc)
                 st.dataframe(view[["title", "location", "department", "source", "url"]])
 else:
-    st.info("Click the scan button above to fetch public job postings for your companies.")
+    st.info("Scanning… results will appear here as companies resolve." if worker is not None
+            else "Click the scan button above to fetch public job postings for your companies.")
@@ -0,0 +1 @@
+"""Offline performance benchmarks; see ``python -m benchmarks.run --help``."""
@@ -0,0 +1,267 @@
+"""Local stand-in for the five ATS job-board APIs, for offline benchmarks.
+
+Serves the recorded payloads in ``fixtures/`` under URL shapes mirroring
+``wrkmatch.ats_clients.ATS_URLS`` (see ``ats_urls``). Which (provider, slug)
+pairs have a board, and how big it is, is a pure function of the seed, so runs
+are reproducible. Latency, 5xx errors and 429s are injected per request.
+
+Run standalone with ``python -m benchmarks.mock_ats --port 8765``, or use
+``MockAtsServer`` to run it in a child process.
+"""
+from __future__ import annotations
+import argparse
+import copy
+import hashlib
+import json
+import multiprocessing as mp
+import random
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+from urllib.request import urlopen
+
+FIXTURES = Path(__file__).with_name("fixtures")
+SOURCES = ("greenhouse", "lever", "ashby", "workable", "recruitee")
+# Routes per provider; the recruitee subdomain becomes a path segment
+ROUTES = {
+    "greenhouse": re.compile(r"^/greenhouse/v1/boards/(?P<slug>[^/]+)/jobs$"),
+    "lever": re.compile(r"^/lever/v0/postings/(?P<slug>[^/]+)$"),
+    "ashby": re.compile(r"^/ashby/job-board-api/postings$"),
+    "workable": re.compile(r"^/workable/api/v1/widget/accounts/(?P<slug>[^/]+)$"),
+    "recruitee": re.compile(r"^/recruitee/(?P<slug>[^/]+)/api/offers/$"),
+}
+TITLES = ("Senior Software Engineer", "Product Manager", "Staff Data Scientist", "Account Executive",
+          "Head of Design", "Engineering Manager", "Principal Engineer", "Recruiter",
+          "Customer Success Lead", "Marketing Associate")
+
+
+def ats_urls(base_url: str) -> Dict[str, str]:
+    """``ATS_URLS``-style templates pointing at a mock server."""
+    base = base_url.rstrip("/")
+    return {
+        "greenhouse": base + "/greenhouse/v1/boards/{slug}/jobs",
+        "lever": base + "/lever/v0/postings/{slug}?mode=json",
+        "ashby": base + "/ashby/job-board-api/postings?organizationSlug={slug}",
+        "workable": base + "/workable/api/v1/widget/accounts/{slug}",
+        "recruitee": base + "/recruitee/{slug}/api/offers/",
+    }
+
+
+@dataclass
+class MockConfig:
+    seed: int = 0
+    board_rate: float = 0.03  # share of (provider, slug) pairs that have a board
+    min_jobs: int = 1
+    max_jobs: int = 40
+    latency_ms: float = 20.0  # mean injected latency, uniform in [0.5x, 1.5x]
+    error_rate: float = 0.0  # share of requests answered with a 500
+    throttle_rate: float = 0.0  # share of requests answered with a 429
+    retry_after: int = 1  # Retry-After seconds sent with a 429
+
+
+def _unit(*parts: object) -> int:
+    return int.from_bytes(hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=8).digest(), "big")
+
+
+def board_size(cfg: MockConfig, source: str, slug: str) -> int:
+    """Postings on (source, slug)'s board, 0 if it has none."""
+    h = _unit(cfg.seed, source, slug)
+    if h / 2 ** 64 >= cfg.board_rate:
+        return 0
+    return cfg.min_jobs + (h >> 16) % (cfg.max_jobs - cfg.min_jobs + 1)
+
+
+def _items(source: str, payload):
+    return payload if source == "lever" else payload[{"greenhouse": "jobs", "ashby": "postings",
+                                                      "workable": "jobs", "recruitee": "offers"}[source]]
+
+
+@lru_cache(maxsize=None)
+def _fixture(source: str):
+    return json.loads((FIXTURES / f"{source}.json").read_text(encoding="utf-8"))
+
+
+@lru_cache(maxsize=4096)
+def board_body(source: str, n_jobs: int) -> bytes:
+    """The provider's fixture payload with its single posting repeated ``n_jobs`` times."""
+    payload = copy.deepcopy(_fixture(source))
+    items = _items(source, payload)
+    template = items[0]
+    title_key = "text" if source == "lever" else "title"
+    items[:] = [dict(template, **{title_key: TITLES[i % len(TITLES)]}) for i in range(n_jobs)]
+    return json.dumps(payload).encode("utf-8")
+
+
+class _Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.latencies: List[float] = []
+        self.by_status: Dict[int, int] = {}
+        self.bytes = 0
+
+    def add(self, status: int, seconds: float, size: int) -> None:
+        with self.lock:
+            self.latencies.append(seconds)
+            self.by_status[status] = self.by_status.get(status, 0) + 1
+            self.bytes += size
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            lat = sorted(self.latencies)
+            by_status = {str(k): v for k, v in sorted(self.by_status.items())}
+            sent = self.bytes
+
+        def pct(q: float) -> Optional[float]:
+            return round(lat[min(len(lat) - 1, int(q * len(lat)))] * 1000, 3) if lat else None
+
+        return {"requests": len(lat), "by_status": by_status, "bytes": sent,
+                "latency_ms": {"p50": pct(0.50), "p95": pct(0.95), "p99": pct(0.99)}}
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # listen backlog; the default of 5 refuses bursts
+
+
+def make_server(cfg: MockConfig, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    stats = _Stats()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, fmt, *args):
+            pass
+
+        def _send(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            started = time.perf_counter()
+            url = urlsplit(self.path)
+            if url.path == "/__stats":
+                return self._send(200, json.dumps(stats.snapshot()).encode())
+            if url.path == "/__reset":
+                with stats.lock:
+                    stats.reset()
+                return self._send(200, b"{}")
+
+            for source, route in ROUTES.items():
+                m = route.match(url.path)
+                if m:
+                    break
+            else:
+                return self._send(404, b"{}")
+            slug = m.groupdict().get("slug") or (parse_qs(url.query).get("organizationSlug") or [""])[0]
+
+            if cfg.latency_ms:
+                time.sleep(cfg.latency_ms / 1000 * random.uniform(0.5, 1.5))
+            roll = random.random()
+            headers = None
+            if roll < cfg.throttle_rate:
+                status, body, headers = 429, b'{"error":"rate limited"}', {"Retry-After": str(cfg.retry_after)}
+            elif roll < cfg.throttle_rate + cfg.error_rate:
+                status, body = 500, b'{"error":"internal"}'
+            else:
+                n = board_size(cfg, source, slug)
+                status, body = (200, board_body(source, n)) if n else (404, b'{"error":"not found"}')
+            self._send(status, body, headers)
+            stats.add(status, time.perf_counter() - started, len(body))
+
+    return _Server((host, port), Handler)
+
+
+def _serve(cfg: MockConfig, conn) -> None:
+    server = make_server(cfg)
+    conn.send(server.server_address[1])
+    server.serve_forever()
+
+
+def server_stats(base_url: str) -> dict:
+    """Requests, status counts, bytes and latency percentiles served since the last reset."""
+    with urlopen(base_url + "/__stats") as r:
+        return json.loads(r.read())
+
+
+def reset_stats(base_url: str) -> None:
+    urlopen(base_url + "/__reset").read()
+
+
+class MockAtsServer:
+    """Runs the mock server in a child process so it doesn't compete with the client for the GIL."""
+
+    def __init__(self, cfg: Optional[MockConfig] = None):
+        self.cfg = cfg or MockConfig()
+        parent, child = mp.Pipe()
+        self._proc = mp.Process(target=_serve, args=(self.cfg, child), daemon=True)
+        self._proc.start()
+        self.base_url = f"http://127.0.0.1:{parent.recv()}"
+
+    def urls(self) -> Dict[str, str]:
+        return ats_urls(self.base_url)
+
+    def stats(self) -> dict:
+        return server_stats(self.base_url)
+
+    def reset(self) -> None:
+        reset_stats(self.base_url)
+
+    def close(self) -> None:
+        self._proc.terminate()
+        self._proc.join()
+
+    def __enter__(self) -> "MockAtsServer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def config_args(ap: argparse.ArgumentParser) -> None:
+    """Add ``MockConfig`` options to a parser."""
+    d = MockConfig()
+    ap.add_argument("--seed", type=int, default=d.seed)
+    ap.add_argument("--board-rate", type=float, default=d.board_rate,
+                    help="Share of (provider, slug) pairs that have a board")
+    ap.add_argument("--min-jobs", type=int, default=d.min_jobs, help="Smallest board size")
+    ap.add_argument("--max-jobs", type=int, default=d.max_jobs, help="Largest board size")
+    ap.add_argument("--latency-ms", type=float, default=d.latency_ms, help="Mean injected latency")
+    ap.add_argument("--error-rate", type=float, default=d.error_rate, help="Share of 500 responses")
+    ap.add_argument("--throttle-rate", type=float, default=d.throttle_rate, help="Share of 429 responses")
+    ap.add_argument("--retry-after", type=int, default=d.retry_after, help="Retry-After sent with 429s")
+
+
+def config_from(args: argparse.Namespace) -> MockConfig:
+    return MockConfig(**{k: getattr(args, k) for k in asdict(MockConfig())})
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Mock ATS job-board server")
+    ap.add_argument("--port", type=int, default=8765)
+    config_args(ap)
+    args = ap.parse_args()
+    server = make_server(config_from(args), port=args.port)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    print(json.dumps(ats_urls(base), indent=2))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""Offline scan/score benchmarks against the mock ATS server.
+
+For each network size, a fresh subprocess (so peak RSS is per size) writes a
+synthetic LinkedIn connections CSV, then times ``read_connections``,
+``discover_and_fetch`` against the mock server and ``compute_scores``. Probe
+latency comes from the scan's own ``ScanMetrics`` (client side); the server's
+view is reported alongside as ``server_latency_ms``. Results are printed (or
+written with ``--out``) as JSON; ``--compare baseline.json`` flags regressions
+beyond ``--tolerance`` and exits non-zero.
+
+    python -m benchmarks.run --sizes 1000,10000 --out bench.json
+    python -m benchmarks.run --sizes 1000,10000 --compare bench.json
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from .mock_ats import MockAtsServer, config_args, config_from
+
+ROOT = Path(__file__).resolve().parent.parent
+SYLLABLES = ("ka", "ro", "tex", "vi", "lo", "nu", "mar", "sen", "dor", "qui", "fa", "zen", "bel",
+             "tra", "po", "lin", "ges", "ho", "ri", "cor", "an", "mo", "stel", "ix", "da", "ver")
+SUFFIXES = ("", "", "", " Inc", " GmbH", " Ltd", " Labs", " AG", " Technologies")
+# (section, metric) → direction; "higher" means larger values are better
+TRACKED = {
+    ("read_connections", "rows_per_s"): "higher",
+    ("scan", "companies_per_s"): "higher",
+    ("scan", "requests_per_s"): "higher",
+    ("scan", "latency_ms.p50"): "lower",
+    ("scan", "latency_ms.p95"): "lower",
+    ("scan", "latency_ms.p99"): "lower",
+    ("scan", "probes_per_company"): "lower",
+    ("score", "rows_per_s"): "higher",
+    ("process", "peak_rss_mb"): "lower",
+}
+
+
+def synthetic_companies(n: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    out, seen = [], set()
+    while len(out) < n:
+        words = ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+                 for _ in range(rng.choice((1, 1, 2, 2, 3)))]
+        name = " ".join(words) + rng.choice(SUFFIXES)
+        if name not in seen:
+            seen.add(name)
+            out.append(name)
+    return out
+
+
+def write_connections(path: Path, companies: List[str], seed: int = 0) -> int:
+    """LinkedIn-style export (with its Notes preamble); 1-7 contacts per company."""
+    rng = random.Random(seed)
+    rows = 0
+    with path.open("w", encoding="utf-8", newline="") as fh:
+        fh.write("Notes:\n\"When exporting your connection data, you may notice ...\"\n\n")
+        fh.write("First Name,Last Name,URL,Email Address,Company,Position,Connected On\n")
+        for company in companies:
+            for i in range(rng.randint(1, 7)):
+                title = rng.choice(("Senior Engineer", "Product Manager", "Designer", "Head of Sales"))
+                fh.write(f"Pat,Doe{rows},https://www.linkedin.com/in/p{rows},,\"{company}\","
+                         f"{title},01 Jan 2024\n")
+                rows += 1
+    return rows
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_size(args: argparse.Namespace) -> dict:
+    """Benchmark one network size in this process (invoked via ``--child``)."""
+    from wrkmatch import compute_scores, discover_and_fetch, read_connections, Scheduler
+    from wrkmatch.ats_clients import ATS_URLS
+    from .mock_ats import ats_urls, reset_stats, server_stats
+
+    n = args.child
+    companies = synthetic_companies(n, args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "Connections.csv"
+        n_rows = write_connections(csv_path, companies, args.seed)
+        t0 = time.perf_counter()
+        connections_df = read_connections(csv_path)
+        t_read = time.perf_counter() - t0
+
+    ATS_URLS.update(ats_urls(args.server))
+    reset_stats(args.server)
+    t0 = time.perf_counter()
+    jobs_df = discover_and_fetch(companies, max_workers=args.max_workers, probe=args.probe,
+                                 fanout=args.fanout, engine=args.engine,
+                                 scheduler=Scheduler(rate=args.rate, burst=2 * args.rate))
+    t_scan = time.perf_counter() - t0
+    served = server_stats(args.server)
+    status = jobs_df.attrs.get("company_status", {})
+    metrics = jobs_df.attrs["scan_metrics"].to_dict()
+    probe_ms = metrics["probes"]["latency_ms"]
+
+    t0 = time.perf_counter()
+    scores_df = compute_scores(connections_df, jobs_df)
+    t_score = time.perf_counter() - t0
+
+    return {
+        "size": n,
+        "read_connections": {"rows": n_rows, "seconds": round(t_read, 4),
+                             "rows_per_s": round(n_rows / t_read, 1)},
+        "scan": {"companies": n, "seconds": round(t_scan, 3),
+                 "companies_per_s": round(n / t_scan, 1),
+                 "requests": served["requests"], "requests_per_s": round(served["requests"] / t_scan, 1),
+                 "by_status": served["by_status"], "bytes": served["bytes"],
+                 # client-side, per probe (admission wait + retries + parse)
+                 "latency_ms": {q: probe_ms[q] for q in ("p50", "p95", "p99")},
+                 "request_latency_ms": {q: metrics["requests"]["latency_ms"][q] for q in ("p50", "p95", "p99")},
+                 "server_latency_ms": served["latency_ms"],
+                 "probes_per_company": metrics["companies"]["probes_mean"],
+                 "parse_ms": {src: m["mean"] for src, m in metrics["probes"]["parse_ms"].items()},
+                 "hits": sum(1 for s in status.values() if s == "hit"), "jobs": len(jobs_df)},
+        "score": {"rows": len(connections_df) + len(jobs_df), "companies": len(scores_df),
+                  "seconds": round(t_score, 4),
+                  "rows_per_s": round((len(connections_df) + len(jobs_df)) / t_score, 1)},
+        "process": {"peak_rss_mb": _peak_rss_mb()},
+    }
+
+
+def _get(section: dict, dotted: str):
+    for part in dotted.split("."):
+        section = section.get(part) if isinstance(section, dict) else None
+    return section
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> List[str]:
+    """Human-readable regressions of ``current`` against ``baseline`` (matched by size)."""
+    base_by_size = {r["size"]: r for r in baseline.get("results", [])}
+    regressions = []
+    for res in current["results"]:
+        base = base_by_size.get(res["size"])
+        if base is None:
+            continue
+        for (section, metric), better in TRACKED.items():
+            old, new = _get(base.get(section, {}), metric), _get(res.get(section, {}), metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (better == "higher" and change < -tolerance) or (better == "lower" and change > tolerance):
+                regressions.append(f"size={res['size']} {section}.{metric}: {old} -> {new} ({change:+.1%})")
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description="wrkmatch offline benchmarks")
+    ap.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated company counts")
+    ap.add_argument("--out", default=None, help="Write the JSON report here instead of stdout")
+    ap.add_argument("--compare", default=None, help="Baseline JSON report to check for regressions")
+    ap.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative slowdown")
+    ap.add_argument("--engine", choices=["threads", "async"], default="threads")
+    ap.add_argument("--probe", choices=["serial", "race"], default="serial")
+    ap.add_argument("--fanout", type=int, default=8)
+    ap.add_argument("--max-workers", type=int, default=32)
+    ap.add_argument("--rate", type=float, default=5000.0, help="Scheduler requests/second per provider")
+    ap.add_argument("--child", type=int, default=None, help=argparse.SUPPRESS)
+    ap.add_argument("--server", default=None, help=argparse.SUPPRESS)
+    config_args(ap)
+    args = ap.parse_args()
+
+    if args.child is not None:
+        print(json.dumps(run_size(args)))
+        return
+
+    cfg = config_from(args)
+    passthrough = ["--engine", args.engine, "--probe", args.probe, "--fanout", str(args.fanout),
+                   "--max-workers", str(args.max_workers), "--rate", str(args.rate), "--seed", str(args.seed)]
+    results = []
+    with MockAtsServer(cfg) as server:
+        for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+            print(f"benchmarking {size} companies…", file=sys.stderr)
+            proc = subprocess.run([sys.executable, "-m", "benchmarks.run", "--child", str(size),
+                                   "--server", server.base_url] + passthrough,
+                                  cwd=ROOT, capture_output=True, text=True,
+                                  env=dict(os.environ, PYTHONPATH=str(ROOT)))
+            if proc.returncode != 0:
+                sys.stderr.write(proc.stderr)
+                raise SystemExit(f"benchmark for size {size} failed")
+            results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    report = {
+        "meta": {"created": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "python": platform.python_version(),
+                 "platform": platform.platform(), "cpus": os.cpu_count(),
+                 "options": {k: v for k, v in vars(args).items()
+                             if k not in ("child", "server", "out", "compare")}},
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    if args.compare:
+        regressions = compare(json.loads(Path(args.compare).read_text(encoding="utf-8")), report, args.tolerance)
+        for line in regressions:
+            print("REGRESSION " + line, file=sys.stderr)
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
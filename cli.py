@@ -1,36 +1,516 @@
 from __future__ import annotations
 import argparse
+import copy
+import cProfile
+import csv
+import pstats
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager
 from pathlib import Path
+from typing import Dict, List
 
-from wrkmatch import read_connections, discover_and_fetch, compute_scores
+import pandas as pd
 
+from wrkmatch import (read_connections, iter_connections, iter_discover, compute_scores, ResolutionCache,
+                      Scheduler, HttpCache, AliasTable, ProbeStats, ScanMetrics, ScanJournal,
+                      normalize_company_name)
+from wrkmatch.fetch import JOB_COLUMNS, job_records, jobs_frame
+from wrkmatch.io_utils import OUTPUT_FORMATS, load_run, merge_runs, write_run, write_table
+from wrkmatch.scoring import aggregate_jobs, compute_team_scores
+from wrkmatch.shards import parse_shard, shard_companies
+from wrkmatch.snapshots import SnapshotStore
+from wrkmatch.titles import LEVELS
 
-def main():
+
+@contextmanager
+def profiled(path):
+    """cProfile the block, including threads it starts, and dump merged stats to ``path``."""
+    profiles = []
+
+    def start(*_):
+        sys.setprofile(None)
+        prof = cProfile.Profile()
+        try:
+            prof.enable()
+        except ValueError:  # another profiler is already active in this interpreter
+            return
+        profiles.append(prof)
+
+    main = cProfile.Profile()
+    threading.setprofile(start)
+    main.enable()
+    try:
+        yield
+    finally:
+        main.disable()
+        threading.setprofile(None)
+        stats = pstats.Stats(main)
+        for prof in profiles:
+            stats.add(prof)
+        stats.dump_stats(path)
+
+
+def _status_frame(status: dict) -> pd.DataFrame:
+    return pd.Series(status, name="status", dtype=str).rename_axis("company").reset_index()
+
+
+def scan(args, companies, aliases=None, metrics=None) -> tuple:
+    """Run the scan and return (jobs_df, status_df).
+
+    Every finished company is appended to the scan journal; with ``--resume``,
+    companies the journal already has a final hit/miss for are restored instead of
+    scanned. For CSV output, postings are appended to jobs_report.csv as each
+    company resolves; partial outputs are rewritten every ``--flush-every`` seconds.
+    """
+    out_dir = Path(args.out_dir)
+    journal = ScanJournal(args.journal or out_dir / "scan_journal.jsonl")
+    restored = journal.finished(companies) if args.resume else {}
+    todo = [c for c in companies if c not in restored]
+    if args.resume:
+        print(f"  Resuming from {journal.path}: {len(restored)} companies done, {len(todo)} to scan.")
+
+    cache = None
+    if args.cache:
+        cache = ResolutionCache(args.cache,
+                                hit_ttl=args.hit_ttl_days * 86400,
+                                miss_ttl=args.miss_ttl_days * 86400)
+    http_cache = HttpCache(args.http_cache, max_bytes=args.http_cache_mb * 1024 * 1024) if args.http_cache else None
+    probe_stats = ProbeStats(args.probe_stats) if args.probe_stats else None
+    engine_opts = {"limit_per_host": args.limit_per_host} if args.engine == "async" else {}
+    results = iter_discover(todo, max_workers=args.max_workers, cache=cache,
+                            probe=args.probe, fanout=args.fanout, engine=args.engine,
+                            scheduler=Scheduler(rate=args.rate, burst=2 * args.rate),
+                            http_cache=http_cache, aliases=aliases, probe_stats=probe_stats,
+                            metrics=metrics, **engine_opts)
+    status: dict = {}
+    found: dict = {}
+    n_jobs = 0
+    jobs_path = out_dir / "jobs_report.csv"
+    with ExitStack() as stack:
+        stack.enter_context(journal.open(resume=args.resume))
+        writer = None
+        if args.format == "csv":
+            # Stream each company's postings to disk as soon as it resolves
+            fh = stack.enter_context(jobs_path.open("w", newline="", encoding="utf-8"))
+            writer = csv.writer(fh)
+            writer.writerow(JOB_COLUMNS)
+
+        def flush() -> None:
+            if writer is not None:
+                fh.flush()
+                write_run(out_dir, None, None, _status_frame(status), "csv")
+            else:
+                write_run(out_dir, jobs_frame(found), None, _status_frame(status), args.format)
+            journal.sync()
+
+        def record(res) -> None:
+            nonlocal n_jobs
+            status[res.company] = res.status
+            if res.jobs:
+                if writer is not None:
+                    writer.writerows(job_records(res.company, res.jobs))
+                else:
+                    found[res.company] = res.jobs
+                n_jobs += len(res.jobs)
+
+        for res in restored.values():
+            record(res)
+        last_flush = time.monotonic()
+        try:
+            for res in results:
+                journal.append(res)
+                record(res)
+                if res.jobs:
+                    print(f"  [{len(status)}/{len(companies)}] {res.company}: {len(res.jobs)} roles")
+                if args.flush_every and time.monotonic() - last_flush >= args.flush_every:
+                    flush()
+                    last_flush = time.monotonic()
+        except KeyboardInterrupt:
+            results.close()
+            flush()
+            print(f"\nInterrupted after {len(status)}/{len(companies)} companies; partial outputs are in "
+                  f"{out_dir}. Rerun with --resume to scan only the rest.")
+            raise SystemExit(130)
+    print(f"  Found {n_jobs} roles.")
+    status = pd.Series(status, name="status", dtype=str)
+    counts = status.value_counts()
+    print("  " + ", ".join(f"{k}: {int(v)}" for k, v in counts.items()))
+    if counts.get("throttled", 0) or counts.get("error", 0):
+        print("  Throttled/errored companies are unresolved, not misses — rerun to retry them.")
+    if probe_stats is not None:
+        print(f"  Probing: {probe_stats.summary()}")
+    if writer is not None:
+        jobs_df = pd.read_csv(jobs_path, dtype=str, keep_default_na=False)
+    else:
+        jobs_df = jobs_frame(found)
+    return jobs_df, status.rename_axis("company").reset_index()
+
+
+def level_boost(spec: str) -> tuple:
+    """argparse type for ``--level-boost LEVEL=BOOST``."""
+    level, _, boost = spec.partition("=")
+    level = level.strip().lower()
+    if level not in LEVELS:
+        raise argparse.ArgumentTypeError(f"unknown level {level!r}; choose from {', '.join(LEVELS)}")
+    try:
+        return level, float(boost)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected LEVEL=BOOST, got {spec!r}") from None
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["merge"]:
+        return merge_main(argv[1:])
+    if argv[:1] == ["serve"]:
+        return serve_main(argv[1:])
     ap = argparse.ArgumentParser(description="wrkmatch CLI")
-    ap.add_argument("connections_csv", help="Path to LinkedIn connections CSV")
+    ap.add_argument("connections_csv", nargs="+",
+                    help="Path to LinkedIn connections CSV; several CSVs or a directory of them "
+                         "score a whole team against one shared scan (batch mode)")
     ap.add_argument("--out-dir", default="out", help="Directory to write outputs")
-    args = ap.parse_args()
+    ap.add_argument("--cache", default=None,
+                    help="JSON file remembering company → ATS board resolutions between runs")
+    ap.add_argument("--hit-ttl-days", type=float, default=30, help="How long a resolved board is trusted")
+    ap.add_argument("--miss-ttl-days", type=float, default=14, help="How long a failed probe is remembered")
+    ap.add_argument("--probe", choices=["serial", "race"], default="serial",
+                    help="race: probe a company's (slug, provider) pairs concurrently")
+    ap.add_argument("--fanout", type=int, default=8, help="Concurrent probes per company in race mode")
+    ap.add_argument("--engine", choices=["threads", "async"], default="threads",
+                    help="async: single event loop with pooled connections per ATS host (needs aiohttp)")
+    ap.add_argument("--limit-per-host", type=int, default=64,
+                    help="Max open connections per ATS provider (async engine)")
+    ap.add_argument("--max-workers", type=int, default=12, help="Companies probed in parallel (threads engine)")
+    ap.add_argument("--rate", type=float, default=50.0, help="Max requests/second per ATS provider")
+    ap.add_argument("--http-cache", default=None,
+                    help="Directory for conditional (ETag/Last-Modified) caching of job-board feeds")
+    ap.add_argument("--http-cache-mb", type=int, default=256, help="Size cap for --http-cache (LRU eviction)")
+    ap.add_argument("--format", choices=list(OUTPUT_FORMATS), default="csv",
+                    help="Output format; parquet/feather partition jobs by source and keep dtypes")
+    ap.add_argument("--jobs-from", default=None,
+                    help="Score against the jobs of a previous run's output directory instead of scanning")
+    ap.add_argument("--probe-stats", default=None,
+                    help="JSON file of per (slug shape, provider) hit rates; orders probes so "
+                         "likely boards are tried first, and is updated after each run")
+    ap.add_argument("--journal", default=None,
+                    help="JSONL file recording each finished company (default: <out-dir>/scan_journal.jsonl)")
+    ap.add_argument("--resume", action="store_true",
+                    help="Skip companies the journal already has a hit/miss for and merge them into the outputs")
+    ap.add_argument("--flush-every", type=float, default=60,
+                    help="Rewrite partial outputs every N seconds during the scan (0 disables)")
+    ap.add_argument("--shard", default=None,
+                    help="Scan only shard i/n (0 <= i < n, by a stable hash of the company name) and "
+                         "write partial outputs; combine them with `cli.py merge`")
+    ap.add_argument("--processes", type=int, default=1,
+                    help="Scan N shards in parallel processes on this machine, then merge and score")
+    ap.add_argument("--score-workers", type=int, default=None,
+                    help="Processes scoring exports in batch mode (default: all cores)")
+    ap.add_argument("--snapshots", default=None,
+                    help="SQLite file recording each scan's added/removed/changed postings "
+                         "(ignored with --shard and --jobs-from; record shards with `cli.py merge`)")
+    ap.add_argument("--metrics-out", default=None,
+                    help="Write scan metrics here: Prometheus text for .prom/.txt, JSON otherwise")
+    ap.add_argument("--profile", default=None,
+                    help="Write a cProfile dump of the run here (inspect with python -m pstats)")
+    ap.add_argument("--level-boost", action="append", default=[], type=level_boost, metavar="LEVEL=BOOST",
+                    help="Add BOOST x the share of a company's postings at a seniority level "
+                         f"({', '.join(LEVELS)}) to its score; repeatable")
+    ap.add_argument("--aliases", default=None,
+                    help="CSV alias table (alias,canonical,score) merging fuzzy duplicates of a company; "
+                         "extended with this run's companies and saved back (read-only with --shard)")
+    args = ap.parse_args(argv)
+    exports = expand_exports(args.connections_csv)
+    if not exports:
+        ap.error("no connection CSVs found")
+    batch = len(exports) > 1 or any(Path(p).is_dir() for p in args.connections_csv)
+    if batch and (args.shard or args.processes > 1):
+        ap.error("--shard and --processes apply to a single export; batch mode scans the union once")
+    args.connections_csv = str(exports[0])
+    if args.shard:
+        if args.processes > 1:
+            ap.error("--shard and --processes can't be combined")
+        try:
+            parse_shard(args.shard)
+        except ValueError as e:
+            ap.error(str(e))
 
     out_dir = Path(args.out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
+    metrics = ScanMetrics()
+    with ExitStack() as stack:
+        if args.profile:
+            stack.enter_context(profiled(args.profile))
+        if batch:
+            run_batch(args, exports, out_dir, metrics)
+        elif args.processes > 1:
+            run_processes(args, out_dir, metrics)
+        else:
+            run(args, out_dir, metrics)
+    if args.metrics_out:
+        print(f"Wrote metrics to {metrics.write(args.metrics_out)}")
+    if args.profile:
+        print(f"Wrote profile to {args.profile}")
 
+
+def read_companies(args, metrics: ScanMetrics) -> tuple:
+    """Read the connections and the alias table; return (connections_df, companies, aliases)."""
     print("Reading connections…")
-    connections_df = read_connections(args.connections_csv)
-    companies = sorted(set(connections_df["Company"].dropna().astype(str).str.strip()))
+    with metrics.phase("read"):
+        connections_df = read_connections(args.connections_csv)
+        companies = sorted(set(connections_df["Company"].dropna().astype(str).str.strip()))
+    return connections_df, companies, load_aliases(args, companies, metrics)
+
+
+def load_aliases(args, companies, metrics: ScanMetrics):
+    aliases = None
+    if args.aliases:
+        with metrics.phase("aliases"):
+            aliases = AliasTable.load(args.aliases) if Path(args.aliases).exists() else AliasTable()
+            if not args.shard:
+                # shards only read the table, so concurrent shards never rewrite it
+                aliases = aliases.extend(companies)
+                aliases.save(args.aliases)
+        print(f"  {len(aliases)} company aliases in {args.aliases}")
+    return aliases
 
-    print(f"Scanning {len(companies)} companies for public job boards…")
-    jobs_df = discover_and_fetch(companies)
 
+def record_snapshot(path, jobs_df, status_df, out_dir: Path, metrics: ScanMetrics) -> None:
+    """Append this scan to the snapshot store at ``path`` as a delta of postings."""
+    with metrics.phase("snapshot"):
+        status = dict(zip(status_df["company"], status_df["status"])) if status_df is not None else None
+        summary = SnapshotStore(path).record(jobs_df, status, label=str(out_dir))
+    print(f"Snapshot run {summary.run_id} in {path}: +{summary.added} -{summary.removed} ~{summary.changed} "
+          f"({summary.unchanged} unchanged)")
+
+
+def score_and_write(connections_df, jobs_df, status_df, aliases, out_dir: Path, fmt: str,
+                    metrics: ScanMetrics, jobs_streamed: bool = False, level_boosts=None) -> None:
     print("Scoring companies…")
-    scores_df = compute_scores(connections_df, jobs_df)
+    with metrics.phase("score"):
+        scores_df = compute_scores(connections_df, jobs_df, aliases=aliases, level_boosts=level_boosts)
 
-    jobs_path = out_dir / "jobs_report.csv"
-    scores_path = out_dir / "company_scores.csv"
-    jobs_df.to_csv(jobs_path, index=False)
-    scores_df.to_csv(scores_path, index=False)
+    with metrics.phase("write"):
+        if jobs_streamed:
+            # jobs_report.csv was already streamed during the scan
+            written = [out_dir / "jobs_report.csv"] + write_run(out_dir, None, scores_df, status_df, "csv")
+        else:
+            written = write_run(out_dir, jobs_df, scores_df, status_df, fmt)
+    print("Wrote " + ", ".join(str(p) for p in written))
+
+
+def run(args, out_dir: Path, metrics: ScanMetrics) -> None:
+    connections_df, companies, aliases = read_companies(args, metrics)
+    if args.shard:
+        i, n = parse_shard(args.shard)
+        companies = shard_companies(companies, i, n, aliases)
+        print(f"  Shard {i}/{n}: {len(companies)} companies")
+
+    if args.jobs_from:
+        print(f"Loading jobs from {args.jobs_from}…")
+        with metrics.phase("load"):
+            previous = load_run(args.jobs_from)
+        jobs_df, status_df = previous.jobs, previous.status
+    else:
+        print(f"Scanning {len(companies)} companies for public job boards…")
+        with metrics.phase("scan"):
+            jobs_df, status_df = scan(args, companies, aliases, metrics)
+
+    if args.shard:
+        # Partial outputs only; scores need every shard (see `cli.py merge`)
+        with metrics.phase("write"):
+            if args.format == "csv" and not args.jobs_from:
+                write_run(out_dir, None, None, status_df, "csv")
+            else:
+                write_run(out_dir, jobs_df, None, status_df, args.format)
+        print(f"Wrote shard {args.shard} to {out_dir}; combine shards with `python cli.py merge`.")
+        return
+
+    if args.snapshots and not args.jobs_from:
+        record_snapshot(args.snapshots, jobs_df, status_df, out_dir, metrics)
+    score_and_write(connections_df, jobs_df, status_df, aliases, out_dir, args.format, metrics,
+                    jobs_streamed=args.format == "csv" and not args.jobs_from, level_boosts=dict(args.level_boost))
+
+
+def _run_shard(args) -> tuple:
+    metrics = ScanMetrics()
+    run(args, Path(args.out_dir), metrics)
+    return args.out_dir, metrics
+
+
+def run_processes(args, out_dir: Path, metrics: ScanMetrics) -> None:
+    """Scan ``--processes`` shards in parallel worker processes, then merge and score once."""
+    n = args.processes
+    connections_df, companies, aliases = read_companies(args, metrics)
+    shard_args = []
+    for i in range(n):
+        a = copy.copy(args)
+        a.shard, a.processes = f"{i}/{n}", 1
+        shard_dir = out_dir / "shards" / f"shard-{i}"
+        shard_dir.mkdir(parents=True, exist_ok=True)
+        a.out_dir = str(shard_dir)
+        if args.journal:
+            # one journal per shard: each process rewrites its own file
+            journal = Path(args.journal)
+            a.journal = str(journal.with_name(f"{journal.stem}-shard-{i}{journal.suffix}"))
+        a.metrics_out = a.profile = a.snapshots = None
+        shard_args.append(a)
+    print(f"Scanning {len(companies)} companies in {n} processes…")
+    with metrics.phase("scan"), ProcessPoolExecutor(max_workers=n) as ex:
+        shard_dirs = []
+        for shard_dir, shard_metrics in ex.map(_run_shard, shard_args):
+            shard_dirs.append(shard_dir)
+            metrics.merge(shard_metrics)
+    with metrics.phase("merge"):
+        merged = merge_runs(shard_dirs)
+    if args.snapshots:
+        record_snapshot(args.snapshots, merged.jobs, merged.status, out_dir, metrics)
+    score_and_write(connections_df, merged.jobs, merged.status, aliases, out_dir, args.format, metrics,
+                    level_boosts=dict(args.level_boost))
+
+
+def expand_exports(paths) -> List[Path]:
+    """CSV paths from files and directories (their ``*.csv``, sorted), without duplicates."""
+    out: List[Path] = []
+    for p in map(Path, paths):
+        for f in (sorted(p.glob("*.csv")) if p.is_dir() else [p]):
+            if f not in out:
+                out.append(f)
+    return out
+
+
+def person_names(exports: List[Path]) -> List[str]:
+    """One output name per export: the file stem, numbered when stems repeat."""
+    seen: Dict[str, int] = {}
+    names = []
+    for path in exports:
+        n = seen[path.stem] = seen.get(path.stem, 0) + 1
+        names.append(path.stem if n == 1 else f"{path.stem}-{n}")
+    return names
+
+
+_batch: dict = {}
+
+
+def _init_scoring(job_stats, aliases, level_boosts, fmt) -> None:
+    _batch.update(job_stats=job_stats, aliases=aliases, level_boosts=level_boosts, fmt=fmt)
+
+
+def _score_export(task) -> pd.DataFrame:
+    """Score one export against the shared job stats; write it and return its contacts per company."""
+    path, person_dir = task
+    scores_df = compute_scores(read_connections(path), None, aliases=_batch["aliases"],
+                               level_boosts=_batch["level_boosts"], job_stats=_batch["job_stats"])
+    write_run(person_dir, None, scores_df, None, _batch["fmt"])
+    return scores_df[["norm", "contacts", "display_company"]]
+
+
+def run_batch(args, exports: List[Path], out_dir: Path, metrics: ScanMetrics) -> None:
+    """Scan the union of several people's companies once, then score each export and the team."""
+    print(f"Reading {len(exports)} connection exports…")
+    first_seen: Dict[str, str] = {}  # normalized name → first spelling, so each company is scanned once
+    per_export = 0
+    with metrics.phase("read"):
+        for path in exports:
+            norms = set()
+            for chunk in iter_connections(path):
+                for name in chunk["Company"].str.strip().unique():
+                    norm = normalize_company_name(name)
+                    first_seen.setdefault(norm, name)
+                    norms.add(norm)
+            per_export += len(norms)
+    companies = sorted(first_seen.values())
+    print(f"  {per_export} companies across exports, {len(companies)} distinct")
+    aliases = load_aliases(args, companies, metrics)
+
+    if args.jobs_from:
+        print(f"Loading jobs from {args.jobs_from}…")
+        with metrics.phase("load"):
+            previous = load_run(args.jobs_from)
+        jobs_df, status_df = previous.jobs, previous.status
+    else:
+        print(f"Scanning {len(companies)} companies for public job boards…")
+        with metrics.phase("scan"):
+            jobs_df, status_df = scan(args, companies, aliases, metrics)
+        if args.snapshots:
+            record_snapshot(args.snapshots, jobs_df, status_df, out_dir, metrics)
+
+    names = person_names(exports)
+    level_boosts = dict(args.level_boost)
+    print(f"Scoring {len(exports)} exports…")
+    with metrics.phase("score"):
+        job_stats = aggregate_jobs(jobs_df, aliases)
+        tasks = [(str(path), str(out_dir / "people" / name)) for path, name in zip(exports, names)]
+        with ProcessPoolExecutor(max_workers=args.score_workers, initializer=_init_scoring,
+                                 initargs=(job_stats, aliases, level_boosts, args.format)) as ex:
+            person_scores = dict(zip(names, ex.map(_score_export, tasks)))
+        team_df = compute_team_scores(person_scores, job_stats, level_boosts=level_boosts)
+
+    with metrics.phase("write"):
+        if args.format == "csv" and not args.jobs_from:
+            # jobs_report.csv was already streamed during the scan
+            written = [out_dir / "jobs_report.csv"] + write_run(out_dir, None, None, status_df, "csv")
+        else:
+            written = write_run(out_dir, jobs_df, None, status_df, args.format)
+        written.append(write_table(out_dir, "team_scores", team_df, args.format))
+    print("Wrote " + ", ".join(str(p) for p in written)
+          + f" and per-person company_scores under {out_dir / 'people'}")
+
+
+def merge_main(argv=None):
+    ap = argparse.ArgumentParser(prog="cli.py merge",
+                                 description="Combine shard outputs (from --shard i/n) and score them once")
+    ap.add_argument("connections_csv", help="Path to LinkedIn connections CSV")
+    ap.add_argument("shard_dirs", nargs="+", help="Output directories of the shards")
+    ap.add_argument("--out-dir", default="out", help="Directory to write the merged outputs")
+    ap.add_argument("--format", choices=list(OUTPUT_FORMATS), default="csv", help="Output format")
+    ap.add_argument("--aliases", default=None, help="Alias table the shards were scanned with")
+    ap.add_argument("--level-boost", action="append", default=[], type=level_boost, metavar="LEVEL=BOOST",
+                    help="Add BOOST x the share of a company's postings at a seniority level "
+                         f"({', '.join(LEVELS)}) to its score; repeatable")
+    ap.add_argument("--snapshots", default=None,
+                    help="SQLite file recording the merged scan's added/removed/changed postings")
+    args = ap.parse_args(argv)
+
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    metrics = ScanMetrics()
+    connections_df = read_connections(args.connections_csv)
+    aliases = AliasTable.load(args.aliases) if args.aliases else None
+    print(f"Merging {len(args.shard_dirs)} shards…")
+    merged = merge_runs(args.shard_dirs)
+    if args.snapshots:
+        record_snapshot(args.snapshots, merged.jobs, merged.status, out_dir, metrics)
+    score_and_write(connections_df, merged.jobs, merged.status, aliases, out_dir, args.format, metrics,
+                    level_boosts=dict(args.level_boost))
+
+
+def serve_main(argv=None):
+    from wrkmatch.server import QueryState, serve
+
+    ap = argparse.ArgumentParser(prog="cli.py serve",
+                                 description="Answer ranking/drill-down queries over a run from a warm in-memory index")
+    ap.add_argument("run_dir", help="Output directory of a previous run (single, batch or merged)")
+    ap.add_argument("--connections", nargs="*", default=[],
+                    help="Connections CSVs or directories to serve as extra users (enables contact names)")
+    ap.add_argument("--aliases", default=None, help="Alias table the run was scored with")
+    ap.add_argument("--host", default="127.0.0.1", help="Interface to bind (loopback by default)")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--reload-interval", type=float, default=5.0,
+                    help="Seconds between checks for new output in run_dir (0 disables hot reload)")
+    args = ap.parse_args(argv)
 
-    print(f"Wrote {jobs_path} and {scores_path}")
+    aliases = AliasTable.load(args.aliases) if args.aliases else None
+    started = time.perf_counter()
+    state = QueryState(args.run_dir, expand_exports(args.connections), aliases)
+    index = state.index
+    print(f"Indexed {len(index.postings):,} postings at {len(index.postings.code_of):,} companies for "
+          f"{len(index.users)} user(s) in {time.perf_counter() - started:.2f}s")
+    print(f"Serving on http://{args.host}:{args.port} (/rank, /company, /users, /metrics); Ctrl-C to stop")
+    serve(state, args.host, args.port, args.reload_interval)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
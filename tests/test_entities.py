@@ -0,0 +1,22 @@
+from wrkmatch import AliasTable
+from wrkmatch.entities import entity_key
+
+
+def test_entity_key_strips_only_legal_forms():
+    assert entity_key("globex gmbh co kg") == "globex"
+    assert entity_key("the globex") == "globex"
+    assert entity_key("bank of america") == "bank of america"
+    assert entity_key("international paper") == "international paper"
+
+
+def test_build_keeps_distinct_companies_apart():
+    table = AliasTable.build(["Bank of America", "US Bank", "International Paper", "Paper",
+                              "Global Payments", "Payments", "Globex GmbH & Co. KG", "Globex"])
+    assert table.mapping == {"globex gmbh co kg": "globex"}
+
+
+def test_extend_keeps_canonical_names():
+    table = AliasTable.build(["Globex", "The Globex", "The Globex"])
+    assert table.canonical("globex") == "the globex"
+    # "Globex" is now the most frequent spelling, but the canonical name doesn't move
+    assert table.extend(["Globex"] * 5).canonical("globex") == "the globex"
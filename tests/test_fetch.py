@@ -0,0 +1,39 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from wrkmatch.ats_clients import MISS, OK, JobColumns
+from wrkmatch.fetch import _probe_race
+
+PAIRS = [(f"slug{i}", "greenhouse") for i in range(6)]
+
+
+def test_race_yields_in_priority_order_and_drops_probes_behind_a_hit():
+    fetched = []
+    lock = threading.Lock()
+
+    def fetch(source, slug):
+        with lock:
+            fetched.append(slug)
+        if slug == "slug0":
+            time.sleep(0.2)  # the head is slow; slug2 hits meanwhile
+        return (OK, JobColumns()) if slug == "slug2" else (MISS, JobColumns())
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        outcomes = [(cand, res[0]) for cand, _, res in _probe_race(fetch, PAIRS, 3, pool, lambda s: 8)]
+    assert outcomes == [("slug0", MISS), ("slug1", MISS), ("slug2", OK)]
+    # slug3 may have been in flight with slug2, but nothing past it is started
+    assert "slug4" not in fetched and "slug5" not in fetched
+
+
+def test_race_without_free_slots_probes_one_at_a_time():
+    threads = set()
+
+    def fetch(source, slug):
+        threads.add(threading.get_ident())
+        return MISS, JobColumns()
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        outcomes = list(_probe_race(fetch, PAIRS, 8, pool, lambda s: 0))
+    assert [cand for cand, _, _ in outcomes] == [cand for cand, _ in PAIRS]
+    assert threads == {threading.get_ident()}
@@ -0,0 +1,25 @@
+import time
+
+from wrkmatch.ats_clients import OK, THROTTLED, Fetched
+from wrkmatch.scheduler import Scheduler
+
+
+def test_long_retry_after_fails_fast_instead_of_sleeping():
+    sched = Scheduler(backoff_cap=1.0)
+    sched.call("greenhouse", lambda: Fetched(THROTTLED, status=429, retry_after=3600))
+    calls = []
+    started = time.monotonic()
+    res = sched.call("greenhouse", lambda: calls.append(1) or Fetched(OK))
+    assert time.monotonic() - started < 0.5
+    assert res.outcome == THROTTLED and res.retry_after > 3000
+    assert not calls
+    # other providers are unaffected
+    assert sched.call("lever", lambda: Fetched(OK)).outcome == OK
+
+
+def test_short_retry_after_is_waited_out():
+    sched = Scheduler(backoff_cap=1.0, max_retries=0)
+    sched.call("greenhouse", lambda: Fetched(THROTTLED, status=429, retry_after=0.2))
+    started = time.monotonic()
+    assert sched.call("greenhouse", lambda: Fetched(OK)).outcome == OK
+    assert 0.1 < time.monotonic() - started < 1.0
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from wrkmatch import aggregate_jobs, compute_scores
+from wrkmatch.scoring import LEVEL_COLUMNS, top_k_positions
+
+
+def _jobs(rows):
+    return pd.DataFrame(rows, columns=["company", "title"])
+
+
+def test_level_shares_with_missing_levels():
+    # only ic and senior postings: the other levels must still be columns, at 0
+    stats = aggregate_jobs(_jobs([("Acme", "Senior Engineer"), ("Acme", "Engineer"), ("Acme", "Engineer")]))
+    row = stats.set_index("norm").loc["acme"]
+    assert list(stats.columns[stats.columns.str.startswith("level_")]) == LEVEL_COLUMNS
+    assert row["level_ic"] == pytest.approx(2 / 3)
+    assert row["level_senior"] == pytest.approx(1 / 3)
+    assert row[["level_staff", "level_manager", "level_exec"]].tolist() == [0, 0, 0]
+    assert row["senior_ratio"] == pytest.approx(1 / 3)
+
+
+def test_level_columns_follow_level_order():
+    # one posting per level, in an order unlike both LEVELS and the alphabet
+    titles = ["VP Engineering", "Engineer", "Engineering Manager", "Staff Engineer", "Senior Engineer",
+              "Engineer"]
+    row = aggregate_jobs(_jobs([("Initech", t) for t in titles])).set_index("norm").loc["initech"]
+    assert row["level_ic"] == pytest.approx(2 / 6)
+    for col in ("level_senior", "level_staff", "level_manager", "level_exec"):
+        assert row[col] == pytest.approx(1 / 6)
+
+
+def test_level_boost_targets_its_level():
+    connections = pd.DataFrame({"Company": ["Acme", "Globex"]})
+    jobs = _jobs([("Acme", "Director of Sales"), ("Globex", "Engineer")])
+    scores = compute_scores(connections, jobs, level_boosts={"exec": 10}).set_index("norm")
+    assert scores.loc["acme", "score"] > scores.loc["globex", "score"] + 5
+
+
+def test_top_k_ties_at_the_cut_break_by_index():
+    # many rows tied at the boundary score: the lowest indices win, same as a full sort
+    score = np.array([1.0] * 40 + [5.0, 3.0] + [1.0] * 40)
+    idx = np.arange(len(score))
+    full = top_k_positions(score, idx, None)
+    for k in (0, 1, 2, 3, 10, 81):
+        assert top_k_positions(score, idx, k).tolist() == full[:k].tolist()
+    assert top_k_positions(score, idx, 4).tolist() == [40, 41, 0, 1]
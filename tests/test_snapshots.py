@@ -0,0 +1,30 @@
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from wrkmatch.snapshots import SnapshotStore
+
+
+def _at(day: str) -> float:
+    return datetime.fromisoformat(day).replace(tzinfo=timezone.utc).timestamp()
+
+
+def _jobs(n: int) -> pd.DataFrame:
+    return pd.DataFrame({"company": "Acme", "source": "greenhouse", "title": [f"Engineer {i}" for i in range(n)],
+                         "location": "Remote", "url": [f"https://example.com/{i}" for i in range(n)]})
+
+
+def test_velocity_week_spanning_new_year(tmp_path):
+    store = SnapshotStore(tmp_path / "history.db")
+    store.record(_jobs(2), {"Acme": "hit"}, at=_at("2025-12-29T12:00:00"))  # Monday
+    store.record(_jobs(3), {"Acme": "hit"}, at=_at("2026-01-01T12:00:00"))  # Thursday, same week
+    store.record(_jobs(1), {"Acme": "hit"}, at=_at("2026-01-04T23:00:00"))  # Sunday, same week
+    store.record(_jobs(4), {"Acme": "hit"}, at=_at("2026-01-05T00:30:00"))  # next Monday
+
+    weekly = store.velocity("week")
+    assert weekly["period"].dt.strftime("%Y-%m-%d").tolist() == ["2025-12-29", "2026-01-05"]
+    assert weekly[["added", "removed", "net"]].values.tolist() == [[3, 2, 1], [3, 0, 3]]
+
+    monthly = store.velocity("month", company="Acme Inc")
+    assert monthly["period"].dt.strftime("%Y-%m-%d").tolist() == ["2025-12-01", "2026-01-01"]
+    assert monthly["added"].tolist() == [2, 4]
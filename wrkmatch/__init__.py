@@ -1,12 +1,44 @@
 __all__ = [
     "normalize_company_name",
+    "normalize_company_names",
     "slug_candidates",
+    "classify_titles",
     "discover_and_fetch",
+    "iter_discover",
     "compute_scores",
+    "compute_team_scores",
+    "aggregate_jobs",
+    "ScoringIndex",
+    "CompanyIndex",
     "read_connections",
+    "iter_connections",
+    "write_run",
+    "load_run",
+    "merge_runs",
+    "ResolutionCache",
+    "Scheduler",
+    "HttpCache",
+    "AliasTable",
+    "ProbeStats",
+    "ScanMetrics",
+    "ScanJournal",
+    "shard_of",
+    "shard_companies",
+    "SnapshotStore",
 ]
 
-from .normalize import normalize_company_name, slug_candidates
-from .fetch import discover_and_fetch
-from .scoring import compute_scores
-from .io_utils import read_connections
\ No newline at end of file
+from .normalize import normalize_company_name, normalize_company_names, slug_candidates
+from .titles import classify_titles
+from .fetch import discover_and_fetch, iter_discover
+from .scoring import compute_scores, compute_team_scores, aggregate_jobs, ScoringIndex
+from .index import CompanyIndex
+from .io_utils import read_connections, iter_connections, write_run, load_run, merge_runs
+from .resolution import ResolutionCache
+from .scheduler import Scheduler
+from .http_cache import HttpCache
+from .entities import AliasTable
+from .probe_stats import ProbeStats
+from .metrics import ScanMetrics
+from .journal import ScanJournal
+from .shards import shard_of, shard_companies
+from .snapshots import SnapshotStore
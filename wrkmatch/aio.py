@@ -0,0 +1,284 @@
+"""Asyncio scan engine: one event loop, one pooled keep-alive client per ATS provider.
+
+Requires ``aiohttp``. Use it via ``discover_and_fetch(..., engine="async")`` /
+``iter_discover(..., engine="async")``, or from async code via ``adiscover_and_fetch``
+and ``aiter_discover``.
+"""
+from __future__ import annotations
+import asyncio
+import json
+import queue
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from .ats_clients import (ATS_URLS, DEFAULT_HEADERS, ERROR, MISS, OK, Fetched, JobColumns,
+                          classify_status, parse_retry_after)
+from .fetch import HIT, CompanyResult, _candidate_pairs, _Tally, jobs_frame, parse_fetched
+from .http_cache import HttpCache
+from .metrics import ScanMetrics
+from .probe_stats import ProbeStats
+from .resolution import ResolutionCache
+from .scheduler import Scheduler
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+
+class _Clients:
+    """One ``aiohttp.ClientSession`` per provider, each with its own connection pool."""
+
+    def __init__(self, limit_per_host: int, timeout: float, scheduler: Scheduler,
+                 http_cache: Optional[HttpCache] = None, metrics: Optional[ScanMetrics] = None):
+        if aiohttp is None:
+            raise ImportError("The async engine needs aiohttp: pip install aiohttp")
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._scheduler = scheduler
+        self._http_cache = http_cache
+        self._metrics = metrics
+        self._sessions: Dict[str, "aiohttp.ClientSession"] = {}
+        for source in ATS_URLS:
+            connector = aiohttp.TCPConnector(limit=limit_per_host, limit_per_host=limit_per_host,
+                                             ttl_dns_cache=300)
+            self._sessions[source] = aiohttp.ClientSession(connector=connector, headers=DEFAULT_HEADERS,
+                                                           timeout=self._timeout)
+
+    async def get_json(self, source: str, url: str, conditional: bool = True) -> Fetched:
+        cache = self._http_cache if conditional else None
+        headers = cache.conditional_headers(url) if cache is not None else {}
+        try:
+            async with self._sessions[source].get(url, headers=headers) as r:
+                if r.status == 304 and cache is not None:
+                    data = cache.load(url)
+                    if data is not None:
+                        return Fetched(OK, data, status=304)
+                    return await self.get_json(source, url, conditional=False)
+                body = await r.read()
+                outcome = classify_status(r.status)
+                if outcome != OK:
+                    return Fetched(outcome, None, parse_retry_after(r.headers.get("Retry-After")),
+                                   r.status, len(body))
+                if "application/json" not in r.headers.get("Content-Type", ""):
+                    return Fetched(MISS, status=r.status, nbytes=len(body), reason="not_json")
+                try:
+                    data = json.loads(body)
+                except ValueError:
+                    return Fetched(MISS, status=r.status, nbytes=len(body), reason="bad_json")
+                if self._http_cache is not None:
+                    self._http_cache.store(url, body, r.headers.get("ETag"), r.headers.get("Last-Modified"), data)
+                return Fetched(OK, data, status=r.status, nbytes=len(body))
+        except aiohttp.ClientConnectorError as e:
+            # An unresolvable host (e.g. <slug>.recruitee.com) means there is no board.
+            if isinstance(e.os_error, socket.gaierror):
+                return Fetched(MISS, reason="dns")
+            return Fetched(ERROR, reason="connection")
+        except asyncio.TimeoutError:
+            return Fetched(ERROR, reason="timeout")
+        except aiohttp.ClientError:
+            return Fetched(ERROR, reason="connection")
+
+    async def fetch(self, source: str, slug: str) -> Tuple[str, JobColumns]:
+        url = ATS_URLS[source].format(slug=slug)
+        metrics = self._metrics
+        if metrics is None:
+            return parse_fetched(source, slug, await self._scheduler.acall(source, lambda: self.get_json(source, url)))
+
+        async def request() -> Fetched:
+            started = time.perf_counter()
+            res = await self.get_json(source, url)
+            metrics.observe_request(source, res, time.perf_counter() - started)
+            return res
+
+        started = time.perf_counter()
+        res = await self._scheduler.acall(source, request)
+        fetched = time.perf_counter()
+        outcome, jobs = parse_fetched(source, slug, res)
+        metrics.observe_probe(source, outcome, fetched - started, time.perf_counter() - fetched)
+        return outcome, jobs
+
+    async def close(self) -> None:
+        await asyncio.gather(*(s.close() for s in self._sessions.values()))
+
+
+async def _probe(clients: _Clients, pairs: List[Tuple[str, str]],
+                 fanout: int) -> AsyncIterator[Tuple[str, str, Tuple[str, JobColumns]]]:
+    """Run a company's probes ``fanout`` at a time, yielding outcomes in priority order.
+
+    Closing the iterator (after the first hit) cancels every probe still pending.
+    """
+    sem = asyncio.Semaphore(max(1, fanout))
+
+    async def one(cand: str, source: str) -> Tuple[str, JobColumns]:
+        async with sem:
+            return await clients.fetch(source, cand)
+
+    tasks = [asyncio.ensure_future(one(cand, source)) for cand, source in pairs]
+    try:
+        for (cand, source), task in zip(pairs, tasks):
+            yield cand, source, await task
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def aiter_discover(companies: List[str],
+                         cache: Union[ResolutionCache, str, Path, None] = None,
+                         probe: str = "serial", fanout: int = 8,
+                         limit_per_host: int = 64, max_in_flight: int = 1000,
+                         timeout: float = 6,
+                         scheduler: Optional[Scheduler] = None,
+                         http_cache: Union[HttpCache, str, Path, None] = None,
+                         probe_stats: Union[ProbeStats, str, Path, None] = None,
+                         metrics: Optional[ScanMetrics] = None) -> AsyncIterator[CompanyResult]:
+    """Async counterpart of ``iter_discover``: yield each company as soon as it resolves.
+
+    ``limit_per_host`` caps open connections per provider pool, ``max_in_flight``
+    caps companies being probed at once (each uses up to ``fanout`` probes in race
+    mode, one at a time in serial mode).
+    """
+    if cache is not None and not isinstance(cache, ResolutionCache):
+        cache = ResolutionCache(cache)
+    if http_cache is not None and not isinstance(http_cache, HttpCache):
+        http_cache = HttpCache(http_cache)
+    if probe_stats is not None and not isinstance(probe_stats, ProbeStats):
+        probe_stats = ProbeStats(probe_stats)
+    width = fanout if probe == "race" else 1
+    clients = _Clients(limit_per_host, timeout, scheduler or Scheduler(), http_cache, metrics)
+    gate = asyncio.Semaphore(max(1, max_in_flight))
+
+    async def try_company(company: str) -> CompanyResult:
+        async with gate:
+            return await _resolve(company)
+
+    async def _resolve(company: str) -> CompanyResult:
+        norm, pairs, shapes = _candidate_pairs(company, probe_stats)
+        tally = _Tally(norm, cache, probe_stats, shapes)
+
+        if cache is not None:
+            known = cache.known_hit(norm)
+            if known:
+                slug, source = known
+                outcome, fetched = await clients.fetch(source, slug)
+                if tally.record(slug, source, outcome, learn=False) or outcome != MISS:
+                    return tally.result(company, fetched)
+            if cache.all_missed(norm, pairs):
+                return tally.result(company, JobColumns())
+            pairs = [(cand, source) for cand, source in pairs if not cache.recent_miss(norm, cand, source)]
+
+        outcomes = _probe(clients, pairs, width)
+        try:
+            async for cand, source, (outcome, fetched) in outcomes:
+                if tally.record(cand, source, outcome):
+                    return tally.result(company, fetched)
+        finally:
+            await outcomes.aclose()
+        return tally.result(company, JobColumns())
+
+    tasks = [asyncio.ensure_future(try_company(c)) for c in companies]
+    try:
+        for fut in asyncio.as_completed(tasks):
+            res = await fut
+            if probe_stats is not None:
+                probe_stats.finish(res.status == HIT, res.probes)
+            if metrics is not None:
+                metrics.observe_company(res.status, res.probes)
+            yield res
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await clients.close()
+        if cache is not None:
+            cache.save()
+        if http_cache is not None:
+            http_cache.save()
+        if probe_stats is not None:
+            probe_stats.save()
+
+
+async def adiscover_and_fetch(companies: List[str], **opts) -> pd.DataFrame:
+    """Async counterpart of ``discover_and_fetch``; takes the same options as ``aiter_discover``."""
+    metrics = opts.pop("metrics", None) or ScanMetrics()
+    results: Dict[str, JobColumns] = {}
+    status: Dict[str, str] = {}
+    with metrics.phase("scan"):
+        async for res in aiter_discover(companies, metrics=metrics, **opts):
+            results[res.company] = res.jobs
+            status[res.company] = res.status
+    df = jobs_frame(results, status)
+    df.attrs["scan_metrics"] = metrics
+    return df
+
+
+_DONE = object()
+
+
+def iter_discover_async(companies: List[str], **opts) -> Iterator[CompanyResult]:
+    """Drive ``aiter_discover`` on a private event loop thread and yield results synchronously.
+
+    This is what ``iter_discover(..., engine="async")`` uses, so callers without
+    their own event loop (the CLI, Streamlit) can stream from the async engine.
+    """
+    out: "queue.Queue" = queue.Queue(maxsize=1024)
+
+    async def handoff(item) -> None:
+        # never block the loop on a slow consumer: wait for room on an executor thread
+        try:
+            out.put_nowait(item)
+        except queue.Full:
+            await asyncio.get_running_loop().run_in_executor(None, out.put, item)
+
+    async def pump() -> None:
+        agen = aiter_discover(companies, **opts)
+        try:
+            async for res in agen:
+                await handoff(res)
+        except BaseException as e:  # surface engine failures in the consumer
+            await handoff(e)
+        finally:
+            await agen.aclose()
+            await handoff(_DONE)
+
+    # The task exists before the thread starts, so closing the generator at any point can cancel it
+    loop = asyncio.new_event_loop()
+    task = loop.create_task(pump())
+
+    def run() -> None:
+        try:
+            loop.run_until_complete(task)
+        finally:
+            try:
+                loop.run_until_complete(loop.shutdown_asyncgens())
+                loop.run_until_complete(loop.shutdown_default_executor())
+            finally:
+                loop.close()
+
+    worker = threading.Thread(target=run, name="wrkmatch-aio", daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = out.get()
+            if item is _DONE:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        if worker.is_alive():
+            # consumer stopped early: cancel the scan instead of letting it run out
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:  # loop already closed
+                pass
+        while worker.is_alive():
+            try:
+                out.get(timeout=0.1)
+            except queue.Empty:
+                pass
@@ -1,15 +1,22 @@
 from __future__ import annotations
 import datetime as _dt
-from dataclasses import dataclass
-from typing import Optional, Union, List
+import email.utils as _eut
+import threading
+from typing import Any, Iterable, Iterator, List, NamedTuple, Optional, Union
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from .http_cache import HttpCache
 
 USER_AGENT = "wrkmatch/1.0 (+https://example.invalid)"
 DEFAULT_HEADERS = {"User-Agent": USER_AGENT, "Accept": "application/json, */*;q=0.1"}
 
-@dataclass
-class Job:
+JOB_FIELDS = ("company", "source", "title", "location", "department", "url", "posted_at")
+
+
+class Job(NamedTuple):
+    """Read-only view of one posting. Parsers fill ``JobColumns`` directly; this is for compatibility."""
     company: str
     source: str
     title: str
@@ -19,6 +26,53 @@ class Job:
     posted_at: Optional[str] = None  # ISO8601 when possible
 
 
+class JobColumns:
+    """Per-column buffers of parsed postings.
+
+    Provider parsers append field values straight into these lists so no
+    per-posting object is materialized; iterating still yields ``Job`` views.
+    """
+
+    __slots__ = JOB_FIELDS
+
+    def __init__(self):
+        for f in JOB_FIELDS:
+            setattr(self, f, [])
+
+    @classmethod
+    def from_jobs(cls, jobs: Iterable[Job]) -> "JobColumns":
+        out = cls()
+        for j in jobs:
+            out.append(*j)
+        return out
+
+    def append(self, company: str, source: str, title: str, location: str,
+               department: str, url: str, posted_at: Optional[str] = None) -> None:
+        self.company.append(company)
+        self.source.append(source)
+        self.title.append(title)
+        self.location.append(location)
+        self.department.append(department)
+        self.url.append(url)
+        self.posted_at.append(posted_at)
+
+    def extend(self, other: "JobColumns") -> None:
+        for f in JOB_FIELDS:
+            getattr(self, f).extend(getattr(other, f))
+
+    def __len__(self) -> int:
+        return len(self.title)
+
+    def __iter__(self) -> Iterator[Job]:
+        return map(Job._make, zip(*(getattr(self, f) for f in JOB_FIELDS)))
+
+    def __getitem__(self, i: int) -> Job:
+        return Job(*(getattr(self, f)[i] for f in JOB_FIELDS))
+
+    def __repr__(self) -> str:
+        return f"JobColumns({len(self)} postings)"
+
+
 def _coerce_iso(dt: Union[int, float, str, None]) -> Optional[str]:
     if dt is None:
         return None
@@ -30,23 +84,125 @@ def _coerce_iso(dt: Union[int, float, str, None]) -> Optional[str]:
     return s if s else None
 
 
-def _get_json(url: str, timeout: int = 6):
+_local = threading.local()
+
+
+def _session() -> requests.Session:
+    """One keep-alive Session per worker thread, so repeat probes reuse connections."""
+    sess = getattr(_local, "session", None)
+    if sess is None:
+        sess = requests.Session()
+        sess.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=len(ATS_URLS), pool_maxsize=4)
+        sess.mount("https://", adapter)
+        sess.mount("http://", adapter)
+        _local.session = sess
+    return sess
+
+
+# Probe outcomes. THROTTLED/ERROR mean "we don't know", never "no board here".
+OK, MISS, THROTTLED, ERROR = "ok", "miss", "throttled", "error"
+
+
+class Fetched(NamedTuple):
+    outcome: str
+    data: Any = None
+    retry_after: Optional[float] = None  # seconds, from a Retry-After header
+    status: Optional[int] = None  # HTTP status, None if no response arrived
+    nbytes: int = 0  # response body size
+    reason: Optional[str] = None  # why there was no usable response: timeout/dns/connection/not_json/bad_json
+
+
+def classify_status(status: int) -> str:
+    if status == 200:
+        return OK
+    if status in (429, 503):
+        return THROTTLED
+    if status >= 500:
+        return ERROR
+    return MISS
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After is either delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
     try:
-        r = requests.get(url, headers=DEFAULT_HEADERS, timeout=timeout)
-        if r.status_code == 200 and "application/json" in r.headers.get("Content-Type", ""):
-            return r.json()
-    except requests.RequestException:
+        when = _eut.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
         return None
-    return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=_dt.timezone.utc)
+    return max(0.0, (when - _dt.datetime.now(_dt.timezone.utc)).total_seconds())
 
 
-def greenhouse_jobs(slug: str) -> List[Job]:
-    url = f"https://boards-api.greenhouse.io/v1/boards/{slug}/jobs"
-    data = _get_json(url)
-    jobs: List[Job] = []
+def _is_dns_error(exc: BaseException) -> bool:
+    # An unresolvable host (e.g. <slug>.recruitee.com) means there is no board.
+    msg = str(exc)
+    return any(s in msg for s in ("NameResolutionError", "Name or service not known",
+                                  "nodename nor servname", "getaddrinfo failed"))
+
+
+def fetch_json(url: str, timeout: int = 6, http_cache: Optional[HttpCache] = None) -> Fetched:
+    """GET a feed URL and classify the response.
+
+    With ``http_cache`` the request is conditional, and a 304 is answered from the cache.
+    """
+    headers = http_cache.conditional_headers(url) if http_cache is not None else {}
+    try:
+        r = _session().get(url, timeout=timeout, headers=headers)
+    except requests.Timeout:
+        return Fetched(ERROR, reason="timeout")
+    except requests.ConnectionError as e:
+        if _is_dns_error(e):
+            return Fetched(MISS, reason="dns")
+        return Fetched(ERROR, reason="connection")
+    except requests.RequestException:
+        return Fetched(ERROR, reason="connection")
+    if r.status_code == 304 and http_cache is not None:
+        data = http_cache.load(url)
+        if data is not None:
+            return Fetched(OK, data, status=304)
+        # cached body vanished: fetch it again unconditionally
+        return fetch_json(url, timeout)
+    nbytes = len(r.content)
+    outcome = classify_status(r.status_code)
+    if outcome != OK:
+        return Fetched(outcome, None, parse_retry_after(r.headers.get("Retry-After")), r.status_code, nbytes)
+    if "application/json" not in r.headers.get("Content-Type", ""):
+        return Fetched(MISS, status=r.status_code, nbytes=nbytes, reason="not_json")
+    try:
+        data = r.json()
+    except ValueError:
+        return Fetched(MISS, status=r.status_code, nbytes=nbytes, reason="bad_json")
+    if http_cache is not None:
+        http_cache.store(url, r.content, r.headers.get("ETag"), r.headers.get("Last-Modified"), data)
+    return Fetched(OK, data, status=r.status_code, nbytes=nbytes)
+
+
+def _get_json(url: str, timeout: int = 6):
+    res = fetch_json(url, timeout)
+    return res.data if res.outcome == OK else None
+
+
+# Feed URL per source, in probe priority order. ``{slug}`` is the board slug.
+ATS_URLS = {
+    "greenhouse": "https://boards-api.greenhouse.io/v1/boards/{slug}/jobs",
+    "lever": "https://api.lever.co/v0/postings/{slug}?mode=json",
+    "ashby": "https://api.ashbyhq.com/job-board-api/postings?organizationSlug={slug}",
+    "workable": "https://apply.workable.com/api/v1/widget/accounts/{slug}",
+    "recruitee": "https://{slug}.recruitee.com/api/offers/",
+}
+
+
+def parse_greenhouse(slug: str, data, out: Optional[JobColumns] = None) -> JobColumns:
+    jobs = JobColumns() if out is None else out
     if isinstance(data, dict) and isinstance(data.get("jobs"), list):
         for j in data["jobs"]:
-            jobs.append(Job(
+            jobs.append(
                 company=(j.get("offices", [{}])[0] or {}).get("name", "") or slug,
                 source="greenhouse",
                 title=j.get("title", ""),
@@ -54,17 +210,19 @@ def greenhouse_jobs(slug: str) -> List[Job]:
                 department=(j.get("departments", [{}])[0] or {}).get("name", ""),
                 url=j.get("absolute_url", ""),
                 posted_at=_coerce_iso(j.get("updated_at") or j.get("created_at")),
-            ))
+            )
     return jobs
 
 
-def lever_jobs(slug: str) -> List[Job]:
-    url = f"https://api.lever.co/v0/postings/{slug}?mode=json"
-    data = _get_json(url)
-    jobs: List[Job] = []
+def greenhouse_jobs(slug: str) -> List[Job]:
+    return list(parse_greenhouse(slug, _get_json(ATS_URLS["greenhouse"].format(slug=slug))))
+
+
+def parse_lever(slug: str, data, out: Optional[JobColumns] = None) -> JobColumns:
+    jobs = JobColumns() if out is None else out
     if isinstance(data, list):
         for j in data:
-            jobs.append(Job(
+            jobs.append(
                 company=j.get("categories", {}).get("team", "") or slug,
                 source="lever",
                 title=j.get("text", ""),
@@ -72,17 +230,19 @@ def lever_jobs(slug: str) -> List[Job]:
                 department=j.get("categories", {}).get("team", ""),
                 url=j.get("hostedUrl", ""),
                 posted_at=_coerce_iso(j.get("createdAt") or j.get("updatedAt")),
-            ))
+            )
     return jobs
 
 
-def ashby_jobs(slug: str) -> List[Job]:
-    url = f"https://api.ashbyhq.com/job-board-api/postings?organizationSlug={slug}"
-    data = _get_json(url)
-    jobs: List[Job] = []
+def lever_jobs(slug: str) -> List[Job]:
+    return list(parse_lever(slug, _get_json(ATS_URLS["lever"].format(slug=slug))))
+
+
+def parse_ashby(slug: str, data, out: Optional[JobColumns] = None) -> JobColumns:
+    jobs = JobColumns() if out is None else out
     if isinstance(data, dict) and isinstance(data.get("postings"), list):
         for p in data["postings"]:
-            jobs.append(Job(
+            jobs.append(
                 company=p.get("organizationName", "") or slug,
                 source="ashby",
                 title=p.get("title", ""),
@@ -90,17 +250,19 @@ def ashby_jobs(slug: str) -> List[Job]:
                 department=p.get("teamName", ""),
                 url=p.get("jobUrl", ""),
                 posted_at=_coerce_iso(p.get("updatedAt") or p.get("createdAt")),
-            ))
+            )
     return jobs
 
 
-def workable_jobs(slug: str) -> List[Job]:
-    url = f"https://apply.workable.com/api/v1/widget/accounts/{slug}"
-    data = _get_json(url)
-    jobs: List[Job] = []
+def ashby_jobs(slug: str) -> List[Job]:
+    return list(parse_ashby(slug, _get_json(ATS_URLS["ashby"].format(slug=slug))))
+
+
+def parse_workable(slug: str, data, out: Optional[JobColumns] = None) -> JobColumns:
+    jobs = JobColumns() if out is None else out
     if isinstance(data, dict) and isinstance(data.get("jobs"), list):
         for j in data["jobs"]:
-            jobs.append(Job(
+            jobs.append(
                 company=data.get("name", "") or slug,
                 source="workable",
                 title=j.get("title", ""),
@@ -108,17 +270,19 @@ def workable_jobs(slug: str) -> List[Job]:
                 department=j.get("department", ""),
                 url=j.get("application_url", "") or j.get("url", ""),
                 posted_at=_coerce_iso(j.get("published_on") or j.get("updated_at")),
-            ))
+            )
     return jobs
 
 
-def recruitee_jobs(slug: str) -> List[Job]:
-    url = f"https://{slug}.recruitee.com/api/offers/"
-    data = _get_json(url)
-    jobs: List[Job] = []
+def workable_jobs(slug: str) -> List[Job]:
+    return list(parse_workable(slug, _get_json(ATS_URLS["workable"].format(slug=slug))))
+
+
+def parse_recruitee(slug: str, data, out: Optional[JobColumns] = None) -> JobColumns:
+    jobs = JobColumns() if out is None else out
     if isinstance(data, dict) and isinstance(data.get("offers"), list):
         for j in data["offers"]:
-            jobs.append(Job(
+            jobs.append(
                 company=data.get("name", "") or slug,
                 source="recruitee",
                 title=j.get("title", ""),
@@ -126,7 +290,22 @@ def recruitee_jobs(slug: str) -> List[Job]:
                 department=(j.get("departments") or [""])[0],
                 url=j.get("careers_url", "") or j.get("url", ""),
                 posted_at=_coerce_iso(j.get("created_at") or j.get("updated_at")),
-            ))
+            )
     return jobs
 
-ATS_FUNCS = [greenhouse_jobs, lever_jobs, ashby_jobs, workable_jobs, recruitee_jobs]
\ No newline at end of file
+
+def recruitee_jobs(slug: str) -> List[Job]:
+    return list(parse_recruitee(slug, _get_json(ATS_URLS["recruitee"].format(slug=slug))))
+
+
+ATS_FUNCS = [greenhouse_jobs, lever_jobs, ashby_jobs, workable_jobs, recruitee_jobs]
+# source name → fetcher, in probe priority order
+ATS_BY_SOURCE = {f.__name__[: -len("_jobs")]: f for f in ATS_FUNCS}
+# source name → parser for the decoded feed JSON (used by the async engine)
+ATS_PARSERS = {
+    "greenhouse": parse_greenhouse,
+    "lever": parse_lever,
+    "ashby": parse_ashby,
+    "workable": parse_workable,
+    "recruitee": parse_recruitee,
+}
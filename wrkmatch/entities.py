@@ -0,0 +1,173 @@
+from __future__ import annotations
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .normalize import normalize_company_name, normalize_company_names
+
+# Legal-form suffixes: "globex gmbh co kg" and "globex" are the same entity. Only these
+# are stripped — words like "america", "international" or "group" name the company
+# ("bank of america" is not "us bank"), so they stay in the key.
+LEGAL_FORMS = frozenset({
+    "inc", "incorporated", "corp", "corporation", "co", "company", "llc", "llp", "lp",
+    "ltd", "limited", "plc", "gmbh", "mbh", "ag", "kg", "kgaa", "se", "sa", "sas", "sarl",
+    "srl", "spa", "bv", "nv", "oy", "ab", "as", "aps", "kk", "pty", "pte",
+})
+DEFAULT_THRESHOLD = 90.0
+BLOCK_PREFIX = 4
+_ROW_CHUNK = 2048
+
+
+def entity_key(norm: str) -> str:
+    """Normalized name without a leading "the" and trailing legal forms (falls back to the name)."""
+    tokens = norm.split()
+    if tokens[:1] == ["the"]:
+        tokens = tokens[1:]
+    while tokens and tokens[-1] in LEGAL_FORMS:
+        tokens.pop()
+    return " ".join(tokens) or norm
+
+
+class _DisjointSet:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+class AliasTable:
+    """Maps normalized company names to a canonical normalized name.
+
+    Build it with ``AliasTable.build(names)``: names are blocked by the prefix of
+    their entity key, and only names inside a block are scored against each
+    other (``rapidfuzz.process.cdist``, parallel over all cores), so cost grows
+    with block sizes rather than with the square of the name count. Names not in
+    the table map to themselves. Persist with ``save`` / ``load`` (CSV).
+    """
+
+    def __init__(self, mapping: Optional[Dict[str, str]] = None,
+                 scores: Optional[Dict[str, float]] = None):
+        self.mapping: Dict[str, str] = dict(mapping or {})
+        self.scores: Dict[str, float] = dict(scores or {})
+
+    def __len__(self) -> int:
+        return len(self.mapping)
+
+    def canonical(self, norm: str) -> str:
+        return self.mapping.get(norm, norm)
+
+    def resolve(self, norms: pd.Series) -> pd.Series:
+        """Vectorized ``canonical`` over a Series of normalized names."""
+        if not self.mapping:
+            return norms
+        return norms.map(self.mapping).fillna(norms)
+
+    def group(self, companies: Iterable[str]) -> Dict[str, List[str]]:
+        """Group raw company strings by canonical entity: {representative: [members]}."""
+        groups: Dict[str, List[str]] = {}
+        for company in companies:
+            groups.setdefault(self.canonical(normalize_company_name(company)), []).append(company)
+        return {members[0]: members for members in groups.values()}
+
+    @classmethod
+    def build(cls, names: Iterable[str], threshold: float = DEFAULT_THRESHOLD,
+              block_prefix: int = BLOCK_PREFIX, workers: int = -1,
+              preferred: Iterable[str] = ()) -> "AliasTable":
+        """Cluster raw (or normalized) company names into entities.
+
+        Names whose entity keys are identical (they differ only by legal form), or
+        score at least ``threshold`` with ``fuzz.ratio`` inside a block, end up in one
+        cluster. The canonical name is the cluster's ``preferred`` name if it has one,
+        else its most frequent normalized name (ties: shortest, then alphabetical).
+        """
+        from rapidfuzz import fuzz, process
+
+        norms = normalize_company_names(pd.Series(list(names), dtype=object))
+        counts = Counter(n for n in norms if n)
+        preferred = set(preferred)
+        uniq = list(counts)
+        keys = [entity_key(n) for n in uniq]
+        dsu = _DisjointSet(len(uniq))
+
+        # Identical keys are the same entity outright
+        by_key: Dict[str, List[int]] = defaultdict(list)
+        for i, k in enumerate(keys):
+            by_key[k].append(i)
+        for ids in by_key.values():
+            for i in ids[1:]:
+                dsu.union(ids[0], i)
+
+        # Fuzzy pass over distinct keys, one block per compact-key prefix
+        distinct = list(by_key)
+        blocks: Dict[str, List[int]] = defaultdict(list)
+        for ki, k in enumerate(distinct):
+            blocks[k.replace(" ", "")[:block_prefix]].append(ki)
+        for members in blocks.values():
+            if len(members) < 2:
+                continue
+            block_keys = [distinct[ki] for ki in members]
+            for start in range(0, len(block_keys), _ROW_CHUNK):
+                sim = process.cdist(block_keys[start:start + _ROW_CHUNK], block_keys,
+                                    scorer=fuzz.ratio, score_cutoff=threshold,
+                                    dtype=np.uint8, workers=workers)
+                rows, cols = np.nonzero(sim)
+                for r, c in zip(rows.tolist(), cols.tolist()):
+                    a, b = members[start + r], members[c]
+                    if a < b:
+                        dsu.union(by_key[distinct[a]][0], by_key[distinct[b]][0])
+
+        clusters: Dict[int, List[int]] = defaultdict(list)
+        for i in range(len(uniq)):
+            clusters[dsu.find(i)].append(i)
+        mapping: Dict[str, str] = {}
+        scores: Dict[str, float] = {}
+        for ids in clusters.values():
+            if len(ids) < 2:
+                continue
+            canon = min(ids, key=lambda i: (uniq[i] not in preferred, -counts[uniq[i]], len(uniq[i]), uniq[i]))
+            for i in ids:
+                if i != canon:
+                    mapping[uniq[i]] = uniq[canon]
+                    scores[uniq[i]] = float(fuzz.ratio(keys[i], keys[canon]))
+        return cls(mapping, scores)
+
+    def extend(self, names: Iterable[str], threshold: float = DEFAULT_THRESHOLD,
+               workers: int = -1) -> "AliasTable":
+        """Rebuild over the names already known plus ``names``.
+
+        The table doesn't keep name frequencies, so existing canonical names are kept
+        as they are (``preferred``) rather than re-elected from this run's counts.
+        """
+        canonical = sorted(set(self.mapping.values()))
+        return AliasTable.build(list(self.mapping) + canonical + list(names), threshold=threshold,
+                                workers=workers, preferred=canonical)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            "alias": list(self.mapping),
+            "canonical": list(self.mapping.values()),
+            "score": [self.scores.get(a, float("nan")) for a in self.mapping],
+        })
+
+    def save(self, path: Union[str, Path]) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.to_frame().to_csv(path, index=False)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "AliasTable":
+        df = pd.read_csv(path, dtype={"alias": str, "canonical": str}, keep_default_na=False)
+        scores = pd.to_numeric(df["score"], errors="coerce") if "score" in df.columns else []
+        return cls(dict(zip(df["alias"], df["canonical"])), dict(zip(df["alias"], scores)))
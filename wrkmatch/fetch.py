@@ -1,60 +1,385 @@
 from __future__ import annotations
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List, Tuple
+import threading
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, as_completed
+from itertools import repeat
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+import numpy as np
 import pandas as pd
 
-from .normalize import slug_candidates
-from .ats_clients import ATS_FUNCS, Job
+from .normalize import normalize_company_name, slug_shapes
+from .ats_clients import ATS_PARSERS, ATS_URLS, ERROR, MISS, OK, THROTTLED, Fetched, Job, JobColumns, fetch_json
+from .entities import AliasTable
+from .http_cache import HttpCache
+from .metrics import ScanMetrics
+from .probe_stats import ProbeStats
+from .resolution import ResolutionCache
+from .scheduler import Scheduler
 
-def discover_and_fetch(companies: List[str], max_workers: int = 12) -> pd.DataFrame:
-    """Probe known ATS endpoints for each company and return a normalized jobs DataFrame.
-    Optimizations:
-      - Early-exit per company after the first ATS that returns jobs.
-      - Early-exit per slug candidate as soon as jobs are found.
+# Per-company scan status, exposed as ``df.attrs["company_status"]``
+HIT = "hit"
+
+
+def parse_fetched(source: str, slug: str, res: Fetched) -> Tuple[str, JobColumns]:
+    """Turn a raw feed response into (outcome, jobs); a board with no postings is a miss."""
+    if res.outcome != OK:
+        return res.outcome, JobColumns()
+    try:
+        jobs = ATS_PARSERS[source](slug, res.data)
+    except Exception:
+        jobs = JobColumns()
+    return (OK if jobs else MISS), jobs
+
+
+def _fetch(scheduler: Scheduler, source: str, slug: str,
+           http_cache: Optional[HttpCache] = None,
+           metrics: Optional[ScanMetrics] = None) -> Tuple[str, JobColumns]:
+    url = ATS_URLS[source].format(slug=slug)
+    if metrics is None:
+        return parse_fetched(source, slug, scheduler.call(source, lambda: fetch_json(url, http_cache=http_cache)))
+
+    def request() -> Fetched:
+        started = time.perf_counter()
+        res = fetch_json(url, http_cache=http_cache)
+        metrics.observe_request(source, res, time.perf_counter() - started)
+        return res
+
+    started = time.perf_counter()
+    res = scheduler.call(source, request)
+    fetched = time.perf_counter()
+    outcome, jobs = parse_fetched(source, slug, res)
+    metrics.observe_probe(source, outcome, fetched - started, time.perf_counter() - fetched)
+    return outcome, jobs
+
+
+class _Tally:
+    """Tracks one company's probe outcomes and mirrors clean hits/misses into the cache.
+
+    Throttled or failed probes are never cached as misses: they say nothing
+    about whether the board exists. With ``stats``, every request is counted and
+    probe outcomes (``learn=True``) feed the learned probe order.
+    """
+
+    def __init__(self, norm: str, cache: Optional[ResolutionCache],
+                 stats: Optional[ProbeStats] = None, shapes: Optional[Dict[str, str]] = None):
+        self.norm = norm
+        self.cache = cache
+        self.stats = stats
+        self.shapes = shapes or {}
+        self.seen = set()
+        self.probes = 0
+
+    def record(self, slug: str, source: str, outcome: str, learn: bool = True) -> bool:
+        self.seen.add(outcome)
+        self.probes += 1
+        if self.stats is not None:
+            self.stats.record(self.norm, self.shapes.get(slug) if learn else None, source, outcome)
+        if self.cache is not None:
+            if outcome == OK:
+                self.cache.record_hit(self.norm, slug, source)
+            elif outcome == MISS:
+                self.cache.record_miss(self.norm, slug, source)
+        return outcome == OK
+
+    @property
+    def status(self) -> str:
+        if OK in self.seen:
+            return HIT
+        if THROTTLED in self.seen:
+            return THROTTLED
+        if ERROR in self.seen:
+            return ERROR
+        return MISS
+
+    def result(self, company: str, jobs: JobColumns) -> "CompanyResult":
+        return CompanyResult(company, jobs, self.status, self.probes)
+
+
+def _candidate_pairs(company: str, stats: Optional[ProbeStats] = None
+                     ) -> Tuple[str, List[Tuple[str, str]], Dict[str, str]]:
+    """Normalized name, the (slug, source) pairs to probe in priority order, and slug → shape.
+
+    The default order is shape-major (compact, dashed, no-vowel, first token), each
+    across providers in ``ATS_URLS`` order; with ``stats`` it is re-sorted by the
+    learned hit probability for this kind of name.
     """
-    results: Dict[str, List[Job]] = {}
-
-    def try_company(company: str) -> Tuple[str, List[Job]]:
-        jobs: List[Job] = []
-        tried = set()
-
-        # Try the most likely slug candidates first
-        candidates = slug_candidates(company)
-        # heuristic: check compact/dashed first (keep original order)
-        candidates = list(dict.fromkeys(candidates))  # de-dupe preserve order
-
-        for cand in candidates:
-            if cand in tried:
-                continue
-            tried.add(cand)
-            for func in ATS_FUNCS:
-                try:
-                    fetched = func(cand)
-                except Exception:
-                    fetched = []
-                if fetched:
-                    jobs.extend(fetched)
+    norm = normalize_company_name(company)
+    shaped = slug_shapes(company)
+    triples = [(shape, cand, source) for shape, cand in shaped for source in ATS_URLS]
+    if stats is not None:
+        triples = stats.order(norm, triples)
+    return norm, [(cand, source) for _, cand, source in triples], {cand: shape for shape, cand in shaped}
+
+
+JOB_COLUMNS = ["company", "posting_company", "source", "title", "location", "department", "url", "posted_at"]
+# Low-cardinality columns stored as pandas categoricals
+CATEGORICAL_COLUMNS = ("company", "posting_company", "source")
+
+
+def _as_columns(jobs: Union[JobColumns, List[Job]]) -> JobColumns:
+    return jobs if isinstance(jobs, JobColumns) else JobColumns.from_jobs(jobs)
+
+
+def job_records(company: str, jobs: Union[JobColumns, List[Job]]) -> Iterator[tuple]:
+    """One output tuple per posting, in ``JOB_COLUMNS`` order."""
+    cols = _as_columns(jobs)
+    return zip(repeat(company, len(cols)), cols.company, cols.source, cols.title,
+               cols.location, cols.department, cols.url, cols.posted_at)
+
+
+def jobs_frame(results: Dict[str, Union[JobColumns, List[Job]]],
+               status: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """Build the jobs DataFrame from {company: JobColumns} column-wise.
+
+    ``company``, ``posting_company`` and ``source`` come out as categoricals.
+    ``status`` ({company: hit/miss/throttled/error}) is attached as ``df.attrs["company_status"]``.
+    """
+    names: List[str] = []
+    counts: List[int] = []
+    merged = JobColumns()
+    for comp, jobs in results.items():
+        cols = _as_columns(jobs)
+        if len(cols):
+            names.append(comp)
+            counts.append(len(cols))
+            merged.extend(cols)
+    data = {
+        # codes are just each company's block index repeated per posting
+        "company": pd.Categorical.from_codes(np.repeat(np.arange(len(names)), counts),
+                                             categories=names),
+        "posting_company": merged.company,
+        "source": merged.source,
+        "title": merged.title,
+        "location": merged.location,
+        "department": merged.department,
+        "url": merged.url,
+        "posted_at": merged.posted_at,
+    }
+    df = pd.DataFrame(data, columns=JOB_COLUMNS)
+    for col in CATEGORICAL_COLUMNS[1:]:
+        df[col] = df[col].astype("category")
+    df.attrs["company_status"] = dict(status or {})
+    return df
+
+
+Fetcher = Callable[[str, str], Tuple[str, JobColumns]]  # (source, slug) -> (outcome, jobs)
+
+
+def _probe_serial(fetch: Fetcher,
+                  pairs: List[Tuple[str, str]]) -> Iterator[Tuple[str, str, Tuple[str, JobColumns]]]:
+    for cand, source in pairs:
+        yield cand, source, fetch(source, cand)
+
+
+def _probe_race(fetch: Fetcher, pairs: List[Tuple[str, str]], fanout: int, pool: Executor,
+                free_slots: Callable[[str], int]) -> Iterator[Tuple[str, str, Tuple[str, JobColumns]]]:
+    """Yield a company's probe outcomes in priority order, racing ahead on spare capacity.
+
+    Each probe runs on the calling thread unless it was already started on ``pool``:
+    before each one, up to ``fanout - 1`` lower-priority probes are handed to ``pool``,
+    but only while ``free_slots(source)`` says the scan has room for them, so racing
+    never queues work behind requests that must come first. Once a probe hits, the
+    ones after it can no longer win: queued ones are cancelled and in-flight ones
+    left to finish in the background, their results ignored.
+    """
+    ahead: Dict[int, Future] = {}  # lower-priority probes already handed to the pool
+    end = len(pairs)  # nothing at or past this index can beat a hit already in
+    try:
+        for i, (cand, source) in enumerate(pairs):
+            if i >= end:
+                return
+            room: Dict[str, int] = {}
+            for j in range(i + 1, min(end, i + max(1, fanout))):
+                if j in ahead:
+                    continue
+                slug, src = pairs[j]
+                if src not in room:
+                    room[src] = free_slots(src)
+                if room[src] <= 0:
+                    break
+                room[src] -= 1
+                ahead[j] = pool.submit(fetch, src, slug)
+            fut = ahead.pop(i, None)
+            # still queued: cheaper to run it here than to wait for a pool thread
+            yield cand, source, (fetch(source, cand) if fut is None or fut.cancel() else fut.result())
+            hits = [j for j, f in ahead.items() if f.done() and not f.cancelled()
+                    and f.exception() is None and f.result()[0] == OK]
+            if hits:
+                end = min(hits) + 1
+                for j in [j for j in ahead if j >= end]:
+                    ahead.pop(j).cancel()
+    finally:
+        for f in ahead.values():
+            f.cancel()
+
+
+class CompanyResult(NamedTuple):
+    """One resolved company, as yielded by ``iter_discover``."""
+    company: str
+    jobs: JobColumns
+    status: str  # hit / miss / throttled / error
+    probes: int = 0  # requests spent on the company
+
+
+def iter_discover(companies: List[str], max_workers: int = 12,
+                  cache: Union[ResolutionCache, str, Path, None] = None,
+                  probe: str = "serial", fanout: int = 8,
+                  engine: str = "threads", scheduler: Optional[Scheduler] = None,
+                  http_cache: Union[HttpCache, str, Path, None] = None,
+                  aliases: Optional[AliasTable] = None,
+                  probe_stats: Union[ProbeStats, str, Path, None] = None,
+                  metrics: Optional[ScanMetrics] = None,
+                  **engine_opts) -> Iterator[CompanyResult]:
+    """Yield a ``CompanyResult`` for each company as soon as it resolves (completion order).
+
+    Takes the same options as ``discover_and_fetch``. Closing the generator early
+    cancels companies not yet started; the resolution cache is saved either way.
+    """
+    if aliases is not None:
+        # Probe each entity once and hand its result to every spelling of it
+        groups = aliases.group(companies)
+        for res in iter_discover(list(groups), max_workers=max_workers, cache=cache, probe=probe,
+                                 fanout=fanout, engine=engine, scheduler=scheduler,
+                                 http_cache=http_cache, probe_stats=probe_stats, metrics=metrics,
+                                 **engine_opts):
+            for member in groups[res.company]:
+                yield res._replace(company=member)
+        return
+    if probe not in ("serial", "race"):
+        raise ValueError(f"Unknown probe mode {probe!r}; expected 'serial' or 'race'.")
+    if cache is not None and not isinstance(cache, ResolutionCache):
+        cache = ResolutionCache(cache)
+    if http_cache is not None and not isinstance(http_cache, HttpCache):
+        http_cache = HttpCache(http_cache)
+    if probe_stats is not None and not isinstance(probe_stats, ProbeStats):
+        probe_stats = ProbeStats(probe_stats)
+    scheduler = scheduler or Scheduler()
+    if engine == "async":
+        from .aio import iter_discover_async
+        yield from iter_discover_async(companies, cache=cache, probe=probe, fanout=fanout,
+                                       scheduler=scheduler, http_cache=http_cache,
+                                       probe_stats=probe_stats, metrics=metrics, **engine_opts)
+        return
+    if engine != "threads":
+        raise ValueError(f"Unknown engine {engine!r}; expected 'threads' or 'async'.")
+
+    busy = [0]  # probes in flight across the scan; racing only fills the rest of max_workers
+    busy_lock = threading.Lock()
+
+    def fetch(source: str, slug: str) -> Tuple[str, JobColumns]:
+        with busy_lock:
+            busy[0] += 1
+        try:
+            return _fetch(scheduler, source, slug, http_cache, metrics)
+        finally:
+            with busy_lock:
+                busy[0] -= 1
+
+    def free_slots(source: str) -> int:
+        return min(scheduler.limiter(source).free_slots(), max_workers - busy[0])
+
+    def try_company(company: str) -> CompanyResult:
+        norm, pairs, shapes = _candidate_pairs(company, probe_stats)
+        tally = _Tally(norm, cache, probe_stats, shapes)
+
+        if cache is not None:
+            known = cache.known_hit(norm)
+            if known:
+                slug, source = known
+                outcome, fetched = fetch(source, slug)
+                if tally.record(slug, source, outcome, learn=False) or outcome != MISS:
+                    # Known board answered (or couldn't be reached); no point probing others
+                    return tally.result(company, fetched)
+            if cache.all_missed(norm, pairs):
+                # Failed everywhere recently; don't spend any requests on it
+                return tally.result(company, JobColumns())
+            pairs = [(cand, source) for cand, source in pairs if not cache.recent_miss(norm, cand, source)]
+
+        if race_pool is not None:
+            outcomes = _probe_race(fetch, pairs, fanout, race_pool, free_slots)
+        else:
+            outcomes = _probe_serial(fetch, pairs)
+        try:
+            for cand, source, (outcome, fetched) in outcomes:
+                if tally.record(cand, source, outcome):
                     # Found the company's ATS; stop trying others
-                    return (company, jobs)
-        return (company, jobs)
+                    return tally.result(company, fetched)
+        finally:
+            outcomes.close()
+        return tally.result(company, JobColumns())
 
-    with ThreadPoolExecutor(max_workers=max_workers) as ex:
-        futs = {ex.submit(try_company, c): c for c in companies}
+    race_pool = ThreadPoolExecutor(max_workers=max_workers) if probe == "race" else None
+    ex = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futs = [ex.submit(try_company, c) for c in companies]
         for fut in as_completed(futs):
-            c, jobs = fut.result()
-            results[c] = jobs
+            res = fut.result()
+            if probe_stats is not None:
+                probe_stats.finish(res.status == HIT, res.probes)
+            if metrics is not None:
+                metrics.observe_company(res.status, res.probes)
+            yield res
+    finally:
+        ex.shutdown(wait=True, cancel_futures=True)
+        if race_pool is not None:
+            race_pool.shutdown(wait=True, cancel_futures=True)
+        if cache is not None:
+            cache.save()
+        if http_cache is not None:
+            http_cache.save()
+        if probe_stats is not None:
+            probe_stats.save()
 
-    rows = []
-    for comp, jobs in results.items():
-        for j in jobs:
-            rows.append({
-                "company": comp,
-                "posting_company": j.company,
-                "source": j.source,
-                "title": j.title,
-                "location": j.location,
-                "department": j.department,
-                "url": j.url,
-                "posted_at": j.posted_at,
-            })
-    return pd.DataFrame(rows)
+
+def discover_and_fetch(companies: List[str], max_workers: int = 12,
+                       cache: Union[ResolutionCache, str, Path, None] = None,
+                       probe: str = "serial", fanout: int = 8,
+                       engine: str = "threads", scheduler: Optional[Scheduler] = None,
+                       http_cache: Union[HttpCache, str, Path, None] = None,
+                       aliases: Optional[AliasTable] = None,
+                       probe_stats: Union[ProbeStats, str, Path, None] = None,
+                       metrics: Optional[ScanMetrics] = None,
+                       **engine_opts) -> pd.DataFrame:
+    """Probe known ATS endpoints for each company and return a normalized jobs DataFrame.
+    Optimizations:
+      - Early-exit per company after the first ATS that returns jobs.
+      - Early-exit per slug candidate as soon as jobs are found.
+      - With ``cache`` (a ResolutionCache or a path to one), known boards are fetched
+        directly and (slug, provider) pairs that recently missed are not re-probed.
+      - ``probe="race"`` issues up to ``fanout`` (candidate, provider) requests for a
+        company concurrently, but only on capacity the scan isn't using (fewer than
+        ``max_workers`` requests in flight and room in the provider's window); the
+        first hit in the usual priority order still wins.
+      - ``engine="async"`` runs the scan on a single asyncio event loop with pooled
+        keep-alive connections per ATS host (see ``wrkmatch.aio``); extra keyword
+        arguments such as ``limit_per_host`` are passed through to it.
+      - Every request goes through a per-provider ``Scheduler`` (token bucket, AIMD
+        concurrency, Retry-After and jittered backoff), so ``max_workers`` can be
+        raised well past the providers' comfort zone. Companies whose probes were
+        throttled or failed are reported as such in ``df.attrs["company_status"]``
+        rather than as misses.
+      - With ``http_cache`` (an HttpCache or a directory), feed requests are sent with
+        If-None-Match / If-Modified-Since and unchanged boards are served from disk on a 304.
+      - With ``aliases`` (an ``AliasTable``), companies that resolve to the same entity
+        are probed once and share the result.
+      - With ``probe_stats`` (a ProbeStats or a path to one), each company's probes are
+        ordered by the hit rate each (slug shape, provider) pair has had for similar
+        names, and this scan's outcomes are added to those statistics.
+      - Request/probe timings, outcome counters and probes per company are collected
+        in a ``ScanMetrics`` (``metrics``, or a new one) attached as ``df.attrs["scan_metrics"]``.
+    Use ``iter_discover`` to consume results per company as they arrive.
+    """
+    metrics = metrics or ScanMetrics()
+    results: Dict[str, JobColumns] = {}
+    status: Dict[str, str] = {}
+    with metrics.phase("scan"):
+        for res in iter_discover(companies, max_workers=max_workers, cache=cache, probe=probe,
+                                 fanout=fanout, engine=engine, scheduler=scheduler,
+                                 http_cache=http_cache, aliases=aliases, probe_stats=probe_stats,
+                                 metrics=metrics, **engine_opts):
+            results[res.company] = res.jobs
+            status[res.company] = res.status
+    df = jobs_frame(results, status)
+    df.attrs["scan_metrics"] = metrics
+    return df
@@ -0,0 +1,160 @@
+from __future__ import annotations
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Union
+
+from ._fileutil import file_lock, read_json, write_atomic
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class HttpCache:
+    """On-disk cache of job-board feed responses for conditional revalidation.
+
+    Bodies are stored one file per URL next to an ``index.json`` holding the
+    validators (ETag / Last-Modified) and sizes. ``conditional_headers(url)``
+    gives the ``If-None-Match`` / ``If-Modified-Since`` headers for a request;
+    on a 304, ``load(url)`` returns the decoded body, from an in-memory LRU of
+    recent parses when possible. Total body size is capped at ``max_bytes``;
+    least recently used entries are evicted first. Saving merges the index with
+    the one on disk, so concurrent scans can share a cache directory.
+    """
+
+    def __init__(self, directory: Union[str, Path], max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_parsed: int = 64):
+        self.dir = Path(directory)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_parsed = max_parsed
+        self._lock = threading.Lock()
+        self._index: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._parsed: "OrderedDict[str, Any]" = OrderedDict()
+        # changed / removed since the last save, for merging with other writers
+        self._touched: Set[str] = set()
+        self._dropped: Set[str] = set()
+        self._dirty = False
+        self._index_path = self.dir / "index.json"
+        self._index = self._read_index()
+        self.total_bytes = sum(e.get("size", 0) for e in self._index.values())
+
+    def _read_index(self) -> "OrderedDict[str, Dict[str, Any]]":
+        data = read_json(self._index_path)
+        entries = data.get("entries", []) if isinstance(data, dict) else []
+        index: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # stored least → most recently used
+        for e in entries:
+            if isinstance(e, dict) and "url" in e:
+                index[e["url"]] = e
+        return index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _body_path(self, url: str) -> Path:
+        return self.dir / (hashlib.sha1(url.encode("utf-8")).hexdigest() + ".body")
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        with self._lock:
+            e = self._index.get(url)
+        if not e:
+            return {}
+        headers = {}
+        if e.get("etag"):
+            headers["If-None-Match"] = e["etag"]
+        if e.get("last_modified"):
+            headers["If-Modified-Since"] = e["last_modified"]
+        return headers
+
+    def load(self, url: str) -> Optional[Any]:
+        """Decoded body for ``url`` (after a 304), or None if it is gone."""
+        with self._lock:
+            if url not in self._index:
+                return None
+            self._index.move_to_end(url)
+            self._index[url]["used"] = time.time()
+            self._touched.add(url)
+            self._dirty = True
+            if url in self._parsed:
+                self._parsed.move_to_end(url)
+                return self._parsed[url]
+        try:
+            data = json.loads(self._body_path(url).read_bytes())
+        except (OSError, ValueError):
+            with self._lock:
+                self._drop(url)
+            return None
+        with self._lock:
+            self._remember(url, data)
+        return data
+
+    def store(self, url: str, body: bytes, etag: Optional[str], last_modified: Optional[str],
+              data: Any = None) -> None:
+        """Remember a 200 response. Responses without validators can't be revalidated and are skipped."""
+        if not etag and not last_modified:
+            return
+        if len(body) > self.max_bytes:
+            return
+        path = self._body_path(url)
+        write_atomic(path, body)
+        with self._lock:
+            old = self._index.pop(url, None)
+            if old:
+                self.total_bytes -= old.get("size", 0)
+            self._index[url] = {"url": url, "etag": etag, "last_modified": last_modified,
+                                "size": len(body), "used": time.time()}
+            self.total_bytes += len(body)
+            self._touched.add(url)
+            self._dropped.discard(url)
+            if data is not None:
+                self._remember(url, data)
+            self._evict()
+            self._dirty = True
+
+    def _remember(self, url: str, data: Any) -> None:
+        self._parsed[url] = data
+        self._parsed.move_to_end(url)
+        while len(self._parsed) > self.max_parsed:
+            self._parsed.popitem(last=False)
+
+    def _drop(self, url: str) -> None:
+        e = self._index.pop(url, None)
+        self._parsed.pop(url, None)
+        self._touched.discard(url)
+        self._dropped.add(url)
+        if e:
+            self.total_bytes -= e.get("size", 0)
+            try:
+                self._body_path(url).unlink()
+            except OSError:
+                pass
+            self._dirty = True
+
+    def _evict(self) -> None:
+        while self.total_bytes > self.max_bytes and self._index:
+            self._drop(next(iter(self._index)))
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        with file_lock(self._index_path):
+            disk = self._read_index()
+            with self._lock:
+                for url in self._dropped:
+                    disk.pop(url, None)
+                for url, e in self._index.items():  # least → most recently used
+                    if url in self._touched:
+                        disk.pop(url, None)
+                        disk[url] = e
+                self._index = disk
+                self.total_bytes = sum(e.get("size", 0) for e in disk.values())
+                self._evict()
+                self._touched.clear()
+                self._dropped.clear()
+                payload = json.dumps({"version": 1, "entries": list(self._index.values())},
+                                     separators=(",", ":"))
+                self._dirty = False
+            write_atomic(self._index_path, payload)
@@ -0,0 +1,108 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .normalize import normalize_company_names
+
+if TYPE_CHECKING:
+    from .entities import AliasTable
+
+_EMPTY = np.empty(0, dtype=np.intp)
+
+
+class _Groups:
+    """Row positions per key from one stable sort; a lookup slices a view of it."""
+
+    __slots__ = ("_slot", "_order", "_bounds")
+
+    def __init__(self, keys: pd.Series):
+        codes, uniques = pd.factorize(keys, use_na_sentinel=True)
+        valid = codes >= 0
+        codes = codes[valid]
+        self._order = np.flatnonzero(valid)[np.argsort(codes, kind="stable")]
+        self._bounds = np.concatenate(([0], np.cumsum(np.bincount(codes, minlength=len(uniques)))))
+        self._slot = {key: i for i, key in enumerate(uniques)}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._slot
+
+    def __len__(self) -> int:
+        return len(self._slot)
+
+    def keys(self):
+        return self._slot.keys()
+
+    def get(self, key: str) -> np.ndarray:
+        i = self._slot.get(key)
+        if i is None:
+            return _EMPTY
+        return self._order[self._bounds[i]:self._bounds[i + 1]]
+
+
+class CompanyIndex:
+    """Row offsets per normalized company into the connections and jobs frames.
+
+    Built once per dataset (one normalize + factorize + sort per frame), so a
+    company drill-down is a dict lookup and an ``iloc`` slice instead of a scan of
+    every row. Keys are the ones ``ScoringIndex`` ranks by (``frame["norm"]``),
+    including ``aliases`` when given. Lowercased titles and locations are kept per
+    company on first use for the keyword/location filters.
+    """
+
+    def __init__(self, connections_df: pd.DataFrame, jobs_df: pd.DataFrame,
+                 aliases: Optional["AliasTable"] = None):
+        def key(names: pd.Series) -> pd.Series:
+            norm = normalize_company_names(names)
+            return aliases.resolve(norm) if aliases is not None else norm
+
+        self.connections = connections_df
+        self.jobs_df = jobs_df
+        self._contacts = _Groups(key(connections_df["Company"]))
+        self._jobs = _Groups(key(jobs_df["company"] if not jobs_df.empty else pd.Series([], dtype=object)))
+        self._lowered: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._names: Optional[np.ndarray] = None
+
+    def __contains__(self, norm: str) -> bool:
+        return norm in self._contacts or norm in self._jobs
+
+    def contact_rows(self, norm: str) -> np.ndarray:
+        return self._contacts.get(norm)
+
+    def job_rows(self, norm: str) -> np.ndarray:
+        return self._jobs.get(norm)
+
+    def contacts(self, norm: str) -> pd.DataFrame:
+        return self.connections.iloc[self.contact_rows(norm)]
+
+    def contact_names(self, norm: str) -> List[str]:
+        """Distinct contact names at ``norm`` in file order (empty without a Full Name column)."""
+        if self._names is None:
+            if "Full Name" not in self.connections.columns:
+                return []
+            self._names = self.connections["Full Name"].to_numpy(dtype=object, na_value=None)
+        return list(dict.fromkeys(str(n) for n in self._names[self.contact_rows(norm)] if n is not None))
+
+    def _lower(self, norm: str) -> Tuple[np.ndarray, np.ndarray]:
+        cached = self._lowered.get(norm)
+        if cached is None:
+            rows = self.jobs_df.iloc[self.job_rows(norm)]
+            cached = tuple(rows[col].fillna("").astype(str).str.lower().to_numpy(dtype=object)
+                           for col in ("title", "location"))
+            self._lowered[norm] = cached
+        return cached
+
+    def jobs(self, norm: str, keyword: str = "", location: str = "") -> pd.DataFrame:
+        """Postings at ``norm``, optionally keeping titles/locations containing the given text
+        (case-insensitive substring match)."""
+        rows = self.job_rows(norm)
+        if len(rows) and (keyword or location):
+            titles, locations = self._lower(norm)
+            keep = np.ones(len(rows), dtype=bool)
+            for needle, haystack in ((keyword, titles), (location, locations)):
+                if needle:
+                    needle = needle.lower()
+                    keep &= np.fromiter((needle in s for s in haystack), dtype=bool, count=len(haystack))
+            rows = rows[keep]
+        return self.jobs_df.iloc[rows]
@@ -1,67 +1,70 @@
 from __future__ import annotations
+import codecs
+import csv
 import io
 import re
+import shutil
+from contextlib import ExitStack
 from pathlib import Path
+from typing import IO, Iterator, List, NamedTuple, Optional, Tuple
 import pandas as pd
 
 HEADER_HINTS = ("First Name", "Last Name")
+COMPANY_COLUMNS = {"company", "company name", "current company"}
+SNIFF_BYTES = 64 * 1024  # encoding and header are detected from this much of the file
+HEADER_SCAN_LINES = 300
+DEFAULT_CHUNKSIZE = 100_000
 
 
-def _read_text_any(path: Path) -> str:
-    raw = path.read_bytes()
-    for enc in ("utf-8", "utf-16", "latin-1"):
-        try:
-            return raw.decode(enc)
-        except Exception:
-            continue
-    return raw.decode("latin-1", errors="ignore")
+def _sniff_encoding(prefix: bytes) -> Tuple[str, int]:
+    """(codec, BOM length) for a file starting with ``prefix``."""
+    if prefix.startswith(codecs.BOM_UTF8):
+        return "utf-8", len(codecs.BOM_UTF8)
+    if prefix.startswith(codecs.BOM_UTF16_LE):
+        return "utf-16-le", len(codecs.BOM_UTF16_LE)
+    if prefix.startswith(codecs.BOM_UTF16_BE):
+        return "utf-16-be", len(codecs.BOM_UTF16_BE)
+    try:
+        # incremental, so a character cut off at the end of the prefix is not an error
+        codecs.getincrementaldecoder("utf-8")().decode(prefix, final=False)
+        return "utf-8", 0
+    except UnicodeDecodeError:
+        return "latin-1", 0
 
 
-def _clean_leading_notes(text: str) -> str:
-    """LinkedIn Connections CSVs sometimes start with a 'Notes:' section before the real header.
-    This trims everything before the line that contains the true header (First Name, Last Name, ...).
+def _header_offset(prefix: bytes, encoding: str, bom: int) -> Tuple[int, str]:
+    """Byte offset and text of the header line.
+
+    LinkedIn Connections CSVs sometimes start with a 'Notes:' section before the real
+    header; the header is the first line (of the first few hundred) naming First Name
+    and Last Name, else the first line.
     """
-    lines = text.splitlines()
-    header_idx = None
-    for i, line in enumerate(lines[:300]):
+    text = codecs.getincrementaldecoder(encoding)(errors="replace").decode(prefix[bom:], final=False)
+    lines = text.splitlines(keepends=True)
+    offset = bom
+    for line in lines[:HEADER_SCAN_LINES]:
         if all(h in line for h in HEADER_HINTS):
-            header_idx = i
-            break
-    if header_idx is None:
-        return text
-    return "\n".join(lines[header_idx:])
+            return offset, line
+        offset += len(line.encode(encoding, errors="replace"))
+    return bom, lines[0] if lines else ""
 
 
-def read_connections(file_or_path) -> pd.DataFrame:
-    """Read a LinkedIn connections CSV, robust to the leading 'Notes:' preamble,
-    various encodings, and varying column names. Returns a DataFrame with a 'Company' column.
-    Accepts a file-like object or a path string.
-    """
-    # Load as text so we can strip the Notes preamble
-    if isinstance(file_or_path, (str, bytes, Path)):
-        path = Path(file_or_path)
-        text = _clean_leading_notes(_read_text_any(path))
-        df = pd.read_csv(io.StringIO(text))
-    else:
-        # file-like object: read bytes, clean, then parse
-        b = file_or_path.read()
-        if isinstance(b, bytes):
-            raw = b
-        else:
-            raw = str(b).encode("utf-8", errors="ignore")
-        for enc in ("utf-8", "utf-16", "latin-1"):
-            try:
-                text = raw.decode(enc)
-                break
-            except Exception:
-                continue
-        else:
-            text = raw.decode("latin-1", errors="ignore")
-        text = _clean_leading_notes(text)
-        df = pd.read_csv(io.StringIO(text))
+def _wanted_columns(header: List[str]) -> Tuple[List[str], Optional[str]]:
+    """Columns to parse (names, company, position) and the company column, if any."""
+    clean = [h.strip() for h in header]
+    company = next((h for h, c in zip(header, clean) if c.lower() in COMPANY_COLUMNS), None)
+    if company is None and "Position" not in clean:
+        raise ValueError("Could not find a company column in your CSV. Try a different export or add a 'Company' column.")
+    wanted = [h for h, c in zip(header, clean)
+              if h == company or c == "Position" or c == "Full Name"
+              or "first" in c.lower() or "last" in c.lower()]
+    return wanted, company
 
+
+def _tidy(df: pd.DataFrame, company: Optional[str]) -> pd.DataFrame:
     # Normalize headers
     df.columns = [str(c).strip() for c in df.columns]
+    company = company.strip() if company is not None else None
 
     # Derive Full Name if possible
     if "Full Name" not in df.columns:
@@ -70,17 +73,230 @@ def read_connections(file_or_path) -> pd.DataFrame:
         if fn and ln:
             df["Full Name"] = df[fn[0]].astype(str).str.strip() + " " + df[ln[0]].astype(str).str.strip()
 
-    # Choose a company-like column
-    comp_cols = [c for c in df.columns if c.lower() in {"company", "company name", "current company"}]
-    if not comp_cols and "Position" in df.columns:
+    if company is None:
         # Try infer from ' at '
         df["Company"] = df["Position"].astype(str).str.extract(r" at (.+)$", expand=False)
-        comp_cols = ["Company"]
-    if not comp_cols:
-        raise ValueError("Could not find a company column in your CSV. Try a different export or add a 'Company' column.")
-
-    comp_col = comp_cols[0]
-    df = df.rename(columns={comp_col: "Company"})
+    else:
+        # exports concatenated from several people repeat their header rows
+        df = df[df[company] != company]
+        df = df.rename(columns={company: "Company"})
     df["Company"] = df["Company"].fillna("").astype(str)
-    df = df[df["Company"].str.strip() != ""].copy()
-    return df
\ No newline at end of file
+    return df[df["Company"].str.strip() != ""].copy()
+
+
+def _binary_source(file_or_path, stack: ExitStack) -> IO[bytes]:
+    if isinstance(file_or_path, (str, bytes, Path)):
+        return stack.enter_context(open(file_or_path, "rb"))
+    probe = file_or_path.read(0)
+    if isinstance(probe, str):
+        # text handle: its contents are already decoded
+        return io.BytesIO(file_or_path.read().encode("utf-8", errors="ignore"))
+    if not file_or_path.seekable():
+        return io.BytesIO(file_or_path.read())
+    return file_or_path
+
+
+def iter_connections(file_or_path, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    """Stream a LinkedIn connections CSV as DataFrames of up to ``chunksize`` rows.
+
+    The encoding and the header line are sniffed from the first ``SNIFF_BYTES``, then
+    the byte stream is handed straight to pandas' chunked parser with only the name,
+    company and position columns, all as strings. Memory stays bounded by the chunk
+    size, so large exports concatenated from many people can be processed piecewise.
+    Accepts a file-like object or a path.
+    """
+    with ExitStack() as stack:
+        fh = _binary_source(file_or_path, stack)
+        start = fh.tell()
+        prefix = fh.read(SNIFF_BYTES)
+        encoding, bom = _sniff_encoding(prefix)
+        offset, header_line = _header_offset(prefix, encoding, bom)
+        header = next(csv.reader([header_line]), [])
+        wanted, company = _wanted_columns(header)
+        fh.seek(start + offset)
+        reader = pd.read_csv(fh, encoding=encoding, encoding_errors="replace", usecols=wanted,
+                             dtype={c: str for c in wanted}, chunksize=chunksize)
+        with reader:
+            for chunk in reader:
+                yield _tidy(chunk, company)
+
+
+def read_connections(file_or_path, chunksize: int = DEFAULT_CHUNKSIZE) -> pd.DataFrame:
+    """Read a LinkedIn connections CSV, robust to the leading 'Notes:' preamble,
+    various encodings, and varying column names. Returns a DataFrame with a 'Company' column
+    (plus the name and position columns). Accepts a file-like object or a path string.
+    """
+    chunks = list(iter_connections(file_or_path, chunksize))
+    if len(chunks) == 1:
+        return chunks[0]
+    return pd.concat(chunks) if chunks else pd.DataFrame({"Company": []}, dtype=str)
+
+
+# -------------------------
+# Run outputs (jobs / scores / scan status)
+# -------------------------
+OUTPUT_FORMATS = ("csv", "parquet", "feather")
+
+
+class Run(NamedTuple):
+    jobs: pd.DataFrame
+    scores: Optional[pd.DataFrame]
+    status: Optional[pd.DataFrame]
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:  # pragma: no cover - optional dependency
+        raise ImportError("Parquet/Feather outputs need pyarrow: pip install pyarrow") from e
+
+
+def _typed_jobs(jobs_df: pd.DataFrame) -> pd.DataFrame:
+    """Columnar outputs keep real timestamps instead of ISO strings."""
+    if "posted_at" in jobs_df.columns:
+        jobs_df = jobs_df.assign(posted_at=pd.to_datetime(jobs_df["posted_at"], utc=True,
+                                                          errors="coerce", format="ISO8601"))
+    return jobs_df
+
+
+def write_table(out_dir, name: str, df: pd.DataFrame, fmt: str = "csv") -> Path:
+    """Write one table as ``<out_dir>/<name>.<fmt>`` and return its path."""
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format {fmt!r}; expected one of {', '.join(OUTPUT_FORMATS)}.")
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    path = out_dir / f"{name}.{fmt}"
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+    else:
+        _require_pyarrow()
+        _write_table(df.reset_index(drop=True), path, fmt)
+    return path
+
+
+def read_table(out_dir, name: str) -> Optional[pd.DataFrame]:
+    """Read ``<out_dir>/<name>.<parquet|feather|csv>`` (as written by ``write_table``), or None."""
+    out_dir = Path(out_dir)
+    for fmt in ("parquet", "feather", "csv"):
+        path = out_dir / f"{name}.{fmt}"
+        if path.exists():
+            if fmt == "csv":
+                return pd.read_csv(path)
+            _require_pyarrow()
+            return _read_table(path)
+    return None
+
+
+def write_run(out_dir, jobs_df: Optional[pd.DataFrame], scores_df: Optional[pd.DataFrame] = None,
+              status_df: Optional[pd.DataFrame] = None, fmt: str = "csv") -> List[Path]:
+    """Write a run's outputs to ``out_dir`` and return the paths written.
+
+    ``csv`` writes ``jobs_report.csv`` / ``company_scores.csv`` / ``scan_status.csv``.
+    ``parquet`` and ``feather`` write a ``jobs/`` directory partitioned by source
+    (``jobs/source=<name>/part-0.<ext>``) plus ``company_scores.<ext>`` and
+    ``scan_status.<ext>``; reload them with ``load_run``. Pass ``None`` to skip a table.
+    """
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format {fmt!r}; expected one of {', '.join(OUTPUT_FORMATS)}.")
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written: List[Path] = []
+    if fmt == "csv":
+        for df, name in ((jobs_df, "jobs_report"), (scores_df, "company_scores"), (status_df, "scan_status")):
+            if df is not None:
+                written.append(write_table(out_dir, name, df, fmt))
+        return written
+
+    _require_pyarrow()
+    if jobs_df is not None:
+        jobs_dir = out_dir / "jobs"
+        if jobs_dir.exists():
+            shutil.rmtree(jobs_dir)
+        jobs_dir.mkdir(parents=True)
+        jobs_df = _typed_jobs(jobs_df)
+        if "source" in jobs_df.columns and not jobs_df.empty:
+            for source, part in jobs_df.groupby("source", observed=True, sort=True):
+                part_dir = jobs_dir / f"source={source}"
+                part_dir.mkdir()
+                path = part_dir / f"part-0.{fmt}"
+                _write_table(part.drop(columns="source").reset_index(drop=True), path, fmt)
+                written.append(path)
+        else:
+            path = jobs_dir / f"part-0.{fmt}"
+            _write_table(jobs_df.reset_index(drop=True), path, fmt)
+            written.append(path)
+    for df, name in ((scores_df, "company_scores"), (status_df, "scan_status")):
+        if df is not None:
+            written.append(write_table(out_dir, name, df, fmt))
+    return written
+
+
+def _write_table(df: pd.DataFrame, path: Path, fmt: str) -> None:
+    if df.attrs:
+        # scan status/metrics are written as their own tables, not as file metadata
+        df = df.copy(deep=False)
+        df.attrs = {}
+    if fmt == "parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.to_feather(path)
+
+
+def _read_table(path: Path) -> pd.DataFrame:
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    if path.suffix == ".parquet":
+        table = pq.read_table(path, memory_map=True)
+    else:
+        table = feather.read_table(path, memory_map=True)
+    return table.to_pandas()
+
+
+def load_run(out_dir) -> Run:
+    """Load a previous run written by ``write_run`` (or the CLI) without re-scanning.
+
+    Parquet/Feather files are memory-mapped rather than read into a buffer first;
+    CSV runs are parsed as before.
+    """
+    out_dir = Path(out_dir)
+    jobs_dir = out_dir / "jobs"
+    if jobs_dir.is_dir():
+        _require_pyarrow()
+        parts = []
+        for path in sorted(jobs_dir.glob("**/part-*.*")):
+            part = _read_table(path)
+            if path.parent.name.startswith("source="):
+                part.insert(2, "source", path.parent.name[len("source="):])
+            parts.append(part)
+        jobs = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+        for col in ("company", "posting_company", "source"):
+            if col in jobs.columns:
+                jobs[col] = jobs[col].astype("category")
+        return Run(jobs, read_table(out_dir, "company_scores"), read_table(out_dir, "scan_status"))
+
+    jobs_path = out_dir / "jobs_report.csv"
+    if not jobs_path.exists():
+        raise FileNotFoundError(f"No wrkmatch run found in {out_dir}")
+    jobs = pd.read_csv(jobs_path, dtype=str, keep_default_na=False)
+    return Run(jobs, read_table(out_dir, "company_scores"), read_table(out_dir, "scan_status"))
+
+
+def merge_runs(run_dirs) -> Run:
+    """Combine several runs (e.g. the shards of one scan) into one.
+
+    Jobs and scan status are concatenated (a company listed twice keeps its last
+    status); scores are left out, since they must be recomputed over the whole network.
+    """
+    runs = [load_run(d) for d in run_dirs]
+    if not runs:
+        raise ValueError("No runs to merge")
+    parts = [r.jobs for r in runs if len(r.jobs.columns)]
+    jobs = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+    for col in ("company", "posting_company", "source"):
+        if col in jobs.columns:
+            jobs[col] = jobs[col].astype("category")
+    statuses = [r.status for r in runs if r.status is not None]
+    status = (pd.concat(statuses, ignore_index=True).drop_duplicates("company", keep="last")
+              .reset_index(drop=True) if statuses else None)
+    return Run(jobs, None, status)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+from .ats_clients import JOB_FIELDS, MISS, JobColumns
+from .fetch import HIT, CompanyResult
+
+# Statuses that are final; throttled/errored companies are scanned again on resume
+FINISHED = (HIT, MISS)
+
+
+class ScanJournal:
+    """Append-only JSONL record of finished companies, for resuming an interrupted scan.
+
+    Each line holds one ``CompanyResult`` (postings stored column-wise). Lines are
+    flushed as they are written, so a crash loses at most the line being written;
+    a torn last line is ignored on load. Later lines for a company win.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._fh = None
+
+    def load(self) -> Dict[str, CompanyResult]:
+        """Results recorded so far, {company: CompanyResult}."""
+        results: Dict[str, CompanyResult] = {}
+        if not self.path.exists():
+            return results
+        with self.path.open("r", encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    rec = json.loads(line)
+                    jobs = JobColumns()
+                    for f in JOB_FIELDS:
+                        getattr(jobs, f).extend(rec["jobs"][f])
+                    results[rec["company"]] = CompanyResult(rec["company"], jobs, rec["status"],
+                                                            rec.get("probes", 0))
+                except (ValueError, KeyError, TypeError):
+                    continue  # torn or foreign line
+        return results
+
+    def finished(self, companies: Optional[Iterable[str]] = None) -> Dict[str, CompanyResult]:
+        """Recorded results with a final status (hit/miss), optionally limited to ``companies``."""
+        results = self.load()
+        wanted = None if companies is None else set(companies)
+        return {c: r for c, r in results.items()
+                if r.status in FINISHED and (wanted is None or c in wanted)}
+
+    def open(self, resume: bool = False) -> "ScanJournal":
+        """Start writing; without ``resume`` any previous journal is discarded."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        torn = False
+        if resume and self.path.exists() and self.path.stat().st_size:
+            with self.path.open("rb") as fh:
+                fh.seek(-1, os.SEEK_END)
+                torn = fh.read(1) != b"\n"
+        self._fh = self.path.open("a" if resume else "w", encoding="utf-8")
+        if torn:
+            # a crash left a partial last line; terminate it so the next record parses
+            self._fh.write("\n")
+        return self
+
+    def append(self, res: CompanyResult) -> None:
+        rec = {"company": res.company, "status": res.status, "probes": res.probes,
+               "jobs": {f: getattr(res.jobs, f) for f in JOB_FIELDS}}
+        self._fh.write(json.dumps(rec, separators=(",", ":")) + "\n")
+        self._fh.flush()
+
+    def sync(self) -> None:
+        """Force written lines to disk (``append`` only flushes to the OS)."""
+        if self._fh is not None:
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self.sync()
+            self._fh.close()
+            self._fh = None
+
+    def __enter__(self) -> "ScanJournal":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,256 @@
+from __future__ import annotations
+import json
+import math
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from .ats_clients import Fetched
+
+# Latency histogram: log-spaced buckets from 0.1 ms, four per doubling (~19% wide)
+_FIRST_BOUND = 1e-4
+_PER_DOUBLING = 4
+_N_BUCKETS = 96  # up to ~1.9 hours; anything slower lands in the last bucket
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def status_class(res: Fetched) -> str:
+    """Bucket a response for per-request timings: 2xx/3xx/4xx/429/5xx, or why none arrived."""
+    if res.status is None:
+        return res.reason or "no_response"
+    if res.status == 429:
+        return "429"
+    return f"{res.status // 100}xx"
+
+
+class _Histogram:
+    """Fixed log-bucket histogram; cheap to update, percentiles within one bucket width."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * _N_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        if value <= _FIRST_BOUND:
+            i = 0
+        else:
+            i = min(_N_BUCKETS - 1, int(math.ceil(math.log2(value / _FIRST_BOUND) * _PER_DOUBLING)))
+        self.counts[i] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "_Histogram") -> "_Histogram":
+        out = _Histogram()
+        out.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        out.count = self.count + other.count
+        out.total = self.total + other.total
+        out.max = max(self.max, other.max)
+        return out
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the ``q`` quantile (capped at the max seen)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank and c:
+                return min(self.max, _FIRST_BOUND * 2 ** (i / _PER_DOUBLING))
+        return self.max
+
+    def summary(self, scale: float = 1000.0) -> dict:
+        """count/mean/max/p50/p95/p99, durations scaled to milliseconds by default."""
+        def r(v):
+            return None if v is None else round(v * scale, 3)
+        out = {"count": self.count, "mean": r(self.total / self.count) if self.count else None,
+               "max": r(self.max) if self.count else None}
+        for q in QUANTILES:
+            out[f"p{int(q * 100)}"] = r(self.quantile(q))
+        return out
+
+
+def _merged(hists) -> _Histogram:
+    out = _Histogram()
+    for h in hists:
+        out = out.merge(h)
+    return out
+
+
+class ScanMetrics:
+    """Counters and timings collected while scanning.
+
+    * Requests: every HTTP attempt, by provider and status class (``status_class``),
+      with its latency and body size — retries are separate attempts.
+    * Probes: every (slug, provider) probe end to end (admission wait, retries,
+      backoff), with its final outcome and the time spent parsing the feed.
+    * Companies: final status and probes spent per company.
+    * Phases: wall-clock time of named phases (``with metrics.phase("scan"): ...``).
+
+    Pass one to ``iter_discover`` / ``discover_and_fetch`` (which creates one and
+    attaches it as ``df.attrs["scan_metrics"]``). Export with ``to_dict``,
+    ``to_prometheus`` or ``write``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.request_latency: Dict[Tuple[str, str], _Histogram] = {}
+        self.bytes: Counter = Counter()
+        self.probe_latency: Dict[str, _Histogram] = {}
+        self.parse_time: Dict[str, _Histogram] = {}
+        self.outcomes: Counter = Counter()  # (source, outcome) per probe
+        self.company_status: Counter = Counter()
+        self.probes_per_company: Counter = Counter()
+        self.phases: Dict[str, float] = {}
+
+    def __deepcopy__(self, memo) -> "ScanMetrics":
+        # pandas deep-copies ``attrs`` on every operation; share the live object instead
+        return self
+
+    def __getstate__(self) -> dict:
+        # picklable (e.g. returned from a worker process); the lock is recreated
+        with self._lock:
+            state = dict(self.__dict__)
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def merge(self, other: "ScanMetrics") -> None:
+        """Fold another scan's requests, probes and companies (e.g. a shard's) into this one.
+
+        Phases are not merged: they are wall-clock time of this process's own phases.
+        """
+        with self._lock:
+            for mine, theirs in ((self.request_latency, other.request_latency),
+                                 (self.probe_latency, other.probe_latency),
+                                 (self.parse_time, other.parse_time)):
+                for key, hist in theirs.items():
+                    mine[key] = mine[key].merge(hist) if key in mine else hist
+            self.bytes.update(other.bytes)
+            self.outcomes.update(other.outcomes)
+            self.company_status.update(other.company_status)
+            self.probes_per_company.update(other.probes_per_company)
+
+    def observe_request(self, source: str, res: Fetched, seconds: float) -> None:
+        key = (source, status_class(res))
+        with self._lock:
+            hist = self.request_latency.get(key)
+            if hist is None:
+                hist = self.request_latency[key] = _Histogram()
+            hist.add(seconds)
+            self.bytes[source] += res.nbytes
+
+    def observe_probe(self, source: str, outcome: str, seconds: float, parse_seconds: float) -> None:
+        with self._lock:
+            self.outcomes[(source, outcome)] += 1
+            for table, value in ((self.probe_latency, seconds), (self.parse_time, parse_seconds)):
+                hist = table.get(source)
+                if hist is None:
+                    hist = table[source] = _Histogram()
+                hist.add(value)
+
+    def observe_company(self, status: str, probes: int) -> None:
+        with self._lock:
+            self.company_status[status] += 1
+            self.probes_per_company[probes] += 1
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def to_dict(self) -> dict:
+        """JSON-ready snapshot; latencies in milliseconds."""
+        with self._lock:
+            requests = {f"{src}/{cls}": h.summary() for (src, cls), h in sorted(self.request_latency.items())}
+            all_requests = _merged(self.request_latency.values()).summary()
+            probes = {src: h.summary() for src, h in sorted(self.probe_latency.items())}
+            all_probes = _merged(self.probe_latency.values()).summary()
+            parse = {src: h.summary() for src, h in sorted(self.parse_time.items())}
+            outcomes: Dict[str, Dict[str, int]] = {}
+            for (src, outcome), n in sorted(self.outcomes.items()):
+                outcomes.setdefault(src, {})[outcome] = n
+            per_company = dict(sorted(self.probes_per_company.items()))
+            n_companies = sum(per_company.values())
+            return {
+                "phases_s": {k: round(v, 4) for k, v in self.phases.items()},
+                "requests": {"total": all_requests["count"], "latency_ms": all_requests,
+                             "by_source_class": requests,
+                             "bytes": sum(self.bytes.values()), "bytes_by_source": dict(self.bytes)},
+                "probes": {"total": all_probes["count"], "latency_ms": all_probes,
+                           "by_source": probes, "outcomes": outcomes, "parse_ms": parse},
+                "companies": {"total": n_companies, "status": dict(self.company_status),
+                              "probes_mean": (round(sum(k * v for k, v in per_company.items()) / n_companies, 3)
+                                              if n_companies else None),
+                              "probes_histogram": {str(k): v for k, v in per_company.items()}},
+            }
+
+    def to_prometheus(self, prefix: str = "wrkmatch") -> str:
+        """Prometheus text exposition format (durations in seconds, summaries with quantiles)."""
+        lines: List[str] = []
+
+        def labels(**kv) -> str:
+            return "{" + ",".join(f'{k}="{v}"' for k, v in kv.items()) + "}" if kv else ""
+
+        def summary(name: str, help_text: str, hists: Dict[tuple, _Histogram], keys: Tuple[str, ...]) -> None:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} summary")
+            for key, h in sorted(hists.items()):
+                kv = dict(zip(keys, key if isinstance(key, tuple) else (key,)))
+                for q in QUANTILES:
+                    lines.append(f"{prefix}_{name}{labels(**kv, quantile=q)} {h.quantile(q) or 0.0:.6f}")
+                lines.append(f"{prefix}_{name}_sum{labels(**kv)} {h.total:.6f}")
+                lines.append(f"{prefix}_{name}_count{labels(**kv)} {h.count}")
+
+        def counter(name: str, help_text: str, values: dict, keys: Tuple[str, ...]) -> None:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for key, n in sorted(values.items()):
+                kv = dict(zip(keys, key if isinstance(key, tuple) else (key,)))
+                lines.append(f"{prefix}_{name}{labels(**kv)} {n}")
+
+        with self._lock:
+            summary("request_seconds", "HTTP request latency by provider and status class.",
+                    self.request_latency, ("source", "class"))
+            counter("response_bytes_total", "Response body bytes downloaded.", self.bytes, ("source",))
+            summary("probe_seconds", "Probe latency including admission wait and retries.",
+                    self.probe_latency, ("source",))
+            summary("parse_seconds", "Time spent parsing feeds.", self.parse_time, ("source",))
+            counter("probes_total", "Probes by provider and final outcome.", self.outcomes, ("source", "outcome"))
+            counter("companies_total", "Scanned companies by status.", self.company_status, ("status",))
+            lines.append(f"# HELP {prefix}_company_probes Probes spent per company.")
+            lines.append(f"# TYPE {prefix}_company_probes summary")
+            lines.append(f"{prefix}_company_probes_sum {sum(k * v for k, v in self.probes_per_company.items())}")
+            lines.append(f"{prefix}_company_probes_count {sum(self.probes_per_company.values())}")
+            lines.append(f"# HELP {prefix}_phase_seconds Wall-clock time per phase.")
+            lines.append(f"# TYPE {prefix}_phase_seconds gauge")
+            for name, seconds in self.phases.items():
+                lines.append(f"{prefix}_phase_seconds{labels(phase=name)} {seconds:.6f}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Union[str, Path]) -> Path:
+        """Write Prometheus text for ``.prom`` / ``.txt`` paths, JSON otherwise."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix in (".prom", ".txt"):
+            path.write_text(self.to_prometheus(), encoding="utf-8")
+        else:
+            path.write_text(json.dumps(self.to_dict(), indent=2) + "\n", encoding="utf-8")
+        return path
@@ -1,5 +1,9 @@
 import re
-from typing import List
+from functools import lru_cache
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
 
 SUFFIXES = [
     " inc", " inc.", " llc", " ltd", " ltd.", " gmbh", " ag", " plc", " co", " co.",
@@ -7,24 +11,71 @@ SUFFIXES = [
     " s.a.", " s.a", " s.p.a.", " spa", " sa", " sas", " kk", " kk."
 ]
 NONWORD = re.compile(r"[^a-z0-9]")
+# Every suffix starts with a space and none contains another one's " <word>" tail,
+# so at most one can match and alternation order doesn't matter.
+SUFFIX_RE = re.compile("(?:" + "|".join(re.escape(s) for s in SUFFIXES) + r")\Z")
+WHITESPACE = re.compile(r"\s+")
+NORMALIZE_CACHE_SIZE = 1 << 18
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _normalize(name: str) -> str:
+    s = NONWORD.sub(" ", name.strip().lower())
+    s = SUFFIX_RE.sub("", s, count=1)
+    return WHITESPACE.sub(" ", s).strip()
 
 
 def normalize_company_name(name: str) -> str:
-    s = (name or "").strip().lower()
-    s = NONWORD.sub(" ", s)
-    for suf in SUFFIXES:
-        if s.endswith(suf):
-            s = s[: -len(suf)]
-            break
-    return re.sub(r"\s+", " ", s).strip()
+    return _normalize(name or "")
 
 
-def slug_candidates(name: str) -> List[str]:
+def normalize_company_names(values):
+    """Vectorized ``normalize_company_name`` for a Series/array of names.
+
+    Only the distinct names are normalized (through the same bounded memo cache as
+    ``normalize_company_name``) and results are broadcast back with factorize/take.
+    Missing values normalize to "". Returns a Series aligned to the input if given
+    a Series, otherwise an object ndarray.
+    """
+    codes, uniques = pd.factorize(values)
+    normed = np.empty(len(uniques) + 1, dtype=object)
+    normed[:-1] = [_normalize(u if isinstance(u, str) else str(u)) for u in uniques]
+    normed[-1] = ""  # code -1 (missing) takes the last slot
+    out = normed.take(codes)
+    if isinstance(values, pd.Series):
+        return pd.Series(out, index=values.index, name=values.name)
+    return out
+
+
+# Slug shapes in default priority order
+SLUG_SHAPES = ("compact", "dashed", "novowel", "first")
+VOWELS = re.compile(r"[aeiou]")
+
+
+def slug_shapes(name: str) -> List[Tuple[str, str]]:
+    """(shape, slug) candidates for ``name`` in ``SLUG_SHAPES`` order.
+
+    A slug produced by several shapes is listed once, under the first of them.
+    """
     base = normalize_company_name(name)
     if not base:
         return []
-    cands = {re.sub(r"\s+", "", base), re.sub(r"\s+", "-", base)}
-    novowel = re.sub(r"[aeiou]", "", re.sub(r"\s+", "", base))
-    cands.add(novowel)
-    cands.add(base.split(" ")[0])
-    return [c for c in cands if c]
\ No newline at end of file
+    compact = WHITESPACE.sub("", base)
+    slugs = {
+        "compact": compact,
+        "dashed": WHITESPACE.sub("-", base),
+        "novowel": VOWELS.sub("", compact),
+        "first": base.split(" ")[0],
+    }
+    out: List[Tuple[str, str]] = []
+    seen = set()
+    for shape in SLUG_SHAPES:
+        slug = slugs[shape]
+        if slug and slug not in seen:
+            seen.add(slug)
+            out.append((shape, slug))
+    return out
+
+
+def slug_candidates(name: str) -> List[str]:
+    return [slug for _, slug in slug_shapes(name)]
@@ -0,0 +1,143 @@
+from __future__ import annotations
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from ._fileutil import file_lock, read_json, write_atomic
+from .ats_clients import MISS, OK
+
+# Compact-name length buckets (upper bounds) and token-count cap used as priors
+LENGTH_BUCKETS = (4, 8, 14)
+MAX_TOKENS = 3
+# Hit rate assumed for the first (shape, provider) pair before any data exists;
+# later pairs in the default order get proportionally less.
+BASE_HIT_RATE = 0.05
+
+
+def name_bucket(norm: str) -> str:
+    """Coarse name profile ("L<length bucket>T<tokens>") that hit rates are conditioned on."""
+    length = len(norm.replace(" ", ""))
+    lb = sum(length > b for b in LENGTH_BUCKETS)
+    tokens = min(MAX_TOKENS, len(norm.split()))
+    return f"L{lb}T{tokens}"
+
+
+class ProbeStats:
+    """Learned hit rates per (slug shape, provider), used to order a company's probes.
+
+    Every clean probe outcome (hit or miss) is counted per name bucket (see
+    ``name_bucket``) and overall. ``order`` sorts a company's (shape, slug, source)
+    triples by estimated hit probability, so the expected number of requests
+    before the first hit is as small as possible. Estimates are smoothed towards
+    the overall rate for the pair, which is in turn smoothed towards a prior that
+    follows the default shape/provider order — with no data, that order is kept.
+    The file is plain JSON; call ``save()`` to persist (``iter_discover`` does it for you).
+    Saving adds this session's counts to what is on disk, so concurrent scans can share it.
+    """
+
+    def __init__(self, path: Union[str, Path, None] = None,
+                 prior_strength: float = 20.0, bucket_strength: float = 5.0):
+        self.path = Path(path) if path else None
+        self.prior_strength = prior_strength
+        self.bucket_strength = bucket_strength
+        self._lock = threading.Lock()
+        # "bucket|shape|source" -> [tries, hits]; totals keyed by "shape|source"
+        self._counts: Dict[str, List[int]] = {}
+        self._totals: Dict[str, List[int]] = {}
+        self._pending: Dict[str, List[int]] = {}  # counted since the last save
+        self._dirty = False
+        # This session's request accounting, for the scan summary
+        self.companies = self.probes = self.resolved = self.probes_to_hit = 0
+        if self.path and self.path.exists():
+            self._load(self._read())
+
+    def _read(self) -> Dict[str, List[int]]:
+        data = read_json(self.path)
+        counts = data.get("counts", {}) if isinstance(data, dict) else {}
+        return {key: [int(value[0]), int(value[1])] for key, value in counts.items()
+                if isinstance(value, list) and len(value) == 2 and key.count("|") == 2}
+
+    def _load(self, counts: Dict[str, List[int]]) -> None:
+        self._counts, self._totals = {}, {}
+        for key, (tries, hits) in counts.items():
+            self._add(key, tries, hits)
+
+    def __len__(self) -> int:
+        """Number of clean probe outcomes learned from."""
+        return sum(tries for tries, _ in self._totals.values())
+
+    def _add(self, key: str, tries: int, hits: int) -> None:
+        c = self._counts.setdefault(key, [0, 0])
+        c[0] += tries
+        c[1] += hits
+        t = self._totals.setdefault(key.split("|", 1)[1], [0, 0])
+        t[0] += tries
+        t[1] += hits
+
+    def estimate(self, bucket: str, shape: str, source: str, rank: int = 0) -> float:
+        """Smoothed hit probability of (shape, source) for names in ``bucket``.
+
+        ``rank`` is the pair's position in the default order and sets the prior.
+        """
+        prior = BASE_HIT_RATE / (1 + rank)
+        pair = f"{shape}|{source}"
+        with self._lock:
+            tries, hits = self._totals.get(pair, (0, 0))
+            b_tries, b_hits = self._counts.get(f"{bucket}|{pair}", (0, 0))
+        overall = (hits + self.prior_strength * prior) / (tries + self.prior_strength)
+        return (b_hits + self.bucket_strength * overall) / (b_tries + self.bucket_strength)
+
+    def order(self, norm: str, triples: Sequence[Tuple[str, str, str]]) -> List[Tuple[str, str, str]]:
+        """Sort (shape, slug, source) triples, given in default order, by estimated hit probability."""
+        bucket = name_bucket(norm)
+        scored = [(-self.estimate(bucket, shape, source, rank), rank)
+                  for rank, (shape, _, source) in enumerate(triples)]
+        return [triples[rank] for _, rank in sorted(scored)]
+
+    def record(self, norm: str, shape: Optional[str], source: str, outcome: str) -> None:
+        """Count one request; clean outcomes of a known ``shape`` also update the hit rates."""
+        with self._lock:
+            self.probes += 1
+            if shape is None or outcome not in (OK, MISS):
+                return
+            key = f"{name_bucket(norm)}|{shape}|{source}"
+            hit = int(outcome == OK)
+            self._add(key, 1, hit)
+            pending = self._pending.setdefault(key, [0, 0])
+            pending[0] += 1
+            pending[1] += hit
+            self._dirty = True
+
+    def finish(self, resolved: bool, probes: int) -> None:
+        """Account for one finished company (``probes`` requests, ``resolved`` if it hit)."""
+        with self._lock:
+            self.companies += 1
+            if resolved:
+                self.resolved += 1
+                self.probes_to_hit += probes
+
+    def summary(self) -> str:
+        with self._lock:
+            if not self.companies:
+                return "no companies scanned"
+            text = f"{self.probes / self.companies:.2f} requests/company"
+            if self.resolved:
+                text += f", {self.probes_to_hit / self.resolved:.2f} per resolved company"
+        return text + f" (order learned from {len(self)} probe outcomes)"
+
+    def save(self) -> None:
+        if not self.path or not self._dirty:
+            return
+        with file_lock(self.path):
+            counts = self._read()
+            with self._lock:
+                for key, (tries, hits) in self._pending.items():
+                    c = counts.setdefault(key, [0, 0])
+                    c[0] += tries
+                    c[1] += hits
+                self._pending = {}
+                self._load(counts)  # pick up what other scans learned meanwhile
+                payload = json.dumps({"version": 1, "counts": counts}, separators=(",", ":"))
+                self._dirty = False
+            write_atomic(self.path, payload)
@@ -0,0 +1,133 @@
+from __future__ import annotations
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple, Union
+
+from ._fileutil import file_lock, read_json, write_atomic
+
+DAY = 24 * 3600
+DEFAULT_HIT_TTL = 30 * DAY
+DEFAULT_MISS_TTL = 14 * DAY
+
+
+def _pair_key(slug: str, source: str) -> str:
+    return f"{source}:{slug}"
+
+
+class ResolutionCache:
+    """Persistent company → ATS board resolution store.
+
+    Entries are keyed by normalized company name and remember the (slug, source)
+    pair that returned jobs plus every pair that came back empty. Hits and misses
+    expire independently (``hit_ttl`` / ``miss_ttl``, in seconds).
+    The file is plain JSON; call ``save()`` to persist (``discover_and_fetch`` does it for you).
+    Saving merges into whatever is on disk, so concurrent scans of disjoint companies
+    (shards) can share one file.
+    """
+
+    def __init__(self, path: Union[str, Path, None] = None,
+                 hit_ttl: float = DEFAULT_HIT_TTL,
+                 miss_ttl: float = DEFAULT_MISS_TTL):
+        self.path = Path(path) if path else None
+        self.hit_ttl = hit_ttl
+        self.miss_ttl = miss_ttl
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = {}
+        self._touched: Set[str] = set()  # companies changed since the last save
+        self._dirty = False
+        if self.path and self.path.exists():
+            self._entries = self._read()
+
+    def _read(self) -> Dict[str, dict]:
+        data = read_json(self.path)
+        return data.get("companies", {}) if isinstance(data, dict) else {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _fresh(self, ts: Optional[float], ttl: float, now: float) -> bool:
+        return ts is not None and now - ts < ttl
+
+    def known_hit(self, norm: str, now: Optional[float] = None) -> Optional[Tuple[str, str]]:
+        """Return the cached (slug, source) for ``norm`` if a fresh hit exists."""
+        now = time.time() if now is None else now
+        with self._lock:
+            hit = (self._entries.get(norm) or {}).get("hit")
+            if hit and self._fresh(hit.get("at"), self.hit_ttl, now):
+                return hit["slug"], hit["source"]
+        return None
+
+    def recent_miss(self, norm: str, slug: str, source: str, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        with self._lock:
+            misses = (self._entries.get(norm) or {}).get("misses", {})
+            return self._fresh(misses.get(_pair_key(slug, source)), self.miss_ttl, now)
+
+    def all_missed(self, norm: str, pairs: Iterable[Tuple[str, str]], now: Optional[float] = None) -> bool:
+        """True when every (slug, source) pair in ``pairs`` has a fresh miss recorded."""
+        now = time.time() if now is None else now
+        pairs = list(pairs)
+        if not pairs:
+            return False
+        with self._lock:
+            misses = (self._entries.get(norm) or {}).get("misses", {})
+            return all(self._fresh(misses.get(_pair_key(s, src)), self.miss_ttl, now) for s, src in pairs)
+
+    def record_hit(self, norm: str, slug: str, source: str, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.setdefault(norm, {})
+            entry["hit"] = {"slug": slug, "source": source, "at": now}
+            entry.get("misses", {}).pop(_pair_key(slug, source), None)
+            self._touched.add(norm)
+            self._dirty = True
+
+    def record_miss(self, norm: str, slug: str, source: str, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.setdefault(norm, {})
+            entry.setdefault("misses", {})[_pair_key(slug, source)] = now
+            hit = entry.get("hit")
+            if hit and hit.get("slug") == slug and hit.get("source") == source:
+                entry.pop("hit", None)
+            self._touched.add(norm)
+            self._dirty = True
+
+    def prune(self, now: Optional[float] = None) -> None:
+        """Drop expired hits/misses so the file doesn't grow forever."""
+        now = time.time() if now is None else now
+        with self._lock:
+            for norm in list(self._entries):
+                entry = self._entries[norm]
+                hit = entry.get("hit")
+                if hit and not self._fresh(hit.get("at"), self.hit_ttl, now):
+                    entry.pop("hit", None)
+                misses = {k: ts for k, ts in entry.get("misses", {}).items()
+                          if self._fresh(ts, self.miss_ttl, now)}
+                if misses:
+                    entry["misses"] = misses
+                else:
+                    entry.pop("misses", None)
+                if not entry:
+                    del self._entries[norm]
+            self._dirty = True
+
+    def save(self) -> None:
+        if not self.path or not self._dirty:
+            return
+        with file_lock(self.path):
+            # Merge: the companies we touched win, everything else is kept as on disk
+            disk = self._read()
+            with self._lock:
+                for norm in self._touched:
+                    if norm in self._entries:
+                        disk[norm] = self._entries[norm]
+                self._entries = disk
+                self._touched.clear()
+            self.prune()
+            with self._lock:
+                payload = json.dumps({"version": 1, "companies": self._entries}, separators=(",", ":"))
+                write_atomic(self.path, payload)
+                self._dirty = False
@@ -0,0 +1,206 @@
+from __future__ import annotations
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from .ats_clients import ERROR, THROTTLED, Fetched
+
+
+def _wake(fut: "asyncio.Future") -> None:
+    if not fut.done():
+        fut.set_result(None)
+
+
+class ProviderLimiter:
+    """Token bucket + AIMD concurrency window + Retry-After cooldown for one provider.
+
+    The window grows by ~1 slot per window's worth of healthy responses and is
+    halved (at most once per ``decrease_interval``) when the provider throttles us.
+    A Retry-After pauses admissions for at most ``max_cooldown`` seconds; a longer
+    one marks the provider ``blocked_for`` that long instead, so callers fail fast
+    rather than parking every worker behind it.
+    """
+
+    def __init__(self, rate: float, burst: float, initial_concurrency: float,
+                 min_concurrency: float = 1.0, max_concurrency: float = 64.0,
+                 decrease_interval: float = 1.0, max_cooldown: float = 30.0):
+        self.rate = rate
+        self.burst = burst
+        self.limit = float(initial_concurrency)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.decrease_interval = decrease_interval
+        self.max_cooldown = max_cooldown
+        self.in_flight = 0
+        self._tokens = float(burst)
+        self._stamp = time.monotonic()
+        self._cooldown_until = 0.0
+        self._blocked_until = 0.0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+        # coroutines waiting for a slot, woken by ``release`` (from any thread)
+        self._async_waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+
+    def _try_acquire(self, now: float) -> Optional[float]:
+        """Take a slot and a token if possible; otherwise return seconds to wait (None = until a release)."""
+        if now < self._cooldown_until:
+            return self._cooldown_until - now
+        if self.in_flight >= int(self.limit):
+            return None
+        self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+        if self._tokens < 1.0:
+            return (1.0 - self._tokens) / self.rate
+        self._tokens -= 1.0
+        self.in_flight += 1
+        return 0.0
+
+    def acquire(self) -> None:
+        with self._cond:
+            while True:
+                wait = self._try_acquire(time.monotonic())
+                if wait == 0.0:
+                    return
+                self._cond.wait(timeout=wait)
+
+    async def acquire_async(self) -> None:
+        while True:
+            with self._cond:
+                wait = self._try_acquire(time.monotonic())
+                if wait is None:
+                    fut = asyncio.get_running_loop().create_future()
+                    self._async_waiters.append((asyncio.get_running_loop(), fut))
+            if wait == 0.0:
+                return
+            if wait is not None:
+                await asyncio.sleep(wait)
+                continue
+            try:
+                await fut
+            except asyncio.CancelledError:
+                with self._cond:
+                    if fut.done() and not fut.cancelled():
+                        self._wake_waiters(1)  # pass on the wakeup this task won't use
+                    else:
+                        self._async_waiters = deque(w for w in self._async_waiters if w[1] is not fut)
+                raise
+
+    def _wake_waiters(self, n: int) -> None:
+        """Wake up to ``n`` threads and ``n`` coroutines waiting for a slot (lock held)."""
+        self._cond.notify(n)
+        woken = 0
+        while woken < n and self._async_waiters:
+            loop, fut = self._async_waiters.popleft()
+            if fut.done():  # cancelled while waiting
+                continue
+            loop.call_soon_threadsafe(_wake, fut)
+            woken += 1
+
+    def free_slots(self) -> int:
+        """Slots left in the concurrency window right now (0 during a cooldown)."""
+        with self._cond:
+            if time.monotonic() < self._cooldown_until:
+                return 0
+            return max(0, int(self.limit) - self.in_flight)
+
+    def blocked_for(self) -> float:
+        """Seconds left of a Retry-After longer than ``max_cooldown`` (0 when not blocked)."""
+        with self._cond:
+            return max(0.0, self._blocked_until - time.monotonic())
+
+    def release(self, outcome: str, retry_after: Optional[float] = None) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if outcome == THROTTLED:
+                if now - self._last_decrease >= self.decrease_interval:
+                    self.limit = max(self.min_concurrency, self.limit / 2)
+                    self._last_decrease = now
+                if retry_after:
+                    self._cooldown_until = max(self._cooldown_until, now + min(retry_after, self.max_cooldown))
+                    if retry_after > self.max_cooldown:
+                        self._blocked_until = max(self._blocked_until, now + retry_after)
+            elif outcome != ERROR:
+                self.limit = min(self.max_concurrency, self.limit + 1.0 / self.limit)
+            free = int(self.limit) - self.in_flight
+            if free > 0:
+                self._wake_waiters(free)
+
+
+class Scheduler:
+    """Per-provider admission control and retry policy for ATS requests.
+
+    Every request goes through the provider's limiter. Throttled (429/503) and
+    transient (5xx, timeout) responses are retried with exponential backoff and
+    full jitter, honouring ``Retry-After`` (a server asking for more than
+    ``backoff_cap`` seconds is not retried, and later requests to that provider
+    return THROTTLED at once until it has passed). Whatever is left after
+    ``max_retries`` is returned as-is so callers can tell it apart from a real miss.
+    """
+
+    def __init__(self, rate: float = 50.0, burst: float = 100.0,
+                 initial_concurrency: float = 8.0, max_concurrency: float = 64.0,
+                 max_retries: int = 2, backoff_base: float = 0.5, backoff_cap: float = 30.0):
+        self.rate = rate
+        self.burst = burst
+        self.initial_concurrency = initial_concurrency
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._limiters: Dict[str, ProviderLimiter] = {}
+        self._lock = threading.Lock()
+
+    def limiter(self, source: str) -> ProviderLimiter:
+        with self._lock:
+            lim = self._limiters.get(source)
+            if lim is None:
+                lim = self._limiters[source] = ProviderLimiter(
+                    self.rate, self.burst, self.initial_concurrency,
+                    max_concurrency=self.max_concurrency, max_cooldown=self.backoff_cap)
+            return lim
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        return max(delay, retry_after or 0.0)
+
+    def call(self, source: str, request: Callable[[], Fetched]) -> Fetched:
+        lim = self.limiter(source)
+        attempt = 0
+        while True:
+            blocked = lim.blocked_for()
+            if blocked:
+                return Fetched(THROTTLED, retry_after=blocked, reason="cooldown")
+            lim.acquire()
+            res = Fetched(ERROR)
+            try:
+                res = request()
+            finally:
+                lim.release(res.outcome, res.retry_after)
+            if (res.outcome not in (THROTTLED, ERROR) or attempt >= self.max_retries
+                    or (res.retry_after or 0.0) > self.backoff_cap):
+                return res
+            time.sleep(self._backoff(attempt, res.retry_after))
+            attempt += 1
+
+    async def acall(self, source: str, request: Callable[[], Awaitable[Fetched]]) -> Fetched:
+        lim = self.limiter(source)
+        attempt = 0
+        while True:
+            blocked = lim.blocked_for()
+            if blocked:
+                return Fetched(THROTTLED, retry_after=blocked, reason="cooldown")
+            await lim.acquire_async()
+            res = Fetched(ERROR)
+            try:
+                res = await request()
+            finally:
+                lim.release(res.outcome, res.retry_after)
+            if (res.outcome not in (THROTTLED, ERROR) or attempt >= self.max_retries
+                    or (res.retry_after or 0.0) > self.backoff_cap):
+                return res
+            await asyncio.sleep(self._backoff(attempt, res.retry_after))
+            attempt += 1
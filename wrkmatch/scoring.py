@@ -1,37 +1,206 @@
 from __future__ import annotations
+from typing import TYPE_CHECKING, Dict, Mapping, Optional
+
+import numpy as np
 import pandas as pd
 
-from .normalize import normalize_company_name
+from .normalize import normalize_company_names
+from .titles import LEVELS, classify_titles
+
+if TYPE_CHECKING:
+    from .entities import AliasTable
+
+
+LEVEL_COLUMNS = [f"level_{level}" for level in LEVELS]
+
+
+def _level_weights(level_boosts: Optional[Dict[str, float]]) -> Optional[np.ndarray]:
+    if not level_boosts:
+        return None
+    unknown = set(level_boosts) - set(LEVELS)
+    if unknown:
+        raise ValueError(f"Unknown seniority level(s) {sorted(unknown)}; expected some of {list(LEVELS)}.")
+    return np.array([float(level_boosts.get(level, 0.0)) for level in LEVELS])
+
+
+def _company_keys(names: pd.Series, aliases: Optional["AliasTable"]) -> pd.Series:
+    norm = normalize_company_names(names)
+    return aliases.resolve(norm) if aliases is not None else norm
+
+
+def aggregate_jobs(jobs_df: Optional[pd.DataFrame], aliases: Optional["AliasTable"] = None) -> pd.DataFrame:
+    """Per-company posting aggregates keyed by ``norm``: roles, senior_ratio, level_* shares, top_family.
+
+    Posting titles are labelled with ``classify_titles`` (each distinct title once). The
+    result depends only on the jobs, so it can be computed once and passed as
+    ``job_stats`` to score many connection exports against the same postings.
+    """
+    if jobs_df is None or jobs_df.empty:
+        return pd.DataFrame({"norm": pd.Series(dtype=object), "roles": pd.Series(dtype=float),
+                             "senior_ratio": pd.Series(dtype=float),
+                             **{c: pd.Series(dtype=float) for c in LEVEL_COLUMNS},
+                             "top_family": pd.Series(dtype=object)})
+    labels = classify_titles(jobs_df["title"])
+    jobs_df = pd.DataFrame({"norm": _company_keys(jobs_df["company"], aliases).to_numpy(),
+                            "level": labels["level"].array, "family": labels["family"].to_numpy()})
+    jobs_per = jobs_df.groupby("norm").size().rename("roles").reset_index()
+    # every level as a column, in LEVELS order, even when a scan has no postings at some level
+    counts = (jobs_df.groupby(["norm", "level"], observed=False).size().unstack("level")
+              .reindex(columns=list(LEVELS), fill_value=0))
+    shares = counts.div(counts.sum(axis=1), axis=0)
+    levels = shares.set_axis(LEVEL_COLUMNS, axis=1)
+    levels.insert(0, "senior_ratio", 1.0 - shares["ic"])
+    levels = levels.reset_index()
+    family = (jobs_df.groupby(["norm", "family"], observed=True).size().reset_index(name="n")
+              .sort_values(["norm", "n"], ascending=[True, False])
+              .drop_duplicates("norm")[["norm", "family"]]
+              .rename(columns={"family": "top_family"}))
+    out = jobs_per.merge(levels, on="norm", how="left").merge(family, on="norm", how="left")
+    out["top_family"] = out["top_family"].astype(object)
+    return out
+
+
+def top_k_positions(score: np.ndarray, idx: np.ndarray, top_k: Optional[int]) -> np.ndarray:
+    """The positions in ``idx`` with the ``top_k`` highest scores (all if None), best first.
+
+    Only rows scoring at least the K-th best are sorted, so the cut is cheap; rows tied
+    with that boundary score all survive to the sort, so ties keep index order.
+    """
+    sel = score[idx]
+    if top_k is not None and 0 <= top_k < len(idx):
+        if not top_k:
+            return idx[:0]
+        neg = -sel
+        boundary = np.partition(neg, top_k - 1)[top_k - 1]
+        if not np.isnan(boundary):
+            # every row tied with the K-th score, not whichever ones argpartition picks
+            keep = np.flatnonzero(neg <= boundary)
+            idx, sel = idx[keep], sel[keep]
+    return idx[np.argsort(-sel, kind="stable")][:top_k]
+
+
+class ScoringIndex:
+    """Per-company aggregates (contacts, roles, senior_ratio, display name) built once.
+
+    ``rank`` / ``scores`` only recompute the weighted sum, so re-ranking after a
+    weight or filter change never touches the raw connections/jobs frames again.
+    With ``aliases`` (an ``AliasTable``), fuzzy-matched names are merged into their
+    canonical entity before aggregating.
+
+    Posting-side columns come from ``aggregate_jobs``: ``level_<level>`` holds each
+    company's share of postings per seniority level, ``senior_ratio`` the share above
+    IC and ``top_family`` its most common job family. Pass precomputed ``job_stats``
+    to skip that step (``jobs_df`` is then unused).
+    """
+
+    def __init__(self, connections_df: pd.DataFrame, jobs_df: Optional[pd.DataFrame],
+                 aliases: Optional["AliasTable"] = None, job_stats: Optional[pd.DataFrame] = None):
+        # Normalize each frame's names once (unique names only) and reuse the key below
+        connections_df = connections_df.assign(norm=_company_keys(connections_df["Company"], aliases))
+        contacts_per = connections_df.groupby("norm").size().rename("contacts").reset_index()
+
+        # Display name: most common original company label for the norm
+        name_map = (connections_df
+                    .groupby(["norm", "Company"]).size().reset_index(name="n")
+                    .sort_values(["norm", "n"], ascending=[True, False])
+                    .drop_duplicates("norm")[ ["norm", "Company"] ]
+                    .rename(columns={"Company": "display_company"}))
+
+        if job_stats is None:
+            job_stats = aggregate_jobs(jobs_df, aliases)
+        self._build(contacts_per.merge(name_map, on="norm", how="left"), job_stats)
+
+    @classmethod
+    def from_contacts(cls, contacts: pd.DataFrame, job_stats: pd.DataFrame) -> "ScoringIndex":
+        """Index pre-aggregated contacts (``norm``, ``contacts``, ``display_company``)."""
+        index = cls.__new__(cls)
+        index._build(contacts, job_stats)
+        return index
+
+    def _build(self, contacts: pd.DataFrame, job_stats: pd.DataFrame) -> None:
+        agg = contacts[["norm", "contacts"]].merge(job_stats, on="norm", how="left")
+        agg["roles"] = agg["roles"].fillna(0)
+        agg[["senior_ratio"] + LEVEL_COLUMNS] = agg[["senior_ratio"] + LEVEL_COLUMNS].fillna(0.0)
+        agg["top_family"] = agg["top_family"].astype(object)
+
+        self.frame = agg.merge(contacts[["norm", "display_company"]], on="norm", how="left")
+        self._contacts = self.frame["contacts"].to_numpy(dtype=float)
+        self._roles = self.frame["roles"].to_numpy(dtype=float)
+        self._senior = self.frame["senior_ratio"].to_numpy(dtype=float)
+        self._levels = self.frame[LEVEL_COLUMNS].to_numpy(dtype=float)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def scores(self, w_contacts: float = 1.5, w_roles: float = 1.0, senior_boost: float = 0.5,
+               level_boosts: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """Weighted sum per company; ``level_boosts`` ({level: boost}) adds each level's
+        share of postings times its boost."""
+        score = self._contacts * w_contacts + self._roles * w_roles + self._senior * senior_boost
+        weights = _level_weights(level_boosts)
+        if weights is not None:
+            score = score + self._levels @ weights
+        return score
+
+    def _with_scores(self, idx: np.ndarray, score: np.ndarray) -> pd.DataFrame:
+        out = self.frame.iloc[idx].copy()
+        out.insert(out.columns.get_loc("senior_ratio") + 1, "score", score)
+        return out
+
+    def rank(self, w_contacts: float = 1.5, w_roles: float = 1.0, senior_boost: float = 0.5,
+             min_contacts: float = 0, min_roles: float = 0, top_k: Optional[int] = None,
+             level_boosts: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+        """Filter, re-weight and return the top ``top_k`` companies (all if None), best first."""
+        score = self.scores(w_contacts, w_roles, senior_boost, level_boosts)
+        idx = top_k_positions(score, np.flatnonzero((self._contacts >= min_contacts) & (self._roles >= min_roles)),
+                              top_k)
+        return self._with_scores(idx, score[idx])
 
 
 def compute_scores(connections_df: pd.DataFrame,
-                   jobs_df: pd.DataFrame,
+                   jobs_df: Optional[pd.DataFrame],
                    w_contacts: float = 1.5,
                    w_roles: float = 1.0,
-                   senior_boost: float = 0.5) -> pd.DataFrame:
-    contacts_per = (connections_df.assign(norm=lambda d: d["Company"].map(normalize_company_name))
-                    .groupby("norm").size().rename("contacts").reset_index())
-
-    if jobs_df.empty:
-        jobs_per = pd.DataFrame({"norm": [], "roles": []})
-        senior = pd.DataFrame({"norm": [], "senior_ratio": []})
-    else:
-        jobs_df = jobs_df.assign(norm=lambda d: d["company"].map(normalize_company_name))
-        jobs_per = jobs_df.groupby("norm").size().rename("roles").reset_index()
-        senior = (jobs_df.assign(is_senior=lambda d: d["title"].str.contains(r"senior|lead|head|principal|staff", case=False, regex=True))
-                  .groupby("norm")["is_senior"].mean().fillna(0).rename("senior_ratio").reset_index())
-
-    score = contacts_per.merge(jobs_per, on="norm", how="left").merge(senior, on="norm", how="left")
-    score["roles"] = score["roles"].fillna(0)
-    score["senior_ratio"] = score["senior_ratio"].fillna(0)
-    score["score"] = score["contacts"] * w_contacts + score["roles"] * w_roles + score["senior_ratio"] * senior_boost
-
-    # Display name: most common original company label for the norm
-    name_map = (connections_df.assign(norm=lambda d: d["Company"].map(normalize_company_name))
-                .groupby(["norm", "Company"]).size().reset_index(name="n")
-                .sort_values(["norm", "n"], ascending=[True, False])
-                .drop_duplicates("norm")[ ["norm", "Company"] ]
-                .rename(columns={"Company": "display_company"}))
-
-    score = score.merge(name_map, on="norm", how="left")
-    return score.sort_values("score", ascending=False)
\ No newline at end of file
+                   senior_boost: float = 0.5,
+                   aliases: Optional["AliasTable"] = None,
+                   level_boosts: Optional[Dict[str, float]] = None,
+                   job_stats: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    index = ScoringIndex(connections_df, jobs_df, aliases=aliases, job_stats=job_stats)
+    return _scored(index, w_contacts, w_roles, senior_boost, level_boosts)
+
+
+def _scored(index: ScoringIndex, w_contacts: float, w_roles: float, senior_boost: float,
+            level_boosts: Optional[Dict[str, float]]) -> pd.DataFrame:
+    score = index.frame.copy()
+    score.insert(score.columns.get_loc("senior_ratio") + 1, "score",
+                 index.scores(w_contacts, w_roles, senior_boost, level_boosts))
+    return score.sort_values("score", ascending=False)
+
+
+def compute_team_scores(person_scores: Mapping[str, pd.DataFrame],
+                        job_stats: pd.DataFrame,
+                        w_contacts: float = 1.5,
+                        w_roles: float = 1.0,
+                        senior_boost: float = 0.5,
+                        level_boosts: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+    """Rank companies for a whole team from each person's ``compute_scores`` output.
+
+    Contacts are summed across people and scored like one big network against the
+    same ``job_stats``. ``people`` counts the people with contacts there, and
+    ``best_connected`` names the person with the most of them.
+    """
+    parts = [df[["norm", "contacts", "display_company"]].assign(person=person)
+             for person, df in person_scores.items() if not df.empty]
+    if not parts:
+        return _scored(ScoringIndex.from_contacts(
+            pd.DataFrame({"norm": [], "contacts": [], "display_company": []}), job_stats),
+            w_contacts, w_roles, senior_boost, level_boosts).assign(people=[], best_connected=[])
+    long = pd.concat(parts, ignore_index=True)
+    best = long.sort_values(["norm", "contacts"], ascending=[True, False]).drop_duplicates("norm")
+    contacts = (long.groupby("norm").agg(contacts=("contacts", "sum"), people=("person", "nunique"))
+                .reset_index()
+                .merge(best[["norm", "display_company", "person"]], on="norm", how="left")
+                .rename(columns={"person": "best_connected"}))
+    team = _scored(ScoringIndex.from_contacts(contacts, job_stats), w_contacts, w_roles, senior_boost,
+                   level_boosts)
+    return team.merge(contacts[["norm", "people", "best_connected"]], on="norm", how="left")
@@ -0,0 +1,394 @@
+"""Local JSON query server over a warm, in-memory index of a run (``python cli.py serve``).
+
+A run directory (``cli.py --out-dir``) is loaded once into numpy indexes: postings by
+company, by location token, by source and by title keyword, plus each user's
+contacts per company. Ranking and drill-down queries then cost a few array
+operations. The run directory is polled, and the index is rebuilt off the request
+path and swapped in when new scan output lands.
+
+    GET /users
+    GET /rank?user=NAME&k=20&location=berlin&source=lever&keyword=engineer&min_roles=3
+    GET /company?user=NAME&norm=acme&location=berlin&limit=50
+    GET /metrics
+"""
+from __future__ import annotations
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from .index import CompanyIndex, _Groups
+from .io_utils import load_run, read_connections, read_table
+from .metrics import _Histogram
+from .normalize import normalize_company_names
+from .scoring import ScoringIndex, _level_weights, aggregate_jobs, top_k_positions
+from .titles import LEVELS, classify_titles
+
+if TYPE_CHECKING:
+    from .entities import AliasTable
+
+TOKEN = re.compile(r"[a-z0-9]+")
+POSTING_FIELDS = ("title", "location", "department", "source", "url", "posted_at")
+DEFAULT_K = 20
+MAX_LIMIT = 1000
+ENDPOINTS = ("/rank", "/company", "/users", "/metrics", "/healthz")
+
+
+def _tokens(text: str) -> List[str]:
+    return TOKEN.findall(text.lower())
+
+
+def _inverted(values: pd.Series) -> Dict[str, np.ndarray]:
+    """{token: sorted posting positions}; each distinct value is tokenized once."""
+    groups = _Groups(values.fillna("").astype(str).str.lower())
+    by_token: Dict[str, List[np.ndarray]] = {}
+    for value in groups.keys():
+        rows = groups.get(value)
+        for token in set(_tokens(value)):
+            by_token.setdefault(token, []).append(rows)
+    return {token: np.sort(np.concatenate(parts)) for token, parts in by_token.items()}
+
+
+class PostingIndex:
+    """Postings as arrays (company code, level code) with inverted indexes for filtering."""
+
+    def __init__(self, jobs_df: pd.DataFrame, aliases: Optional["AliasTable"] = None):
+        self.jobs = jobs_df.reset_index(drop=True)
+        if self.jobs.empty:
+            self.jobs = pd.DataFrame({c: pd.Series(dtype=object) for c in ("company",) + POSTING_FIELDS})
+        norm = normalize_company_names(self.jobs["company"])
+        if aliases is not None:
+            norm = aliases.resolve(norm)
+        codes, uniques = pd.factorize(norm)
+        self.company = codes.astype(np.intp)
+        self.code_of = {key: i for i, key in enumerate(uniques)}
+        self.level = classify_titles(self.jobs["title"])["level"].cat.codes.to_numpy(dtype=np.intp)
+        self.by_company = _Groups(pd.Series(norm))
+        self.by_location = _inverted(self.jobs["location"])
+        self.by_keyword = _inverted(self.jobs["title"])
+        self.by_source = {str(k): np.sort(v) for k, v in
+                          self.jobs.groupby("source", observed=True).indices.items()}
+        self._all = self._count(self.company, self.level)
+
+    def __len__(self) -> int:
+        return len(self.company)
+
+    def select(self, location: str = "", source: str = "", keyword: str = "") -> Optional[np.ndarray]:
+        """Sorted positions of postings matching every given filter (all tokens of each), or None
+        when no filter is given."""
+        sets = [self.by_location.get(t) for t in _tokens(location)]
+        sets += [self.by_keyword.get(t) for t in _tokens(keyword)]
+        if source:
+            sets.append(self.by_source.get(source.lower()))
+        if not sets:
+            return None
+        if any(s is None for s in sets):
+            return np.empty(0, dtype=np.intp)
+        sets.sort(key=len)
+        out = sets[0]
+        for s in sets[1:]:
+            out = np.intersect1d(out, s, assume_unique=True)
+        return out
+
+    def company_stats(self, postings: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """(roles, postings per level) per company code, over ``postings`` (all if None)."""
+        if postings is None:
+            return self._all
+        return self._count(self.company[postings], self.level[postings])
+
+    def _count(self, company: np.ndarray, level: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        n, n_levels = len(self.code_of), len(LEVELS)
+        counts = np.bincount(company * n_levels + level, minlength=n * n_levels).reshape(n, n_levels)
+        return counts.sum(axis=1), counts
+
+
+class _User:
+    """One user's contacts per company, aligned to the posting index's company codes."""
+
+    def __init__(self, name: str, contacts: pd.DataFrame, postings: PostingIndex,
+                 people: Optional[CompanyIndex] = None):
+        self.name = name
+        self.norm = contacts["norm"].astype(str).to_numpy(dtype=object)
+        self.display = contacts["display_company"].astype(str).to_numpy(dtype=object)
+        self.contacts = contacts["contacts"].to_numpy(dtype=float)
+        self.code = np.array([postings.code_of.get(n, -1) for n in self.norm], dtype=np.intp)
+        self.row_of = {n: i for i, n in enumerate(self.norm)}
+        self.people = people
+
+
+class ServeIndex:
+    """Everything a query needs, built once per load of the run directory."""
+
+    def __init__(self, postings: PostingIndex, users: Dict[str, _User]):
+        self.postings = postings
+        self.users = users
+        self.loaded_at = time.time()
+
+    @classmethod
+    def load(cls, run_dir, connections: Iterable = (), aliases: Optional["AliasTable"] = None) -> "ServeIndex":
+        """Index ``run_dir``'s jobs and its users.
+
+        Users come from the run's ``company_scores`` ("default"), ``team_scores`` ("team")
+        and ``people/<name>/company_scores`` (batch mode), plus one per connections CSV in
+        ``connections`` (named after the file, with contact names for drill-downs).
+        """
+        run_dir = Path(run_dir)
+        postings = PostingIndex(load_run(run_dir).jobs, aliases)
+        frames: Dict[str, Tuple[pd.DataFrame, Optional[CompanyIndex]]] = {}
+        for name, table_dir, table in (("default", run_dir, "company_scores"), ("team", run_dir, "team_scores")):
+            df = read_table(table_dir, table)
+            if df is not None:
+                frames[name] = (df, None)
+        people_dir = run_dir / "people"
+        if people_dir.is_dir():
+            for person in sorted(p for p in people_dir.iterdir() if p.is_dir()):
+                df = read_table(person, "company_scores")
+                if df is not None:
+                    frames[person.name] = (df, None)
+        if connections:
+            job_stats = aggregate_jobs(postings.jobs, aliases)
+            for path in map(Path, connections):
+                conn = read_connections(path)
+                scores = ScoringIndex(conn, None, aliases=aliases, job_stats=job_stats).frame
+                frames[path.stem] = (scores, CompanyIndex(conn, postings.jobs.iloc[:0], aliases=aliases))
+        users = {name: _User(name, df, postings, people) for name, (df, people) in frames.items()}
+        return cls(postings, users)
+
+    def user(self, name: Optional[str]) -> _User:
+        if name is None and len(self.users) == 1:
+            return next(iter(self.users.values()))
+        if name is None:
+            name = "default" if "default" in self.users else ""
+        try:
+            return self.users[name]
+        except KeyError:
+            raise KeyError(f"unknown user {name!r}; see /users") from None
+
+    def rank(self, user: Optional[str] = None, k: Optional[int] = DEFAULT_K, location: str = "",
+             source: str = "", keyword: str = "", min_contacts: float = 0, min_roles: float = 0,
+             w_contacts: float = 1.5, w_roles: float = 1.0, senior_boost: float = 0.5,
+             level_boosts: Optional[Dict[str, float]] = None) -> List[dict]:
+        """Top ``k`` companies for ``user``, scored like ``compute_scores``.
+
+        With filters, ``roles`` and the seniority shares only count the matching postings.
+        """
+        u = self.user(user)
+        roles_all, levels_all = self.postings.company_stats(self.postings.select(location, source, keyword))
+        has = u.code >= 0
+        code = np.where(has, u.code, 0)
+        roles = np.where(has, roles_all[code] if len(roles_all) else 0, 0).astype(float)
+        levels = np.where(has[:, None], levels_all[code] if len(levels_all) else 0, 0).astype(float)
+        shares = levels / np.maximum(roles, 1.0)[:, None]
+        senior = np.where(roles > 0, 1.0 - shares[:, 0], 0.0)
+        score = u.contacts * w_contacts + roles * w_roles + senior * senior_boost
+        weights = _level_weights(level_boosts)
+        if weights is not None:
+            score = score + shares @ weights
+        idx = top_k_positions(score, np.flatnonzero((u.contacts >= min_contacts) & (roles >= min_roles)), k)
+        return [{"company": u.display[i], "norm": u.norm[i], "contacts": int(u.contacts[i]),
+                 "roles": int(roles[i]), "senior_ratio": round(float(senior[i]), 4),
+                 "score": round(float(score[i]), 4)} for i in idx]
+
+    def company(self, norm: str, user: Optional[str] = None, location: str = "", source: str = "",
+                keyword: str = "", limit: int = 50) -> dict:
+        """Postings (filtered like ``rank``) and, when known, contact names at one company."""
+        u = self.user(user)
+        rows = self.postings.by_company.get(norm)
+        selected = self.postings.select(location, source, keyword)
+        if selected is not None:
+            rows = np.intersect1d(rows, selected, assume_unique=True)
+        jobs = self.postings.jobs.iloc[rows[:limit]]
+        i = u.row_of.get(norm)
+        return {
+            "norm": norm,
+            "company": u.display[i] if i is not None else None,
+            "contacts": int(u.contacts[i]) if i is not None else 0,
+            "contact_names": u.people.contact_names(norm) if u.people is not None else None,
+            "roles": int(len(rows)),
+            "postings": [{f: (None if pd.isna(v) else str(v)) for f, v in zip(POSTING_FIELDS, rec)}
+                         for rec in jobs[list(POSTING_FIELDS)].itertuples(index=False, name=None)],
+        }
+
+
+def _signature(run_dir: Path, connections: Iterable) -> tuple:
+    """(path, mtime, size) of every file a load reads; changes when new output lands."""
+    files = [p for p in run_dir.rglob("*") if p.is_file() and p.suffix in (".csv", ".parquet", ".feather")
+             and p.name != "scan_journal.jsonl"]
+    files += [Path(p) for p in connections]
+    out = []
+    for p in sorted(files):
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        out.append((str(p), st.st_mtime_ns, st.st_size))
+    return tuple(out)
+
+
+class QueryState:
+    """The live ``ServeIndex`` plus reload and latency bookkeeping, shared by request threads.
+
+    ``reload_if_changed`` rebuilds the index when the run directory changed and swaps
+    it in; requests keep using the old one until the swap, and a failed rebuild (a
+    half-written file) leaves it in place for the next poll.
+    """
+
+    def __init__(self, run_dir, connections: Iterable = (), aliases: Optional["AliasTable"] = None):
+        self.run_dir = Path(run_dir)
+        self.connections = [str(p) for p in connections]
+        self.aliases = aliases
+        self._lock = threading.Lock()
+        self.latency: Dict[str, _Histogram] = {}
+        self.responses: Dict[int, int] = {}
+        self.reloads = 0
+        self.reload_errors = 0
+        self.last_error: Optional[str] = None
+        self._signature = _signature(self.run_dir, self.connections)
+        self.index = ServeIndex.load(self.run_dir, self.connections, aliases)
+
+    def reload_if_changed(self) -> bool:
+        signature = _signature(self.run_dir, self.connections)
+        if signature == self._signature:
+            return False
+        try:
+            index = ServeIndex.load(self.run_dir, self.connections, self.aliases)
+        except Exception as e:  # retried on the next poll
+            with self._lock:
+                self.reload_errors += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+            return False
+        with self._lock:
+            self.index, self._signature = index, signature
+            self.reloads += 1
+        return True
+
+    def watch(self, interval: float, stop: threading.Event) -> None:
+        while not stop.wait(interval):
+            self.reload_if_changed()
+
+    def observe(self, endpoint: str, status: int, seconds: float) -> None:
+        with self._lock:
+            hist = self.latency.get(endpoint)
+            if hist is None:
+                hist = self.latency[endpoint] = _Histogram()
+            hist.add(seconds)
+            self.responses[status] = self.responses.get(status, 0) + 1
+
+    def metrics(self) -> dict:
+        index = self.index
+        with self._lock:
+            return {
+                "latency_ms": {ep: h.summary() for ep, h in sorted(self.latency.items())},
+                "responses": {str(k): v for k, v in sorted(self.responses.items())},
+                "reloads": self.reloads, "reload_errors": self.reload_errors, "last_error": self.last_error,
+                "loaded_at": index.loaded_at, "postings": len(index.postings),
+                "companies": len(index.postings.code_of), "users": len(index.users),
+            }
+
+
+def _first(query: Dict[str, List[str]], name: str, default=None, cast=str):
+    values = query.get(name)
+    if not values or values[0] == "":
+        return default
+    try:
+        return cast(values[0])
+    except ValueError:
+        raise ValueError(f"invalid {name}={values[0]!r}") from None
+
+
+def _rank_args(query: Dict[str, List[str]]) -> dict:
+    return {
+        "user": _first(query, "user"), "k": _first(query, "k", DEFAULT_K, int),
+        "location": _first(query, "location", ""), "source": _first(query, "source", ""),
+        "keyword": _first(query, "keyword", ""),
+        "min_contacts": _first(query, "min_contacts", 0, float), "min_roles": _first(query, "min_roles", 0, float),
+        "w_contacts": _first(query, "w_contacts", 1.5, float), "w_roles": _first(query, "w_roles", 1.0, float),
+        "senior_boost": _first(query, "senior_boost", 0.5, float),
+        "level_boosts": {level: _first(query, f"boost_{level}", 0.0, float) for level in LEVELS
+                         if f"boost_{level}" in query} or None,
+    }
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+def make_server(state: QueryState, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """HTTP server answering queries from ``state`` (loopback only by default)."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, fmt, *args):
+            pass
+
+        def _send(self, status: int, payload) -> None:
+            body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            started = time.perf_counter()
+            url = urlsplit(self.path)
+            query = parse_qs(url.query)
+            index = state.index  # one consistent snapshot per request
+            try:
+                if url.path == "/rank":
+                    args = _rank_args(query)
+                    results = index.rank(**args)
+                    status, payload = 200, {"user": index.user(args["user"]).name, "count": len(results),
+                                            "results": results}
+                elif url.path == "/company":
+                    norm = _first(query, "norm")
+                    if norm is None:
+                        raise ValueError("norm is required")
+                    status, payload = 200, index.company(
+                        norm, user=_first(query, "user"), location=_first(query, "location", ""),
+                        source=_first(query, "source", ""), keyword=_first(query, "keyword", ""),
+                        limit=min(MAX_LIMIT, _first(query, "limit", 50, int)))
+                elif url.path == "/users":
+                    status, payload = 200, {"users": sorted(index.users)}
+                elif url.path == "/metrics":
+                    status, payload = 200, state.metrics()
+                elif url.path == "/healthz":
+                    status, payload = 200, {"ok": True}
+                else:
+                    status, payload = 404, {"error": f"no such endpoint {url.path}"}
+            except KeyError as e:
+                status, payload = 404, {"error": str(e.args[0])}
+            except ValueError as e:
+                status, payload = 400, {"error": str(e)}
+            elapsed = time.perf_counter() - started
+            if status == 200 and isinstance(payload, dict) and url.path in ("/rank", "/company"):
+                payload["took_ms"] = round(elapsed * 1000, 3)
+            self._send(status, payload)
+            state.observe(url.path if url.path in ENDPOINTS else "other", status, elapsed)
+
+    return _Server((host, port), Handler)
+
+
+def serve(state: QueryState, host: str = "127.0.0.1", port: int = 8765, reload_interval: float = 5.0) -> None:
+    """Serve until interrupted, polling for new run output every ``reload_interval`` seconds."""
+    server = make_server(state, host, port)
+    stop = threading.Event()
+    if reload_interval > 0:
+        threading.Thread(target=state.watch, args=(reload_interval, stop), name="wrkmatch-reload",
+                         daemon=True).start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
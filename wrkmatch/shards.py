@@ -0,0 +1,39 @@
+from __future__ import annotations
+import hashlib
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
+
+from .normalize import normalize_company_name
+
+if TYPE_CHECKING:
+    from .entities import AliasTable
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parse ``"i/n"`` (0 <= i < n) into ``(i, n)``."""
+    try:
+        i, n = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard {spec!r}; expected i/n, e.g. 0/4.") from None
+    if n < 1 or not 0 <= i < n:
+        raise ValueError(f"Invalid shard {spec!r}; need 0 <= i < n.")
+    return i, n
+
+
+def shard_of(company: str, n: int, aliases: Optional["AliasTable"] = None) -> int:
+    """Shard (0..n-1) a company belongs to, by a stable hash of its normalized name.
+
+    Spellings that normalize alike (or, with ``aliases``, resolve to the same entity)
+    always land in the same shard, on every machine and Python version (unlike
+    ``hash()``), so per-company cache entries never conflict between shards.
+    """
+    key = normalize_company_name(company)
+    if aliases is not None:
+        key = aliases.canonical(key)
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % n
+
+
+def shard_companies(companies: Iterable[str], i: int, n: int,
+                    aliases: Optional["AliasTable"] = None) -> List[str]:
+    """The companies in shard ``i`` of ``n``, in their original order."""
+    return [c for c in companies if shard_of(c, n, aliases) == i]
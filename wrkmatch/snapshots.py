@@ -0,0 +1,278 @@
+from __future__ import annotations
+import hashlib
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .normalize import normalize_company_name, normalize_company_names
+
+# Fields identifying a posting; a change in any of them makes it a different posting
+KEY_FIELDS = ("source", "url", "title", "location")
+# Fields that may change without changing the posting's identity
+DETAIL_FIELDS = ("company", "posting_company", "department", "posted_at")
+# Company statuses whose postings are complete; others (throttled/error) never close postings
+COMPLETE = ("hit", "miss")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    at REAL NOT NULL,
+    label TEXT,
+    companies INTEGER NOT NULL,
+    postings INTEGER NOT NULL,
+    added INTEGER NOT NULL,
+    removed INTEGER NOT NULL,
+    changed INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    key TEXT PRIMARY KEY,
+    norm TEXT NOT NULL,
+    company TEXT, posting_company TEXT, source TEXT, title TEXT, location TEXT,
+    department TEXT, url TEXT, posted_at TEXT,
+    details TEXT NOT NULL,
+    first_seen REAL NOT NULL, first_run INTEGER NOT NULL,
+    last_seen REAL, last_run INTEGER,  -- set when the posting closes; while open, see companies
+    active INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS companies (
+    norm TEXT PRIMARY KEY,
+    last_seen REAL NOT NULL,
+    last_run INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    key TEXT NOT NULL REFERENCES postings(key),
+    kind TEXT NOT NULL CHECK (kind IN ('added', 'removed', 'changed')),
+    PRIMARY KEY (run_id, key)
+);
+CREATE INDEX IF NOT EXISTS postings_norm ON postings(norm, active);
+CREATE INDEX IF NOT EXISTS postings_source ON postings(source);
+CREATE INDEX IF NOT EXISTS postings_first_seen ON postings(first_seen);
+CREATE INDEX IF NOT EXISTS postings_last_seen ON postings(last_seen);
+CREATE INDEX IF NOT EXISTS events_key ON events(key);
+"""
+# SQLite date() modifiers taking a UTC time to the start of its day, week (Monday) or month
+PERIOD_START = {"day": "", "week": ", 'weekday 0', '-6 days'", "month": ", 'start of month'"}
+POSTING_COLUMNS = ["key", "norm", "company", "posting_company", "source", "title", "location",
+                   "department", "url", "posted_at", "first_seen", "first_run", "active"]
+# open postings were last seen by their company's latest scan
+POSTING_SELECT = ("SELECT " + ", ".join(f"p.{c}" for c in POSTING_COLUMNS)
+                  + ", COALESCE(p.last_seen, c.last_seen) AS last_seen, COALESCE(p.last_run, c.last_run) AS last_run"
+                  " FROM postings p LEFT JOIN companies c ON c.norm = p.norm")
+
+
+class RunSummary(NamedTuple):
+    run_id: int
+    added: int
+    removed: int
+    changed: int
+    unchanged: int
+
+
+def _digest(parts) -> str:
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def posting_key(source: str, url: str, title: str, location: str) -> str:
+    """Stable content hash identifying a posting across scans."""
+    return _digest((source or "", url or "", title or "", location or ""))
+
+
+def _text(jobs_df: pd.DataFrame, col: str) -> np.ndarray:
+    """``col`` as an object array of str ("" when missing), formatting each distinct value once."""
+    if col not in jobs_df.columns:
+        return np.full(len(jobs_df), "", dtype=object)
+    codes, uniques = pd.factorize(jobs_df[col])
+    if col == "posted_at":
+        # one spelling whether the run was loaded from CSV (strings) or Parquet (timestamps)
+        ts = pd.to_datetime(pd.Series(uniques), utc=True, errors="coerce", format="ISO8601")
+        uniques = ts.dt.strftime("%Y-%m-%dT%H:%M:%SZ").fillna("")
+    labels = np.append(np.asarray(uniques, dtype=object).astype(str), "")
+    return labels.take(codes)  # code -1 (missing) takes the trailing ""
+
+
+def _digests(cols: Dict[str, np.ndarray], fields) -> np.ndarray:
+    return np.array([_digest(t) for t in zip(*(cols[c] for c in fields))], dtype=object)
+
+
+def _to_times(df: pd.DataFrame, cols) -> pd.DataFrame:
+    for col in cols:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], unit="s", utc=True)
+    return df
+
+
+class SnapshotStore:
+    """SQLite history of postings across scans, stored as deltas.
+
+    Each posting is keyed by ``posting_key`` (provider, url, title, location) and kept
+    once, with ``first_seen`` / ``last_seen`` and whether it is still ``active``. Each
+    ``record``ed scan adds a ``runs`` row plus ``events`` for the postings it added,
+    removed (no longer listed by a company that scanned cleanly) or changed (same key,
+    different company/department/posted_at), and stamps the scanned companies — so a
+    scan writes rows in proportion to what changed, never a full copy of the report.
+    Companies that were throttled or errored keep their postings open.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # a connection per call, so the store can be shared across threads
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def record(self, jobs_df: pd.DataFrame, status: Optional[Dict[str, str]] = None,
+               label: Optional[str] = None, at: Optional[float] = None) -> RunSummary:
+        """Store a scan's postings as a delta against the previous state and return the counts.
+
+        ``status`` ({company: hit/miss/throttled/error}, e.g. ``df.attrs["company_status"]``)
+        says which companies were scanned; their postings missing from ``jobs_df`` are
+        closed. Without it, only companies with postings in ``jobs_df`` count as scanned.
+        """
+        at = time.time() if at is None else at
+        if status is None:
+            status = jobs_df.attrs.get("company_status") or {}
+        cols = {c: _text(jobs_df, c) for c in KEY_FIELDS + DETAIL_FIELDS}
+        current = pd.DataFrame({"key": _digests(cols, KEY_FIELDS),
+                                "norm": np.asarray(normalize_company_names(cols["company"]), dtype=object),
+                                "details": _digests(cols, DETAIL_FIELDS), **cols}, dtype=object)
+        # a board shared by several companies lists the same posting for each; keep one owner,
+        # chosen independently of scan order so it isn't reported as changed on every run
+        current = current.sort_values(["key", "norm"], kind="stable").drop_duplicates("key")
+        scanned = {normalize_company_name(c) for c, s in status.items() if s in COMPLETE}
+        scanned.update(current["norm"])
+
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            run_id = db.execute("INSERT INTO runs (at, label, companies, postings, added, removed, changed) "
+                                "VALUES (?, ?, ?, ?, 0, 0, 0)",
+                                (at, label, len(scanned), len(current))).lastrowid
+            db.execute("CREATE TEMP TABLE scanned (norm TEXT PRIMARY KEY)")
+            db.executemany("INSERT INTO scanned VALUES (?)", ((n,) for n in scanned))
+            # Only active postings can be unchanged or changed; anything else in the scan is added
+            active = pd.read_sql_query("SELECT key, details AS details_old, norm AS norm_old FROM postings "
+                                       "WHERE active = 1", db, dtype=object)
+            merged = current.merge(active, on="key", how="left")
+            is_new = merged["details_old"].isna()
+            is_changed = ~is_new & (merged["details"] != merged["details_old"])
+            added, changed = merged[is_new], merged[is_changed]
+            # ...and what a cleanly scanned company no longer lists is removed
+            gone = active[active["norm_old"].isin(scanned) & ~active["key"].isin(current["key"])]
+            removed = gone["key"].tolist()
+
+            fields = ["key", "norm", "details", *KEY_FIELDS, *DETAIL_FIELDS]
+            rows = pd.concat([added, changed])[fields].to_numpy(dtype=object).tolist()
+            db.executemany(
+                f"INSERT INTO postings ({', '.join(fields)}, first_seen, first_run, active) "
+                f"VALUES ({', '.join('?' * len(fields))}, {float(at)!r}, {run_id}, 1) "
+                "ON CONFLICT(key) DO UPDATE SET active = 1, last_seen = NULL, last_run = NULL, "
+                + ", ".join(f"{f} = excluded.{f}" for f in fields[1:]), rows)
+            # closed postings were last seen by their company's previous scan
+            db.executemany("UPDATE postings SET active = 0, (last_seen, last_run) = "
+                           "(SELECT last_seen, last_run FROM companies c WHERE c.norm = postings.norm) "
+                           "WHERE key = ?", ((k,) for k in removed))
+            db.executemany("INSERT INTO events (run_id, key, kind) VALUES (?, ?, ?)",
+                           [(run_id, k, "added") for k in added["key"]]
+                           + [(run_id, k, "changed") for k in changed["key"]]
+                           + [(run_id, k, "removed") for k in removed])
+            db.execute("INSERT INTO companies (norm, last_seen, last_run) SELECT norm, ?, ? FROM scanned "
+                       "WHERE true ON CONFLICT(norm) DO UPDATE SET last_seen = excluded.last_seen, "
+                       "last_run = excluded.last_run", (at, run_id))
+            db.execute("UPDATE runs SET added = ?, removed = ?, changed = ? WHERE id = ?",
+                       (len(added), len(removed), len(changed), run_id))
+            db.execute("DROP TABLE scanned")
+        return RunSummary(run_id, len(added), len(removed), len(changed),
+                          len(current) - len(added) - len(changed))
+
+    def runs(self) -> pd.DataFrame:
+        with self._connect() as db:
+            return _to_times(pd.read_sql_query("SELECT * FROM runs ORDER BY id", db), ["at"])
+
+    def postings(self, active: Optional[bool] = True, company: Optional[str] = None,
+                 source: Optional[str] = None) -> pd.DataFrame:
+        """Stored postings (active ones by default), optionally for one company and/or source."""
+        where, params = [], []
+        if active is not None:
+            where.append("p.active = ?")
+            params.append(int(active))
+        if company is not None:
+            where.append("p.norm = ?")
+            params.append(normalize_company_name(company))
+        if source is not None:
+            where.append("p.source = ?")
+            params.append(source)
+        sql = POSTING_SELECT
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        with self._connect() as db:
+            df = pd.read_sql_query(sql + " ORDER BY p.first_seen, p.key", db, params=params)
+        return _to_times(df, ["first_seen", "last_seen"])
+
+    def new_since(self, run_id: int, active: bool = True) -> pd.DataFrame:
+        """Postings added by any run after ``run_id`` (still open ones only, by default)."""
+        sql = (POSTING_SELECT + " WHERE p.key IN (SELECT key FROM events WHERE run_id > ? AND kind = 'added')")
+        if active:
+            sql += " AND p.active = 1"
+        with self._connect() as db:
+            df = pd.read_sql_query(sql + " ORDER BY p.first_seen, p.key", db, params=[run_id])
+        return _to_times(df, ["first_seen", "last_seen"])
+
+    def changes_since(self, run_id: int) -> pd.DataFrame:
+        """Every event after ``run_id``: run, kind (added/removed/changed) and the posting."""
+        with self._connect() as db:
+            df = pd.read_sql_query(
+                "SELECT e.run_id, r.at, e.kind, p.norm, p.company, p.source, p.title, p.location, p.url "
+                "FROM events e JOIN runs r ON r.id = e.run_id JOIN postings p USING (key) "
+                "WHERE e.run_id > ? ORDER BY e.run_id, e.kind, p.norm", db, params=[run_id])
+        return _to_times(df, ["at"])
+
+    def velocity(self, freq: str = "week", company: Optional[str] = None) -> pd.DataFrame:
+        """Postings opened and closed per company per ``freq`` ("day", "week" or "month").
+
+        Columns: norm, period (start, UTC), added, removed, net. Computed from the event
+        log in SQL, so history is never re-read as full reports.
+        """
+        modifiers = PERIOD_START.get(freq)
+        if modifiers is None:
+            raise ValueError(f"Unknown freq {freq!r}; expected day, week or month.")
+        # grouped on the period's start date itself, so a week spanning New Year is one period
+        sql = (f"SELECT p.norm, date(r.at, 'unixepoch'{modifiers}) AS period, "
+               "SUM(e.kind = 'added') AS added, SUM(e.kind = 'removed') AS removed "
+               "FROM events e JOIN runs r ON r.id = e.run_id JOIN postings p USING (key) "
+               "WHERE e.kind != 'changed'")
+        params: List = []
+        if company is not None:
+            sql += " AND p.norm = ?"
+            params.append(normalize_company_name(company))
+        with self._connect() as db:
+            df = pd.read_sql_query(sql + " GROUP BY p.norm, period ORDER BY p.norm, period", db, params=params)
+        out = pd.DataFrame({"norm": df["norm"], "period": pd.to_datetime(df["period"], utc=True),
+                            "added": df["added"].astype(int), "removed": df["removed"].astype(int)})
+        out["net"] = out["added"] - out["removed"]
+        return out.reset_index(drop=True)
+
+    def first_seen(self, jobs_df: pd.DataFrame) -> pd.Series:
+        """First-seen time (UTC) of each posting in ``jobs_df``, aligned to its index (NaT if unknown)."""
+        if jobs_df.empty:
+            return pd.Series(pd.NaT, index=jobs_df.index, dtype="datetime64[ns, UTC]")
+        keys = pd.Series(_digests({c: _text(jobs_df, c) for c in KEY_FIELDS}, KEY_FIELDS),
+                         index=jobs_df.index, dtype=object)
+        with self._connect() as db:
+            # one sequential read beats probing the key index once per posting
+            found = pd.read_sql_query("SELECT key, first_seen FROM postings", db, dtype={"key": object},
+                                      index_col="key")["first_seen"]
+        return pd.to_datetime(found.reindex(keys).set_axis(keys.index), unit="s", utc=True)
@@ -0,0 +1,103 @@
+import re
+from functools import lru_cache
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Seniority levels, lowest first; "staff" covers staff and above (principal, architect, …)
+LEVELS = ("ic", "senior", "staff", "manager", "exec")
+FAMILIES = ("engineering", "data", "product", "design", "sales", "marketing", "operations",
+            "people", "finance", "legal", "support", "other")
+
+# keyword → (level or None, family or None); phrases win over the words inside them
+# ("product manager" is an IC role in the product family, not a people manager)
+KEYWORDS: Dict[str, Tuple[str, str]] = {
+    # exec
+    "chief": ("exec", None), "ceo": ("exec", None), "cto": ("exec", "engineering"),
+    "cfo": ("exec", "finance"), "coo": ("exec", "operations"), "cmo": ("exec", "marketing"),
+    "cpo": ("exec", "product"), "vp": ("exec", None), "svp": ("exec", None), "evp": ("exec", None),
+    "vice president": ("exec", None), "president": ("exec", None), "founder": ("exec", None),
+    "head": ("exec", None), "director": ("exec", None), "general manager": ("exec", None),
+    # manager
+    "manager": ("manager", None), "team lead": ("manager", None), "tech lead manager": ("manager", "engineering"),
+    "supervisor": ("manager", None),
+    # staff+
+    "staff": ("staff", None), "principal": ("staff", None), "distinguished": ("staff", None),
+    "fellow": ("staff", None), "architect": ("staff", "engineering"),
+    # senior
+    "senior": ("senior", None), "sr": ("senior", None), "lead": ("senior", None),
+    "expert": ("senior", None), "iii": ("senior", None),
+    # roles called "manager" that manage a product, project or account rather than people
+    "product manager": (None, "product"), "product owner": (None, "product"),
+    "program manager": (None, "product"), "project manager": (None, "operations"),
+    "account manager": (None, "sales"), "customer success manager": (None, "support"),
+    "community manager": (None, "marketing"),
+    # families
+    "engineer": (None, "engineering"), "engineering": (None, "engineering"),
+    "developer": (None, "engineering"), "software": (None, "engineering"), "sre": (None, "engineering"),
+    "devops": (None, "engineering"), "frontend": (None, "engineering"), "backend": (None, "engineering"),
+    "full stack": (None, "engineering"), "fullstack": (None, "engineering"), "ios": (None, "engineering"),
+    "android": (None, "engineering"), "qa": (None, "engineering"), "security": (None, "engineering"),
+    "infrastructure": (None, "engineering"), "platform": (None, "engineering"),
+    "data": (None, "data"), "analyst": (None, "data"), "analytics": (None, "data"),
+    "scientist": (None, "data"), "machine learning": (None, "data"), "ml": (None, "data"), "ai": (None, "data"),
+    "product": (None, "product"),
+    "design": (None, "design"), "designer": (None, "design"), "ux": (None, "design"), "ui": (None, "design"),
+    "sales": (None, "sales"), "account executive": (None, "sales"), "sdr": (None, "sales"),
+    "bdr": (None, "sales"), "business development": (None, "sales"),
+    "marketing": (None, "marketing"), "growth": (None, "marketing"), "content": (None, "marketing"),
+    "brand": (None, "marketing"), "seo": (None, "marketing"), "communications": (None, "marketing"),
+    "operations": (None, "operations"), "ops": (None, "operations"), "supply chain": (None, "operations"),
+    "logistics": (None, "operations"),
+    "recruiter": (None, "people"), "recruiting": (None, "people"), "talent": (None, "people"),
+    "hr": (None, "people"), "people": (None, "people"),
+    "finance": (None, "finance"), "financial": (None, "finance"), "accountant": (None, "finance"),
+    "accounting": (None, "finance"), "controller": (None, "finance"),
+    "legal": (None, "legal"), "counsel": (None, "legal"), "lawyer": (None, "legal"),
+    "paralegal": (None, "legal"), "compliance": (None, "legal"),
+    "support": (None, "support"), "customer success": (None, "support"),
+    "customer service": (None, "support"),
+}
+# One alternation over every keyword, longest first so phrases match before their words
+KEYWORD_RE = re.compile(r"\b(?:" + "|".join(re.escape(k) for k in sorted(KEYWORDS, key=len, reverse=True))
+                        + r")\b")
+SEPARATORS = re.compile(r"[^a-z0-9]+")
+TITLE_CACHE_SIZE = 1 << 18
+_LEVEL_RANK = {level: i for i, level in enumerate(LEVELS)}
+
+
+@lru_cache(maxsize=TITLE_CACHE_SIZE)
+def classify_title(title: str) -> Tuple[str, str]:
+    """(level, family) of a job title.
+
+    The level is the highest one any keyword implies (IC without one); the family
+    comes from the first keyword naming one ("other" without one).
+    """
+    text = SEPARATORS.sub(" ", title.lower())
+    level, family = "ic", None
+    for m in KEYWORD_RE.finditer(text):
+        kw_level, kw_family = KEYWORDS[m.group()]
+        if kw_level is not None and _LEVEL_RANK[kw_level] > _LEVEL_RANK[level]:
+            level = kw_level
+        if family is None:
+            family = kw_family
+    return level, family or "other"
+
+
+def classify_titles(values) -> pd.DataFrame:
+    """Vectorized ``classify_title``: ``level`` and ``family`` categoricals, one row per title.
+
+    Each distinct title is classified once (and memoized across calls); results are
+    broadcast back with factorize/take. Missing titles are IC / other.
+    """
+    codes, uniques = pd.factorize(values)
+    labels = [classify_title(u if isinstance(u, str) else str(u)) for u in uniques]
+    level_codes = np.array([_LEVEL_RANK[lv] for lv, _ in labels] + [0], dtype=np.int8)
+    family_rank = {f: i for i, f in enumerate(FAMILIES)}
+    family_codes = np.array([family_rank[f] for _, f in labels] + [len(FAMILIES) - 1], dtype=np.int8)
+    index = values.index if isinstance(values, pd.Series) else None
+    return pd.DataFrame({
+        "level": pd.Categorical.from_codes(level_codes.take(codes), categories=LEVELS, ordered=True),
+        "family": pd.Categorical.from_codes(family_codes.take(codes), categories=FAMILIES),
+    }, index=index)